@@ -0,0 +1 @@
+"""Desktop benchmarks for database, scheduling and notification paths"""
@@ -0,0 +1,61 @@
+"""Measure UI-thread blocking of synchronous vs AsyncReminderDB reads and writes
+
+Run from the project root:
+    python -m benchmarks.bench_async_db [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from database.async_db import AsyncReminderDB, LatencyStats
+from database.db_manager import ReminderDB
+
+
+def _populate(db: ReminderDB, rows: int):
+    start = date.today() + timedelta(days=90)
+    db.add_reminders_bulk(
+        ((start + timedelta(days=i % 365)).isoformat(), f'Journey {i}', 10_000 + 2 * i)
+        for i in range(rows))
+
+
+def run(rows: int = 10_000, rounds: int = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ReminderDB(os.path.join(tmp, 'bench.db'))
+        _populate(db, rows)
+        async_db = AsyncReminderDB(db, max_workers=1)
+
+        sync_read = LatencyStats()
+        for _ in range(rounds):
+            start = time.perf_counter()
+            db.get_all_reminders()
+            sync_read.add((time.perf_counter() - start) * 1000)
+
+        sync_write = LatencyStats()
+        for i in range(rounds):
+            start = time.perf_counter()
+            db.add_reminder('2030-01-01', 'sync', 1_000_000 + 2 * i)
+            sync_write.add((time.perf_counter() - start) * 1000)
+
+        futures = []
+        for i in range(rounds):
+            futures.append(async_db.get_all_reminders())
+            futures.append(async_db.add_reminder('2030-01-02', 'async', 2_000_000 + 2 * i))
+        for future in futures:
+            future.result()
+
+        report = async_db.latency_report()
+        async_db.close(close_db=True)
+
+    print(f"{rows} rows, {rounds} rounds (milliseconds on the calling thread)")
+    for name, stats in (('sync get_all_reminders', sync_read.summary()),
+                        ('sync add_reminder', sync_write.summary()),
+                        ('async caller (read+write)', report['caller']),
+                        ('async worker (read+write)', report['worker'])):
+        print(f"  {name:28s} mean={stats['mean']:8.3f}  p95={stats['p95']:8.3f}  "
+              f"max={stats['max']:8.3f}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,59 @@
+"""Load-test the in-process heap timer backend
+
+Schedules many timers over a short horizon, cancels a share of them, and
+reports per-operation cost, firing lateness and timer thread wakeups.
+
+Run from the project root:
+    python -m benchmarks.bench_heap_timer [timers] [horizon_seconds]
+"""
+import random
+import sys
+import threading
+import time
+
+from services.alarm_backends import HeapTimerBackend
+
+
+def run(timers: int = 100_000, horizon_s: float = 3.0, cancel_share: float = 0.1):
+    lateness = []
+    done = threading.Event()
+    expected = timers - int(timers * cancel_share)
+    fire_at = {}
+
+    def on_fire(alarm_id, event_date, note):
+        lateness.append(time.time() * 1000 - fire_at[alarm_id])
+        if len(lateness) == expected:
+            done.set()
+
+    backend = HeapTimerBackend(callback=on_fire)
+    rng = random.Random(42)
+    base_ms = time.time() * 1000 + 500
+
+    start = time.perf_counter()
+    for alarm_id in range(timers):
+        ts = int(base_ms + rng.random() * horizon_s * 1000)
+        fire_at[alarm_id] = ts
+        backend.schedule(alarm_id, ts, '', '')
+    schedule_us = (time.perf_counter() - start) * 1e6 / timers
+
+    cancelled = rng.sample(range(timers), int(timers * cancel_share))
+    start = time.perf_counter()
+    for alarm_id in cancelled:
+        backend.cancel(alarm_id)
+    cancel_us = (time.perf_counter() - start) * 1e6 / max(1, len(cancelled))
+
+    done.wait(horizon_s + 30)
+    backend.stop()
+
+    lateness.sort()
+    print(f"{timers} timers over {horizon_s:.1f} s, {len(cancelled)} cancelled")
+    print(f"  schedule: {schedule_us:.2f} us/op   cancel: {cancel_us:.2f} us/op")
+    print(f"  fired: {len(lateness)} (expected {expected}), wakeups: {backend.wakeups}")
+    if lateness:
+        print(f"  lateness ms: p50={lateness[len(lateness) // 2]:.2f} "
+              f"p99={lateness[int(len(lateness) * 0.99)]:.2f} max={lateness[-1]:.2f}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 3.0)
@@ -0,0 +1,117 @@
+"""Notifications posted when many reminders fire at the same moment
+
+Replays a burst of alarms arriving 50 ms apart (the spacing AlarmManager
+delivers same-time alarms with) over fake jnius on a virtual clock, once
+posting each alarm directly as before and once through the
+NotificationDispatcher. Reports notify() calls, full-screen intents, the
+most notify() calls within any one second (beyond about 5, Android sheds
+them) and the dispatcher's counters, including alarms deferred into the
+group summary or the queue and alarms dropped because the queue was full.
+
+Run from the project root:
+    python -m benchmarks.bench_notification_burst [alarms]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from benchmarks import fake_jnius
+from database.fast_path import DB_PATH_ENV
+from services import notification_channels
+from services.notification_service import (
+    NotificationDispatcher,
+    build_alarm_payload,
+    notify_alarm
+)
+from utils import clock
+
+ARRIVAL_SPACING_S = 0.05
+START = datetime(2030, 3, 1, 7, 45)
+
+
+def _record_posts(jni):
+    """Wrap the fake NotificationManager to log virtual post times"""
+    times = []
+    manager = jni.notification_manager
+    notify = manager.notify
+
+    def timed_notify(notification_id, notification):
+        times.append(clock.time())
+        notify(notification_id, notification)
+    manager.notify = timed_notify
+    return times
+
+
+def _peak_per_second(times):
+    return max((sum(1 for t in times if start <= t < start + 1) for start in times),
+               default=0)
+
+
+def _alarms(count):
+    return [(1_000_002 + 2 * i, '2030-03-02', f'Reminder {i}') for i in range(count)]
+
+
+def _run_direct(count):
+    jni = fake_jnius.install()
+    times = _record_posts(jni)
+    with clock.use_clock(clock.VirtualClock(START)) as virtual:
+        for alarm_id, event_date, note in _alarms(count):
+            notify_alarm(alarm_id, build_alarm_payload(event_date, note))
+            virtual.advance(ARRIVAL_SPACING_S)
+    return {'notify': len(times), 'full_screen': count, 'peak': _peak_per_second(times),
+            'last_post_s': times[-1] - times[0]}
+
+
+def _run_dispatcher(count):
+    jni = fake_jnius.install()
+    times = _record_posts(jni)
+    with clock.use_clock(clock.VirtualClock(START)) as virtual:
+        dispatcher = NotificationDispatcher(threaded=False)
+        max_depth = 0
+        for alarm_id, event_date, note in _alarms(count):
+            dispatcher.submit(alarm_id, event_date, note)
+            max_depth = max(max_depth, dispatcher.queue_depth)
+            virtual.advance(ARRIVAL_SPACING_S)
+            dispatcher.run_due()
+        while dispatcher.queue_depth:
+            virtual.advance(ARRIVAL_SPACING_S)
+            dispatcher.run_due()
+            max_depth = max(max_depth, dispatcher.queue_depth)
+    stats = dispatcher.stats()
+    return {'notify': len(times), 'full_screen': stats['full_screen_shown'],
+            'peak': _peak_per_second(times), 'last_post_s': times[-1] - times[0],
+            'max_depth': max_depth, 'stats': stats}
+
+
+def run(count: int = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[DB_PATH_ENV] = os.path.join(tmp, 'reminders.db')
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                direct = _run_direct(count)
+                notification_channels.reset()
+                grouped = _run_dispatcher(count)
+
+            print(f"{count} alarms arriving {ARRIVAL_SPACING_S * 1000:.0f} ms apart "
+                  f"(fake jnius, virtual clock)")
+            for label, result in (('direct', direct), ('dispatcher', grouped)):
+                print(f"  {label:10s} notify()={result['notify']:3d}  "
+                      f"full-screen={result['full_screen']:3d}  "
+                      f"peak notify()/s={result['peak']:3d}  "
+                      f"last post after {result['last_post_s']:5.2f} s")
+            stats = grouped['stats']
+            print(f"  dispatcher: groups={stats['groups']} coalesced={stats['coalesced']} "
+                  f"full-screen suppressed={stats['full_screen_suppressed']} "
+                  f"deferred={stats['deferred']} dropped={stats['dropped']} "
+                  f"max queue depth={grouped['max_depth']}")
+        finally:
+            fake_jnius.uninstall()
+            notification_channels.reset()
+            os.environ.pop(DB_PATH_ENV, None)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,60 @@
+"""Cost of notification channel setup per NotificationService construction
+
+Constructs NotificationService repeatedly over fake jnius, once forcing
+every channel to be re-created (what each construction used to do for its
+one channel) and once through the versioned channel registry.
+
+Run from the project root:
+    python -m benchmarks.bench_notification_channels [constructions]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import fake_jnius
+from database.fast_path import DB_PATH_ENV
+from services import notification_channels
+
+
+def _measure(jni, iterations, force):
+    from services.notification_service import NotificationService
+    jni.reset_counters()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(iterations):
+            if force:
+                notification_channels.ensure_channels(force=True)
+            NotificationService()
+    return (time.perf_counter() - start) * 1000 / iterations, jni.crossings / iterations
+
+
+def run(iterations: int = 200):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[DB_PATH_ENV] = os.path.join(tmp, 'reminders.db')
+        jni = fake_jnius.install()
+        try:
+            notification_channels.reset()
+            with contextlib.redirect_stdout(io.StringIO()):
+                notification_channels.ensure_channels()  # first install
+            channels = len(notification_channels.CHANNELS)
+            forced_ms, forced_x = _measure(jni, iterations, force=True)
+            created_before = notification_channels.created
+            cached_ms, cached_x = _measure(jni, iterations, force=False)
+
+            print(f"{iterations} NotificationService constructions, "
+                  f"{channels} channels (fake jnius)")
+            print(f"  re-create channels: {forced_ms:7.3f} ms/op  crossings/op={forced_x:5.1f}")
+            print(f"  versioned registry: {cached_ms:7.3f} ms/op  crossings/op={cached_x:5.1f}")
+            print(f"  createNotificationChannel calls in the registry run: "
+                  f"{notification_channels.created - created_before}")
+        finally:
+            fake_jnius.uninstall()
+            notification_channels.reset()
+            os.environ.pop(DB_PATH_ENV, None)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,108 @@
+"""Cold-start cost of the alarm receiver, from entry to notify()
+
+Each run starts a fresh interpreter with the fake jnius module installed,
+like Android waking the app process for an alarm, and measures:
+
+* entry -> notify(): imports, setup and posting the notification
+* entry -> done: including marking the reminder triggered in the database
+
+"full" runs the sequence the receiver used to: import every service, build
+a NotificationService (which creates the notification channel), open a
+ReminderDB and update the row. "fast" calls on_alarm_triggered with the
+pre-built payload carried by the alarm intent.
+
+Run from the project root:
+    python -m benchmarks.bench_receiver_startup [runs]
+"""
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from database.db_manager import ReminderDB
+from database.fast_path import DB_PATH_ENV
+from services.notification_service import build_alarm_payload
+
+EVENT_DATE = '2030-03-01'
+NOTE = 'Book Chennai Express'
+
+_CHILD = '''
+import contextlib, json, os, sys, time
+from benchmarks import fake_jnius
+jni = fake_jnius.install()
+alarm_id = int(sys.argv[1])
+t0 = time.perf_counter()
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+{body}
+t_done = time.perf_counter()
+print(json.dumps({{'notify_ms': (jni.notification_manager.last_notify_at - t0) * 1000,
+                  'done_ms': (t_done - t0) * 1000}}))
+'''
+
+_FULL = '''
+    from services.notification_service import NotificationService
+    from database.db_manager import ReminderDB
+    from services.alarm_scheduler import AlarmScheduler
+    from services.rolling_window import RollingWindowScheduler
+    NotificationService().show_notification(alarm_id, {event_date!r}, {note!r})
+    db = ReminderDB()
+    db.mark_as_triggered(alarm_id)
+    db.close()
+'''
+
+_FAST = '''
+    from services.alarm_receiver import on_alarm_triggered
+    on_alarm_triggered(alarm_id, {event_date!r}, {note!r}, payload={payload!r})
+'''
+
+
+def _run_child(body: str, alarm_id: int, env) -> dict:
+    script = _CHILD.format(body=body.rstrip())
+    out = subprocess.run([sys.executable, '-c', script, str(alarm_id)], env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int = 10):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'reminders.db')
+        with ReminderDB(db_path) as db:
+            alarm_id = db.allocate_alarm_id()
+            db.add_reminder(EVENT_DATE, NOTE, alarm_id)
+
+        env = dict(os.environ, PYTHONPATH=root, **{DB_PATH_ENV: db_path})
+        bodies = {
+            'full': _FULL.format(event_date=EVENT_DATE, note=NOTE),
+            'fast': _FAST.format(event_date=EVENT_DATE, note=NOTE,
+                                 payload=build_alarm_payload(EVENT_DATE, NOTE)),
+        }
+
+        print(f"{runs} cold starts per path (fake jnius, medians)")
+        for label, body in bodies.items():
+            samples = []
+            for _ in range(runs):
+                conn = sqlite3.connect(db_path)
+                conn.execute('UPDATE reminders SET is_triggered = 0')
+                conn.commit()
+                conn.close()
+
+                samples.append(_run_child(body, alarm_id, env))
+
+                conn = sqlite3.connect(db_path)
+                triggered = conn.execute('SELECT is_triggered FROM reminders WHERE alarm_id = ?',
+                                         (alarm_id,)).fetchone()[0]
+                conn.close()
+                assert triggered == 1, f"{label}: reminder not marked triggered"
+
+            notify_ms = statistics.median(s['notify_ms'] for s in samples)
+            done_ms = statistics.median(s['done_ms'] for s in samples)
+            print(f"  {label}: entry -> notify() {notify_ms:7.2f} ms   "
+                  f"entry -> DB written {done_ms:7.2f} ms")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,81 @@
+"""Compare full registration with rolling-window scheduling on a desktop backend
+
+Registers every pending reminder the way restore_alarms_on_boot used to,
+then does the same in rolling mode and replays every alarm in fire order,
+checking that each reminder fires exactly once.
+
+Run from the project root:
+    python -m benchmarks.bench_rolling_window [rows] [window]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from database.db_manager import ReminderDB
+from services.alarm_backends import InMemoryAlarmBackend
+from services.alarm_scheduler import AlarmScheduler
+from services.rolling_window import REFILL_ALARM_ID, RollingWindowScheduler
+
+
+def _populate(db: ReminderDB, rows: int):
+    start = date.today() + timedelta(days=61)
+    alarm_ids = db.reserve_alarm_ids(rows)
+    # Many reminders per day, so window boundaries fall inside tied groups
+    db.add_reminders_bulk(
+        ((start + timedelta(days=i % 200)).isoformat(), f'Journey {i}', alarm_id)
+        for i, alarm_id in enumerate(alarm_ids))
+
+
+def run(rows: int = 10_000, window: int = 64):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ReminderDB(os.path.join(tmp, 'bench.db'))
+        _populate(db, rows)
+        now_ms = int(time.time() * 1000)
+
+        full = InMemoryAlarmBackend()
+        scheduler = AlarmScheduler(backend=full)
+        start = time.perf_counter()
+        for r in db.iter_pending_reminders():
+            scheduler.schedule_alarm(r.alarm_id, r.fire_at_ms, r.event_date, r.note)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        backend = InMemoryAlarmBackend()
+        rolling = RollingWindowScheduler(db, AlarmScheduler(backend=backend), window)
+        start = time.perf_counter()
+        rolling.reset(now_ms)
+        rolling_ms = (time.perf_counter() - start) * 1000
+
+        # Replay: fire the earliest registered alarm until none remain
+        fired = []
+        peak = len(backend)
+        refills = 0
+        start = time.perf_counter()
+        while True:
+            nxt = backend.next_alarm()
+            if nxt is None:
+                break
+            _, alarm_id = nxt
+            backend.registered.pop(alarm_id)
+            if alarm_id == REFILL_ALARM_ID:
+                refills += 1
+                rolling.refill()
+            else:
+                fired.append(alarm_id)
+                db.mark_as_triggered(alarm_id)
+            peak = max(peak, len(backend))
+        replay_ms = (time.perf_counter() - start) * 1000
+        db.close()
+
+    print(f"{rows} reminders, window {window}")
+    print(f"  full registration:    {len(full):6d} alarms registered in {full_ms:8.1f} ms")
+    print(f"  rolling registration: {peak:6d} alarms registered at peak, "
+          f"first window in {rolling_ms:6.1f} ms")
+    print(f"  replay: {len(fired)} fired, {len(set(fired))} unique, {refills} refills "
+          f"in {replay_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 64)
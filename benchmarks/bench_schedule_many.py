@@ -0,0 +1,65 @@
+"""Compare per-alarm and batched AlarmManager registration over fake jnius
+
+Registers and then cancels the same alarms once through schedule_alarm /
+cancel_alarm in a loop, as boot restore used to, and once through
+schedule_many / cancel_many. Reports time and JNI crossings per alarm and
+checks that the fake AlarmManager ends up with the same alarms both ways.
+
+Run from the project root:
+    python -m benchmarks.bench_schedule_many [alarms] [crossing_cost_us]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from benchmarks import fake_jnius
+
+
+def _timed(jni, fn):
+    jni.reset_counters()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return (time.perf_counter() - start) * 1000, jni.crossings, result
+
+
+def run(alarms: int = 500, crossing_cost_us: float = fake_jnius.DEFAULT_CROSSING_COST_US):
+    jni = fake_jnius.install(crossing_cost_us=crossing_cost_us)
+    try:
+        from services.alarm_scheduler import AlarmScheduler
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler = AlarmScheduler()
+            scheduler.cancel_alarm(0)  # resolve context and service handles
+        items = [(1_000_002 + 2 * i, 1_900_000_000_000 + i * 60_000, '2030-03-01', f'Trip {i}')
+                 for i in range(alarms)]
+        ids = [item[0] for item in items]
+        manager = jni.alarm_manager
+
+        loop_ms, loop_x, _ = _timed(jni, lambda: [scheduler.schedule_alarm(*item)
+                                                  for item in items])
+        loop_alarms = dict(manager.alarms)
+        loop_cancel_ms, loop_cancel_x, _ = _timed(jni, lambda: [scheduler.cancel_alarm(i)
+                                                                for i in ids])
+        assert not manager.alarms
+
+        many_ms, many_x, results = _timed(jni, lambda: scheduler.schedule_many(items))
+        assert all(results.values()) and manager.alarms == loop_alarms
+        many_cancel_ms, many_cancel_x, results = _timed(jni, lambda: scheduler.cancel_many(ids))
+        assert all(results.values()) and not manager.alarms
+
+        print(f"{alarms} alarms, {crossing_cost_us:.0f} us per JNI crossing (fake jnius)")
+        for label, ms, crossings in (
+                ('schedule_alarm loop', loop_ms, loop_x),
+                ('schedule_many', many_ms, many_x),
+                ('cancel_alarm loop', loop_cancel_ms, loop_cancel_x),
+                ('cancel_many', many_cancel_ms, many_cancel_x)):
+            print(f"  {label:<20} {ms:8.2f} ms  {ms * 1000 / alarms:7.1f} us/alarm  "
+                  f"crossings/alarm={crossings / alarms:5.2f}")
+    finally:
+        fake_jnius.uninstall()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        float(sys.argv[2]) if len(sys.argv) > 2 else fake_jnius.DEFAULT_CROSSING_COST_US)
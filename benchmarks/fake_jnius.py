@@ -0,0 +1,207 @@
+"""In-process stand-in for pyjnius so Android code paths run on Linux
+
+install() puts a fake ``jnius`` module in sys.modules and makes the app
+believe it runs on Android. Every reflected class and every call into a
+fake Java object is counted as a JNI crossing, and each can be charged a
+configurable busy-wait to model the cost on a device. The fake
+AlarmManager keeps the alarms it was given, keyed by request code, so
+callers can check what would have been registered.
+
+The default costs are rough assumptions for a mid-range phone, not
+measurements: reflecting a class with autoclass takes milliseconds (it
+walks every method and field), a plain call a few microseconds.
+"""
+import os
+import sys
+import time
+import types
+from typing import Any, Dict, Optional
+
+from services import jni_registry
+
+DEFAULT_REFLECT_COST_MS = 3.0
+DEFAULT_CROSSING_COST_US = 15.0
+
+# Static fields with meaningful values; other UPPER_CASE fields get ints
+_STRING_FIELDS = {
+    'ALARM_SERVICE': 'alarm',
+    'NOTIFICATION_SERVICE': 'notification',
+}
+
+
+class FakeJNI:
+    """Counters and cost model shared by every fake Java object"""
+
+    def __init__(self, reflect_cost_ms: float = DEFAULT_REFLECT_COST_MS,
+                 crossing_cost_us: float = DEFAULT_CROSSING_COST_US):
+        self.reflect_cost = reflect_cost_ms / 1000
+        self.crossing_cost = crossing_cost_us / 1_000_000
+        self.reflections = 0
+        self.crossings = 0
+        self.alarm_manager = FakeAlarmManager(self)
+        self.notification_manager = FakeNotificationManager(self)
+        self.context = FakeJavaObject(self, 'android.content.Context')
+
+    def _spend(self, seconds: float):
+        if seconds <= 0:
+            return
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    def cross(self):
+        self.crossings += 1
+        self._spend(self.crossing_cost)
+
+    def autoclass(self, name: str) -> 'FakeJavaClass':
+        self.reflections += 1
+        self.crossings += 1
+        self._spend(self.reflect_cost)
+        return FakeJavaClass(self, name)
+
+    def reset_counters(self):
+        self.reflections = 0
+        self.crossings = 0
+
+
+class FakeJavaObject:
+    """Any Java object: every method call is one crossing
+
+    Builder-style methods (set*, add*, enable*) return the object itself so
+    chained calls work; other methods return a new fake object.
+    """
+
+    def __init__(self, jni: FakeJNI, class_name: str):
+        self._jni = jni
+        self._class_name = class_name
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        jni = self._jni
+
+        def method(*args):
+            jni.cross()
+            if name == 'getSystemService':
+                if args[0] == 'alarm':
+                    return jni.alarm_manager
+                if args[0] == 'notification':
+                    return jni.notification_manager
+                return FakeJavaObject(jni, f'service:{args[0]}')
+            if name == 'getApplicationContext':
+                return jni.context
+            if name.startswith(('set', 'add', 'enable', 'putExtra')):
+                return self
+            return FakeJavaObject(jni, f'{self._class_name}.{name}()')
+        return method
+
+
+class FakeJavaClass(FakeJavaObject):
+    """A reflected class: static fields, static methods and constructor"""
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        jni = self._jni
+        if name == 'mActivity':
+            jni.cross()
+            return jni.context
+        if name.isupper() or name.startswith('FLAG_'):
+            jni.cross()
+            return _STRING_FIELDS.get(name, sum(map(ord, name)))
+        if name in ('getBroadcast', 'getActivity', 'getService'):
+            def get_pending_intent(context, request_code, intent, flags):
+                jni.cross()
+                return FakePendingIntent(jni, request_code)
+            return get_pending_intent
+        return super().__getattr__(name)
+
+    def __call__(self, *args):
+        self._jni.cross()
+        return FakeJavaObject(self._jni, self._class_name)
+
+
+class FakePendingIntent(FakeJavaObject):
+    def __init__(self, jni: FakeJNI, request_code: int):
+        super().__init__(jni, 'android.app.PendingIntent')
+        self.request_code = request_code
+
+
+class FakeAlarmManager(FakeJavaObject):
+    """Records alarms by request code instead of registering them"""
+
+    def __init__(self, jni: FakeJNI):
+        super().__init__(jni, 'android.app.AlarmManager')
+        self.alarms: Dict[int, int] = {}
+
+    def setExactAndAllowWhileIdle(self, alarm_type: Any, trigger_at: int,
+                                  operation: FakePendingIntent):
+        self._jni.cross()
+        self.alarms[operation.request_code] = trigger_at
+
+    def cancel(self, operation: FakePendingIntent):
+        self._jni.cross()
+        self.alarms.pop(operation.request_code, None)
+
+    def canScheduleExactAlarms(self) -> bool:
+        self._jni.cross()
+        return True
+
+
+class FakeNotificationManager(FakeJavaObject):
+    """Records posted notification IDs and when the last one was posted"""
+
+    def __init__(self, jni: FakeJNI):
+        super().__init__(jni, 'android.app.NotificationManager')
+        self.posted = []
+        # time.perf_counter() of the last notify()
+        self.last_notify_at: Optional[float] = None
+
+    def notify(self, notification_id: int, notification: Any):
+        self._jni.cross()
+        self.posted.append(notification_id)
+        self.last_notify_at = time.perf_counter()
+
+
+_installed: Optional[FakeJNI] = None
+_saved_env: Optional[str] = None
+
+
+def install(reflect_cost_ms: float = DEFAULT_REFLECT_COST_MS,
+            crossing_cost_us: float = DEFAULT_CROSSING_COST_US) -> FakeJNI:
+    """Install the fake jnius module and pretend to run on Android
+
+    Args:
+        reflect_cost_ms: Busy-wait charged per autoclass call
+        crossing_cost_us: Busy-wait charged per call into Java
+
+    Returns:
+        FakeJNI holding the counters and the fake AlarmManager
+    """
+    global _installed, _saved_env
+    jni = FakeJNI(reflect_cost_ms, crossing_cost_us)
+    module = types.ModuleType('jnius')
+    module.autoclass = jni.autoclass
+    sys.modules['jnius'] = module
+
+    if _installed is None:
+        _saved_env = os.environ.get('ANDROID_ROOT')
+    os.environ['ANDROID_ROOT'] = '/system'
+    _installed = jni
+    jni_registry.reset()
+    return jni
+
+
+def uninstall():
+    """Remove the fake module and restore the environment"""
+    global _installed, _saved_env
+    if _installed is None:
+        return
+    sys.modules.pop('jnius', None)
+    if _saved_env is None:
+        os.environ.pop('ANDROID_ROOT', None)
+    else:
+        os.environ['ANDROID_ROOT'] = _saved_env
+    _installed = None
+    _saved_env = None
+    jni_registry.reset()
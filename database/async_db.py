@@ -0,0 +1,160 @@
+"""Non-blocking ReminderDB facade for the Kivy UI thread"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from database.db_manager import ReminderDB
+
+try:
+    from kivy.clock import Clock
+except ImportError:
+    Clock = None
+
+
+class LatencyStats:
+    """Rolling latency samples in milliseconds"""
+
+    def __init__(self, max_samples: int = 1000):
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def add(self, ms: float):
+        with self._lock:
+            self._samples.append(ms)
+            self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Get count, mean, p95 and max over the retained samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {'count': self.count, 'mean': 0.0, 'p95': 0.0, 'max': 0.0}
+        return {
+            'count': self.count,
+            'mean': sum(samples) / len(samples),
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'max': samples[-1],
+        }
+
+
+class AsyncReminderDB:
+    """Runs ReminderDB calls on a worker pool and reports back on the main thread
+
+    Every method returns a concurrent.futures.Future immediately; use
+    ``asyncio.wrap_future`` to await it from a coroutine. When a callback is
+    given it is invoked with the result on the Kivy main thread via
+    ``Clock.schedule_once`` (or directly on the worker when Kivy is not
+    available, e.g. in desktop scripts).
+
+    ``caller_latency`` records how long each call held the calling thread
+    and ``worker_latency`` how long the database work itself took; the gap
+    between them is the time the UI thread no longer spends blocked.
+    """
+
+    def __init__(self, db: Optional[ReminderDB] = None, max_workers: int = 2):
+        """Initialize async facade
+
+        Args:
+            db: Database to wrap. If None, opens the default database
+            max_workers: Number of worker threads
+        """
+        self.db = db if db is not None else ReminderDB()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='ReminderDB-async')
+        self.caller_latency = LatencyStats()
+        self.worker_latency = LatencyStats()
+
+    def run(self, fn: Callable[..., Any], *args,
+            callback: Optional[Callable[[Any], None]] = None,
+            errback: Optional[Callable[[Exception], None]] = None) -> Future:
+        """Run any blocking callable on the worker pool
+
+        Args:
+            fn: Callable to run, e.g. a bound ReminderDB or ReminderCache method
+            *args: Positional arguments for fn
+            callback: Called with the result on the main thread
+            errback: Called with the exception on the main thread if fn raises
+
+        Returns:
+            Future for fn's result
+        """
+        start = time.perf_counter()
+
+        def job():
+            job_start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.worker_latency.add((time.perf_counter() - job_start) * 1000)
+
+        future = self._executor.submit(job)
+        if callback is not None or errback is not None:
+            future.add_done_callback(
+                lambda f: self._deliver(f, callback, errback))
+
+        self.caller_latency.add((time.perf_counter() - start) * 1000)
+        return future
+
+    def _deliver(self, future: Future, callback, errback):
+        error = future.exception()
+        if error is not None:
+            if errback is None:
+                print(f"Error in async database call: {error}")
+                return
+            target, value = errback, error
+        else:
+            if callback is None:
+                return
+            target, value = callback, future.result()
+
+        if Clock is not None:
+            Clock.schedule_once(lambda dt: target(value), 0)
+        else:
+            target(value)
+
+    # ── ReminderDB mirror ───────────────────────────────────────
+    def add_reminder(self, event_date: str, note: str, alarm_id: int, **kw) -> Future:
+        return self.run(self.db.add_reminder, event_date, note, alarm_id, **kw)
+
+    def add_reminders_bulk(self, reminders, **kw) -> Future:
+        return self.run(self.db.add_reminders_bulk, list(reminders), **kw)
+
+    def get_all_reminders(self, **kw) -> Future:
+        return self.run(self.db.get_all_reminders, **kw)
+
+    def get_pending_reminders(self, **kw) -> Future:
+        return self.run(self.db.get_pending_reminders, **kw)
+
+    def page(self, after=None, limit: Optional[int] = None, **kw) -> Future:
+        if limit is None:
+            return self.run(self.db.page, after, **kw)
+        return self.run(self.db.page, after, limit, **kw)
+
+    def get_reminder_by_alarm_id(self, alarm_id: int, **kw) -> Future:
+        return self.run(self.db.get_reminder_by_alarm_id, alarm_id, **kw)
+
+    def mark_as_triggered(self, alarm_id: int, **kw) -> Future:
+        return self.run(self.db.mark_as_triggered, alarm_id, **kw)
+
+    def delete_reminder(self, reminder_id: int, **kw) -> Future:
+        return self.run(self.db.delete_reminder, reminder_id, **kw)
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """Get caller-thread and worker latency summaries in milliseconds"""
+        return {
+            'caller': self.caller_latency.summary(),
+            'worker': self.worker_latency.summary(),
+        }
+
+    def close(self, close_db: bool = False):
+        """Wait for queued calls and stop the worker pool
+
+        Args:
+            close_db: Also close the wrapped ReminderDB
+        """
+        self._executor.shutdown(wait=True)
+        if close_db:
+            self.db.close()
@@ -0,0 +1,126 @@
+"""Read-through in-memory cache of reminder pages"""
+import threading
+from collections import OrderedDict
+from typing import Iterator, Optional, Tuple
+
+from database.db_manager import DEFAULT_PAGE_SIZE, ReminderDB
+from database.models import Reminder
+
+# Pages kept between reads; a few screenfuls either side of the visible one
+DEFAULT_MAX_PAGES = 8
+
+
+class ReminderCache:
+    """Keeps recently read pages of the reminder table in memory
+
+    Pages are the keyset pages of ReminderDB.page() and pending_page(),
+    keyed by the query that produced them. Only the `max_pages` most
+    recently used pages are kept, so memory is bounded by what the list
+    reads, not by the size of the table.
+
+    Validity is checked with two cheap counters instead of a table query:
+
+    * ``PRAGMA data_version`` changes whenever another connection - for
+      example the alarm receiver process - commits to the database file.
+    * ``ReminderDB.change_count`` changes on every write made through the
+      wrapped ReminderDB, which data_version does not report.
+
+    Any change drops every cached page. Returned records are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self, db: ReminderDB, max_pages: int = DEFAULT_MAX_PAGES):
+        """Initialize cache
+
+        Args:
+            db: Database the cache reads through to
+            max_pages: Most pages kept in memory
+        """
+        self.db = db
+        self.max_pages = max_pages
+        self._version: Optional[Tuple[int, int, int]] = None
+        self._pages: 'OrderedDict[tuple, Tuple[Reminder, ...]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Readers may call from worker threads (AsyncReminderDB)
+        self._lock = threading.Lock()
+
+    def _current_version(self) -> Tuple[int, int, int]:
+        # data_version is a per-connection counter and every thread reads
+        # through its own connection, so values are only comparable when
+        # taken on the same thread.
+        return (threading.get_ident(), self.db.data_version(), self.db.change_count)
+
+    def _get(self, key: tuple, load) -> Tuple[Reminder, ...]:
+        with self._lock:
+            version = self._current_version()
+            if version != self._version:
+                self._pages.clear()
+                self._version = version
+
+            rows = self._pages.get(key)
+            if rows is not None:
+                self.hits += 1
+                self._pages.move_to_end(key)
+                return rows
+
+            self.misses += 1
+            rows = self._pages[key] = tuple(load())
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+            return rows
+
+    def page(self, after: Optional[Tuple[str, int]] = None,
+             limit: int = DEFAULT_PAGE_SIZE) -> Tuple[Reminder, ...]:
+        """Get one page of reminders ordered by journey date
+
+        Args:
+            after: (event_date, id) of the last row already seen, or None
+                for the first page
+            limit: Maximum number of rows to return
+
+        Returns:
+            Reminder records, as ReminderDB.page() returns them
+        """
+        return self._get(('all', after, limit), lambda: self.db.page(after, limit))
+
+    def pending_page(self, after: Optional[Tuple[str, int]] = None,
+                     limit: int = DEFAULT_PAGE_SIZE) -> Tuple[Reminder, ...]:
+        """Get one page of non-triggered reminders ordered by reminder date
+
+        Args:
+            after: (reminder_date, id) of the last row already seen, or None
+                for the first page
+            limit: Maximum number of rows to return
+
+        Returns:
+            Non-triggered Reminder records
+        """
+        return self._get(('pending', after, limit),
+                         lambda: self.db.pending_page(after, limit))
+
+    def iter_all_reminders(self, batch_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Reminder]:
+        """Stream all reminders ordered by journey date, page by page
+
+        Args:
+            batch_size: Rows per page
+
+        Yields:
+            Reminder records ordered by journey date
+        """
+        after = None
+        while True:
+            rows = self.page(after, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1].event_date, rows[-1].id)
+
+    def invalidate(self):
+        """Drop every cached page so the next read goes to SQLite"""
+        with self._lock:
+            self._version = None
+            self._pages.clear()
+
+    def __len__(self):
+        return len(self._pages)
@@ -0,0 +1,92 @@
+"""In-process feed of reminder changes
+
+Screens that write reminders publish what they changed after the write has
+committed, so views showing the reminder list can patch the affected rows
+instead of re-querying and redrawing everything. Writes made by other
+processes (the alarm receiver on Android) are not published; views reload
+for those, for example when the app is resumed.
+"""
+import threading
+from typing import Callable, List, Optional
+
+from database.models import Reminder
+
+ADDED = 'added'
+DELETED = 'deleted'
+TRIGGERED = 'triggered'
+
+
+class ChangeEvent:
+    """One committed change to the reminders table"""
+
+    __slots__ = ('kind', 'reminder_id', 'reminder', 'alarm_id')
+
+    def __init__(self, kind: str, reminder_id: Optional[int] = None,
+                 reminder: Optional[Reminder] = None, alarm_id: Optional[int] = None):
+        """Describe a change
+
+        Args:
+            kind: ADDED, DELETED or TRIGGERED
+            reminder_id: Database ID of the reminder, if known
+            reminder: The new record, for ADDED
+            alarm_id: Alarm ID of the reminder, for TRIGGERED
+        """
+        self.kind = kind
+        self.reminder_id = reminder.id if reminder is not None else reminder_id
+        self.reminder = reminder
+        self.alarm_id = alarm_id
+
+    def __repr__(self):
+        return (f"ChangeEvent({self.kind!r}, reminder_id={self.reminder_id}, "
+                f"alarm_id={self.alarm_id})")
+
+
+class ChangeFeed:
+    """Synchronous publish/subscribe of ChangeEvents
+
+    Subscribers run on the publishing thread, in subscription order. A
+    subscriber that raises does not stop the others.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[ChangeEvent], None]] = []
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> Callable[[], None]:
+        """Call *callback* for every published event
+
+        Args:
+            callback: Receives each ChangeEvent
+
+        Returns:
+            Function that cancels the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]):
+        """Stop calling *callback*; unknown callbacks are ignored"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event: ChangeEvent):
+        """Deliver *event* to every subscriber
+
+        Args:
+            event: Change that has already been committed
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error delivering reminder change {event}: {e}")
+
+
+# Feed shared by every screen and service in the process
+reminder_changes = ChangeFeed()
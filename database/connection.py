@@ -0,0 +1,295 @@
+"""Connection management for concurrent access to the reminder database
+
+SQLite allows one writer at a time. Instead of letting every ReminderDB
+instance race for the write lock, each process funnels its writes through a
+single writer thread that drains a queue and commits queued operations
+together (group commit). Readers get their own per-thread read-only
+connection, which in WAL mode never blocks on the writer.
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from database.migrations import migrate
+
+# How long a connection waits on a lock held by another process before
+# raising "database is locked"
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+# Upper bound on write operations committed in one transaction
+DEFAULT_GROUP_COMMIT_SIZE = 64
+
+_STOP = object()
+
+# The logger behind kivy.logger.Logger; importing Kivy here would slow the
+# alarm receiver down
+Logger = logging.getLogger('kivy')
+
+
+class ConnectionManager:
+    """Owns the writer thread and read connections for one database file"""
+
+    _registry: Dict[str, 'ConnectionManager'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+                 group_commit_size: int = DEFAULT_GROUP_COMMIT_SIZE):
+        """Open the writer connection and bring the schema up to date
+
+        Args:
+            db_path: Path to SQLite database file
+            busy_timeout_ms: Lock wait timeout for every connection
+            group_commit_size: Maximum operations committed per transaction
+        """
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.group_commit_size = group_commit_size
+        self.refcount = 0
+        self.pid = os.getpid()
+
+        # Created here, used only by the writer thread afterwards
+        self._writer_conn = self._connect(db_path, read_only=False)
+        self._writer_conn.execute('PRAGMA journal_mode = WAL')
+        migrate(self._writer_conn)
+
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+        self._local = threading.local()
+        # Read connections by the thread that owns them. The threads are
+        # held until their connection is closed; a weak key would drop the
+        # entry unclosed once the Thread object is collected.
+        self._readers: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+        # Number of transactions committed and operations they carried
+        self.commits = 0
+        self.operations = 0
+
+    def _connect(self, db_path: str, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            uri = 'file:' + db_path.replace('?', '%3f').replace('#', '%23') + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   timeout=self.busy_timeout_ms / 1000)
+        else:
+            conn = sqlite3.connect(db_path, check_same_thread=False,
+                                   timeout=self.busy_timeout_ms / 1000,
+                                   isolation_level=None)
+            conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        return conn
+
+    @classmethod
+    def acquire(cls, db_path: str, **kwargs) -> 'ConnectionManager':
+        """Get the process-wide manager for a database file
+
+        Args:
+            db_path: Path to SQLite database file
+            **kwargs: Passed to the constructor when the manager is created.
+                If it already exists with different settings, those are
+                kept and a warning is logged
+
+        Returns:
+            Shared ConnectionManager; call release() when done with it
+        """
+        with cls._registry_lock:
+            manager = cls._registry.get(db_path)
+            # A forked child inherits the registry but not the writer thread
+            if manager is None or manager.pid != os.getpid():
+                manager = cls._registry[db_path] = cls(db_path, **kwargs)
+            else:
+                for name, value in kwargs.items():
+                    if getattr(manager, name) != value:
+                        Logger.warning(f"TrainBook: {db_path} is already open with "
+                                       f"{name}={getattr(manager, name)}; ignoring {name}={value}")
+            manager.refcount += 1
+            return manager
+
+    def release(self):
+        """Drop one reference; the last one closes all connections"""
+        with self._registry_lock:
+            self.refcount -= 1
+            if self.refcount > 0:
+                return
+            if self._registry.get(self.db_path) is self:
+                del self._registry[self.db_path]
+        self.close()
+
+    # ── Reads ───────────────────────────────────────────────────
+    def reader(self) -> sqlite3.Connection:
+        """Get the read-only connection belonging to the calling thread
+
+        Opening one also closes the connections of threads that have
+        exited, so short-lived worker threads don't leak them.
+
+        Returns:
+            Read-only SQLite connection
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self._closed:
+                raise sqlite3.ProgrammingError('Connection manager is closed')
+            conn = self._local.conn = self._connect(self.db_path, read_only=True)
+            with self._readers_lock:
+                self._close_dead_readers()
+                self._readers[threading.current_thread()] = conn
+        return conn
+
+    @property
+    def reader_count(self) -> int:
+        """Read connections currently open"""
+        with self._readers_lock:
+            return len(self._readers)
+
+    def _close_dead_readers(self):
+        # Caller holds _readers_lock
+        dead = [thread for thread in self._readers if not thread.is_alive()]
+        for thread in dead:
+            self._readers.pop(thread).close()
+
+    # ── Writes ──────────────────────────────────────────────────
+    def submit(self, operation: Callable[[sqlite3.Cursor], Any],
+               transactional: bool = True) -> Future:
+        """Queue a write operation for the writer thread
+
+        The operation runs inside a transaction shared with other queued
+        operations, isolated by a savepoint: if it raises, only its own
+        changes are rolled back.
+
+        Args:
+            operation: Callable taking a cursor; its return value becomes
+                the future's result
+            transactional: False for statements that can't run inside a
+                transaction (VACUUM, some pragmas). Such operations run on
+                their own, in autocommit mode, between group commits.
+
+        Returns:
+            Future resolved once the transaction containing the operation
+            has committed
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError('Connection manager is closed')
+        future: Future = Future()
+        self._ensure_writer()
+        self._queue.put((operation, future, transactional))
+        return future
+
+    def write(self, operation: Callable[[sqlite3.Cursor], Any],
+              transactional: bool = True) -> Any:
+        """Run a write operation and wait for it to commit
+
+        Args:
+            operation: Callable taking a cursor
+            transactional: See submit()
+
+        Returns:
+            The operation's return value
+        """
+        return self.submit(operation, transactional).result()
+
+    def _ensure_writer(self):
+        # Started lazily so read-only users never pay for the thread
+        if self._writer_thread is not None:
+            return
+        with self._writer_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name='ReminderDB-writer', daemon=True)
+                self._writer_thread.start()
+
+    def _writer_loop(self):
+        carry = None
+        while True:
+            item = carry if carry is not None else self._queue.get()
+            carry = None
+            if item is _STOP:
+                return
+            if not item[2]:
+                self._run_standalone(item)
+                continue
+
+            batch = [item]
+            while len(batch) < self.group_commit_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP or not item[2]:
+                    # Handled after this batch commits, preserving order
+                    carry = item
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+    def _run_standalone(self, item):
+        operation, future, _ = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = operation(self._writer_conn.cursor())
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            self.operations += 1
+            future.set_result(result)
+
+    def _run_batch(self, batch):
+        conn = self._writer_conn
+        cursor = conn.cursor()
+        outcomes = []
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            for operation, future, _ in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cursor.execute('SAVEPOINT op')
+                try:
+                    result = operation(cursor)
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO SAVEPOINT op')
+                    cursor.execute('RELEASE SAVEPOINT op')
+                    outcomes.append((future, None, e))
+                else:
+                    cursor.execute('RELEASE SAVEPOINT op')
+                    outcomes.append((future, result, None))
+            cursor.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.commits += 1
+        self.operations += len(outcomes)
+        # Resolve only after COMMIT so callers never observe uncommitted data
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    # ── Shutdown ────────────────────────────────────────────────
+    def close(self):
+        """Flush queued writes, stop the writer and close all connections"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._writer_thread is not None:
+            self._queue.put(_STOP)
+            self._writer_thread.join()
+        self._writer_conn.close()
+
+        with self._readers_lock:
+            for conn in self._readers.values():
+                conn.close()
+            self._readers.clear()
@@ -1,52 +1,68 @@
 """Database manager for reminder storage using SQLite"""
 import sqlite3
-import os
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database.connection import DEFAULT_BUSY_TIMEOUT_MS, ConnectionManager
+from database.fast_path import default_db_path
+from database.migrations import ALARM_ID_STRIDE
+from database.models import REMINDER_COLUMNS, Reminder, reminder_row_factory
+from utils import clock
+from utils.date_utils import get_notification_timestamp
+
+# Rows fetched per query by the paginated and streaming readers
+DEFAULT_PAGE_SIZE = 200
+
+# Time of day every reminder fires (matches the column default)
+DEFAULT_REMINDER_TIME = '07:45'
+
+# Alarm IDs reserved per sequence round trip by allocate_alarm_id
+ALARM_ID_BLOCK_SIZE = 32
 
 
 class ReminderDB:
-    """Manages SQLite database operations for train ticket reminders"""
+    """Manages SQLite database operations for train ticket reminders
+    
+    Safe to share between threads, and any number of instances may be open
+    in one process: they share a ConnectionManager, so all writes go through
+    one writer thread and each reading thread uses its own connection.
+    """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None,
+                 busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS):
         """Initialize database connection
         
         Args:
             db_path: Path to SQLite database file. If None, uses default location
+            busy_timeout_ms: How long to wait for a lock held by another
+                process before failing with "database is locked"
         """
         if db_path is None:
             # Use app's data directory on Android, local directory otherwise
-            try:
-                from android.storage import app_storage_path
-                db_dir = app_storage_path()
-            except ImportError:
-                db_dir = os.path.dirname(os.path.abspath(__file__))
-            
-            db_path = os.path.join(db_dir, 'train_reminders.db')
+            db_path = default_db_path()
         
         self.db_path = db_path
-        self.conn = None
+        self.busy_timeout_ms = busy_timeout_ms
+        self._manager = None
+        # Bumped on every committed write made through this instance
+        self.change_count = 0
+        # Reserved but not yet handed out alarm IDs
+        self._alarm_ids = iter(())
+        self._alarm_ids_lock = threading.Lock()
         self._init_db()
     
     def _init_db(self):
-        """Create database tables if they don't exist"""
-        self.conn = sqlite3.connect(self.db_path)
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_date TEXT NOT NULL,
-                reminder_date TEXT NOT NULL,
-                reminder_time TEXT DEFAULT '07:45',
-                note TEXT,
-                alarm_id INTEGER UNIQUE,
-                is_triggered INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        self.conn.commit()
+        """Attach to the shared connection manager for this file
+        
+        The manager opens the database in WAL mode with synchronous=NORMAL
+        and migrates the schema the first time the file is opened in this
+        process. WAL lets readers (UI, boot receiver) proceed while the
+        alarm receiver writes, and NORMAL only fsyncs on checkpoint instead
+        of on every commit.
+        """
+        self._manager = ConnectionManager.acquire(
+            self.db_path, busy_timeout_ms=self.busy_timeout_ms)
     
     def add_reminder(self, event_date: str, note: str, alarm_id: int) -> int:
         """Add a new reminder to the database
@@ -63,57 +79,416 @@ class ReminderDB:
         event_dt = datetime.strptime(event_date, '%Y-%m-%d')
         reminder_dt = event_dt - timedelta(days=60)
         reminder_date = reminder_dt.strftime('%Y-%m-%d')
+        fire_at_ms = get_notification_timestamp(reminder_date, DEFAULT_REMINDER_TIME)
+        
+        def insert(cursor):
+            cursor.execute('''
+                INSERT INTO reminders (event_date, reminder_date, note, alarm_id, fire_at_ms)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (event_date, reminder_date, note, alarm_id, fire_at_ms))
+            return cursor.lastrowid
+        
+        return self._write(insert)
+    
+    def reserve_alarm_ids(self, count: int) -> range:
+        """Reserve a block of alarm IDs from the persistent sequence
+        
+        Reservations are committed, so blocks never overlap, even across
+        processes. IDs are spaced ALARM_ID_STRIDE apart, which keeps
+        alarm_id + 1 (the notification tap request code) free as well.
+        Bulk creation paths should reserve all the IDs they need at once.
+        
+        Args:
+            count: Number of alarm IDs to reserve
+        
+        Returns:
+            Range of reserved alarm IDs
+        """
+        span = count * ALARM_ID_STRIDE
+        
+        def reserve(cursor):
+            cursor.execute('''
+                UPDATE alarm_id_sequence
+                SET next_id = next_id + ?
+                WHERE name = 'alarm_id'
+            ''', (span,))
+            return cursor.execute(
+                "SELECT next_id FROM alarm_id_sequence WHERE name = 'alarm_id'"
+            ).fetchone()[0]
+        
+        end = self._write(reserve)
+        return range(end - span, end, ALARM_ID_STRIDE)
+    
+    def allocate_alarm_id(self) -> int:
+        """Get an unused alarm ID
+        
+        Served from a locally reserved block, so only one call in
+        ALARM_ID_BLOCK_SIZE touches the database.
+        
+        Returns:
+            Alarm ID that no other reminder uses, nor its + 1
+        """
+        with self._alarm_ids_lock:
+            alarm_id = next(self._alarm_ids, None)
+            if alarm_id is None:
+                self._alarm_ids = iter(self.reserve_alarm_ids(ALARM_ID_BLOCK_SIZE))
+                alarm_id = next(self._alarm_ids)
+            return alarm_id
+    
+    def add_reminders_bulk(self, reminders: Iterable[Tuple[str, str, int]]) -> List[int]:
+        """Add many reminders in a single transaction
+        
+        Args:
+            reminders: Iterable of (event_date, note, alarm_id) tuples;
+                alarm IDs typically come from reserve_alarm_ids
+        
+        Returns:
+            Database row IDs of the inserted reminders, in input order
+        """
+        # Many reminders share a journey date; derive each reminder date and
+        # fire time once
+        derived: Dict[str, Tuple[str, int]] = {}
+        rows = []
+        for event_date, note, alarm_id in reminders:
+            dates = derived.get(event_date)
+            if dates is None:
+                reminder_dt = date.fromisoformat(event_date) - timedelta(days=60)
+                reminder_date = reminder_dt.isoformat()
+                dates = derived[event_date] = (
+                    reminder_date,
+                    get_notification_timestamp(reminder_date, DEFAULT_REMINDER_TIME),
+                )
+            rows.append((event_date, dates[0], note, alarm_id, dates[1]))
+        
+        if not rows:
+            return []
+        
+        def insert(cursor):
+            # One statement per row so each id is read back rather than
+            # assumed consecutive; still a single transaction
+            sql = '''
+                INSERT INTO reminders (event_date, reminder_date, note, alarm_id, fire_at_ms)
+                VALUES (?, ?, ?, ?, ?)
+            '''
+            ids = []
+            for row in rows:
+                cursor.execute(sql, row)
+                ids.append(cursor.lastrowid)
+            return ids
+        
+        return self._write(insert)
+    
+    def mark_triggered_bulk(self, alarm_ids: Iterable[int]) -> int:
+        """Mark many reminders as triggered in a single transaction
+        
+        Args:
+            alarm_ids: Alarm IDs to mark as triggered
+        
+        Returns:
+            Number of reminders updated
+        """
+        params = [(alarm_id,) for alarm_id in alarm_ids]
+        if not params:
+            return 0
         
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO reminders (event_date, reminder_date, note, alarm_id)
-            VALUES (?, ?, ?, ?)
-        ''', (event_date, reminder_date, note, alarm_id))
+        def update(cursor):
+            cursor.executemany('''
+                UPDATE reminders
+                SET is_triggered = 1
+                WHERE alarm_id = ?
+            ''', params)
+            updated = cursor.rowcount
+            # A fired alarm is no longer registered
+            cursor.executemany('DELETE FROM scheduled_state WHERE alarm_id = ?', params)
+            return updated
         
-        self.conn.commit()
-        return cursor.lastrowid
+        return self._write(update)
     
-    def get_all_reminders(self) -> List[Tuple]:
+    def delete_reminders_bulk(self, reminder_ids: Iterable[int]) -> int:
+        """Delete many reminders in a single transaction
+        
+        Args:
+            reminder_ids: Database IDs of the reminders to delete
+        
+        Returns:
+            Number of reminders deleted
+        """
+        params = [(reminder_id,) for reminder_id in reminder_ids]
+        if not params:
+            return 0
+        
+        def delete(cursor):
+            # Callers cancel the alarms before deleting the rows
+            cursor.executemany('''
+                DELETE FROM scheduled_state
+                WHERE alarm_id = (SELECT alarm_id FROM reminders WHERE id = ?)
+            ''', params)
+            cursor.executemany('DELETE FROM reminders WHERE id = ?', params)
+            return cursor.rowcount
+        
+        return self._write(delete)
+    
+    def get_all_reminders(self) -> List[Reminder]:
         """Get all reminders from database
         
         Returns:
-            List of tuples containing reminder data
+            List of Reminder records ordered by journey date
+        """
+        return list(self.iter_all_reminders())
+    
+    def get_pending_reminders(self) -> List[Reminder]:
+        """Get all non-triggered reminders
+        
+        Returns:
+            List of non-triggered Reminder records ordered by reminder date
+        """
+        return list(self.iter_pending_reminders())
+    
+    def page(self, after: Optional[Tuple[str, int]] = None,
+             limit: int = DEFAULT_PAGE_SIZE) -> List[Reminder]:
+        """Get one page of reminders ordered by journey date
+        
+        Keyset pagination: pass the (event_date, id) of the last row of the
+        previous page to get the next one. Each page is an index range scan,
+        so the cost does not grow with the page number.
+        
+        Args:
+            after: (event_date, id) of the last row already seen, or None
+                for the first page
+            limit: Maximum number of rows to return
+        
+        Returns:
+            List of Reminder records
+        """
+        cursor = self._reminder_cursor()
+        if after is None:
+            cursor.execute(f'''
+                SELECT {REMINDER_COLUMNS}
+                FROM reminders
+                ORDER BY event_date ASC, id ASC
+                LIMIT ?
+            ''', (limit,))
+        else:
+            cursor.execute(f'''
+                SELECT {REMINDER_COLUMNS}
+                FROM reminders
+                WHERE (event_date, id) > (?, ?)
+                ORDER BY event_date ASC, id ASC
+                LIMIT ?
+            ''', (after[0], after[1], limit))
+        return cursor.fetchall()
+    
+    def pending_page(self, after: Optional[Tuple[str, int]] = None,
+                     limit: int = DEFAULT_PAGE_SIZE) -> List[Reminder]:
+        """Get one page of non-triggered reminders ordered by reminder date
+        
+        Args:
+            after: (reminder_date, id) of the last row already seen, or None
+                for the first page
+            limit: Maximum number of rows to return
+        
+        Returns:
+            List of non-triggered Reminder records
+        """
+        cursor = self._reminder_cursor()
+        if after is None:
+            cursor.execute(f'''
+                SELECT {REMINDER_COLUMNS}
+                FROM reminders
+                WHERE is_triggered = 0
+                ORDER BY reminder_date ASC, id ASC
+                LIMIT ?
+            ''', (limit,))
+        else:
+            cursor.execute(f'''
+                SELECT {REMINDER_COLUMNS}
+                FROM reminders
+                WHERE is_triggered = 0 AND (reminder_date, id) > (?, ?)
+                ORDER BY reminder_date ASC, id ASC
+                LIMIT ?
+            ''', (after[0], after[1], limit))
+        return cursor.fetchall()
+    
+    def archived_page(self, after: Optional[Tuple[str, int]] = None,
+                      limit: int = DEFAULT_PAGE_SIZE) -> List[Reminder]:
+        """Get one page of archived reminders, most recent journey first
+        
+        Args:
+            after: (event_date, id) of the last row already seen, or None
+                for the first page
+            limit: Maximum number of rows to return
+        
+        Returns:
+            List of archived Reminder records
+        """
+        cursor = self._reminder_cursor()
+        if after is None:
+            cursor.execute(f'''
+                SELECT {REMINDER_COLUMNS}
+                FROM reminders_archive
+                ORDER BY event_date DESC, id DESC
+                LIMIT ?
+            ''', (limit,))
+        else:
+            cursor.execute(f'''
+                SELECT {REMINDER_COLUMNS}
+                FROM reminders_archive
+                WHERE (event_date, id) < (?, ?)
+                ORDER BY event_date DESC, id DESC
+                LIMIT ?
+            ''', (after[0], after[1], limit))
+        return cursor.fetchall()
+    
+    def iter_all_reminders(self, batch_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Reminder]:
+        """Stream all reminders ordered by journey date
+        
+        Rows are fetched one page at a time, so memory use stays flat and no
+        read transaction is held open while the caller works on a batch.
+        
+        Args:
+            batch_size: Number of rows fetched per query
+        
+        Yields:
+            Reminder records ordered by journey date
+        """
+        after = None
+        while True:
+            rows = self.page(after, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]
+            after = (last.event_date, last.id)
+    
+    def iter_pending_reminders(self, batch_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Reminder]:
+        """Stream non-triggered reminders ordered by reminder date
+        
+        Args:
+            batch_size: Number of rows fetched per query
+        
+        Yields:
+            Non-triggered Reminder records ordered by reminder date
+        """
+        after = None
+        while True:
+            rows = self.pending_page(after, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]
+            after = (last.reminder_date, last.id)
+    
+    def due_between(self, start_ms: int, end_ms: int,
+                    limit: Optional[int] = None) -> List[Reminder]:
+        """Get non-triggered reminders whose fire time falls in a range
+        
+        Args:
+            start_ms: Inclusive lower bound (milliseconds since epoch)
+            end_ms: Exclusive upper bound (milliseconds since epoch)
+            limit: Maximum number of rows to return, or None for all
+        
+        Returns:
+            List of Reminder records ordered by fire time
         """
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT id, event_date, reminder_date, note, alarm_id, is_triggered
+        cursor = self._reminder_cursor()
+        cursor.execute(f'''
+            SELECT {REMINDER_COLUMNS}
             FROM reminders
-            ORDER BY event_date ASC
-        ''')
+            WHERE is_triggered = 0 AND fire_at_ms >= ? AND fire_at_ms < ?
+            ORDER BY fire_at_ms ASC, id ASC
+            LIMIT ?
+        ''', (start_ms, end_ms, -1 if limit is None else limit))
         return cursor.fetchall()
     
-    def get_pending_reminders(self) -> List[Tuple]:
-        """Get all non-triggered reminders
+    def due_after(self, after: Tuple[int, int],
+                  limit: int = DEFAULT_PAGE_SIZE) -> List[Reminder]:
+        """Get the next non-triggered reminders in fire time order
+        
+        Keyset pagination over (fire_at_ms, id), served by the fire time
+        index.
+        
+        Args:
+            after: (fire_at_ms, id) of the last reminder already seen
+            limit: Maximum number of rows to return
         
         Returns:
-            List of tuples containing pending reminder data
+            List of Reminder records ordered by fire time
         """
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT id, event_date, reminder_date, reminder_time, note, alarm_id
+        cursor = self._reminder_cursor()
+        cursor.execute(f'''
+            SELECT {REMINDER_COLUMNS}
             FROM reminders
-            WHERE is_triggered = 0
-            ORDER BY reminder_date ASC
-        ''')
+            WHERE is_triggered = 0 AND (fire_at_ms, id) > (?, ?)
+            ORDER BY fire_at_ms ASC, id ASC
+            LIMIT ?
+        ''', (after[0], after[1], limit))
         return cursor.fetchall()
     
-    def get_reminder_by_alarm_id(self, alarm_id: int) -> Optional[Tuple]:
+    def claim_overdue(self, now_ms: int) -> List[Reminder]:
+        """Mark every reminder whose fire time has passed as triggered
+        
+        One range scan on the fire time index finds the overdue rows, and
+        they are marked in the same transaction, so a reminder is claimed
+        by exactly one caller.
+        
+        Args:
+            now_ms: Reminders firing before this time (milliseconds since
+                epoch) are claimed
+        
+        Returns:
+            List of claimed Reminder records ordered by fire time
+        """
+        def claim(cursor):
+            reader = cursor.connection.cursor()
+            reader.row_factory = reminder_row_factory
+            reminders = reader.execute(f'''
+                SELECT {REMINDER_COLUMNS}
+                FROM reminders
+                WHERE is_triggered = 0 AND fire_at_ms < ?
+                ORDER BY fire_at_ms ASC, id ASC
+            ''', (now_ms,)).fetchall()
+            if not reminders:
+                return reminders
+            
+            params = [(r.id,) for r in reminders]
+            cursor.executemany('UPDATE reminders SET is_triggered = 1 WHERE id = ?', params)
+            cursor.executemany('DELETE FROM scheduled_state WHERE alarm_id = ?',
+                               [(r.alarm_id,) for r in reminders])
+            for reminder in reminders:
+                reminder.is_triggered = True
+            return reminders
+        
+        return self._write(claim)
+    
+    def get_reminder_by_id(self, reminder_id: int) -> Optional[Reminder]:
+        """Get reminder by database ID
+        
+        Args:
+            reminder_id: Database ID of the reminder
+        
+        Returns:
+            Reminder record or None if not found
+        """
+        cursor = self._reminder_cursor()
+        cursor.execute(f'''
+            SELECT {REMINDER_COLUMNS}
+            FROM reminders
+            WHERE id = ?
+        ''', (reminder_id,))
+        return cursor.fetchone()
+    
+    def get_reminder_by_alarm_id(self, alarm_id: int) -> Optional[Reminder]:
         """Get reminder by alarm ID
         
         Args:
             alarm_id: The alarm ID to search for
         
         Returns:
-            Tuple containing reminder data or None if not found
+            Reminder record or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT id, event_date, reminder_date, note, alarm_id, is_triggered
+        cursor = self._reminder_cursor()
+        cursor.execute(f'''
+            SELECT {REMINDER_COLUMNS}
             FROM reminders
             WHERE alarm_id = ?
         ''', (alarm_id,))
@@ -128,14 +503,17 @@ class ReminderDB:
         Returns:
             True if successful, False otherwise
         """
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            UPDATE reminders
-            SET is_triggered = 1
-            WHERE alarm_id = ?
-        ''', (alarm_id,))
-        self.conn.commit()
-        return cursor.rowcount > 0
+        def update(cursor):
+            cursor.execute('''
+                UPDATE reminders
+                SET is_triggered = 1
+                WHERE alarm_id = ?
+            ''', (alarm_id,))
+            updated = cursor.rowcount > 0
+            cursor.execute('DELETE FROM scheduled_state WHERE alarm_id = ?', (alarm_id,))
+            return updated
+        
+        return self._write(update)
     
     def delete_reminder(self, reminder_id: int) -> bool:
         """Delete a reminder from database
@@ -146,15 +524,158 @@ class ReminderDB:
         Returns:
             True if successful, False otherwise
         """
-        cursor = self.conn.cursor()
-        cursor.execute('DELETE FROM reminders WHERE id = ?', (reminder_id,))
-        self.conn.commit()
-        return cursor.rowcount > 0
+        def delete(cursor):
+            cursor.execute('''
+                DELETE FROM scheduled_state
+                WHERE alarm_id = (SELECT alarm_id FROM reminders WHERE id = ?)
+            ''', (reminder_id,))
+            cursor.execute('DELETE FROM reminders WHERE id = ?', (reminder_id,))
+            return cursor.rowcount > 0
+        
+        return self._write(delete)
+    
+    def _reminder_cursor(self) -> sqlite3.Cursor:
+        """Cursor whose rows come back as Reminder records"""
+        cursor = self._manager.reader().cursor()
+        cursor.row_factory = reminder_row_factory
+        return cursor
+    
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """Read a value from the meta key/value table
+        
+        Args:
+            key: Setting name
+            default: Returned when the key is not set
+        
+        Returns:
+            Stored value or default
+        """
+        row = self._manager.reader().execute(
+            'SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return default if row is None else row[0]
+    
+    def set_meta(self, key: str, value: Any):
+        """Write a value to the meta key/value table
+        
+        Args:
+            key: Setting name
+            value: Any SQLite-storable value
+        """
+        self._write(lambda cursor: cursor.execute(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value)))
+    
+    def get_scheduled_state(self) -> Dict[int, Tuple[int, int]]:
+        """Get what was last registered with AlarmManager
+        
+        Returns:
+            Dict mapping alarm_id to (fire_at_ms, registered_at_ms)
+        """
+        rows = self._manager.reader().execute(
+            'SELECT alarm_id, fire_at_ms, registered_at_ms FROM scheduled_state')
+        return {alarm_id: (fire_at_ms, registered_at_ms)
+                for alarm_id, fire_at_ms, registered_at_ms in rows}
+    
+    def update_scheduled_state(self, registered: Iterable[Tuple[int, int]] = (),
+                               cancelled: Iterable[int] = (),
+                               registered_at_ms: Optional[int] = None,
+                               clear: bool = False) -> int:
+        """Record alarm registrations and cancellations in one transaction
+        
+        Args:
+            registered: (alarm_id, fire_at_ms) pairs just registered
+            cancelled: Alarm IDs just cancelled
+            registered_at_ms: Registration time. Defaults to now
+            clear: Forget every recorded alarm first, e.g. after a reboot
+                wiped AlarmManager
+        
+        Returns:
+            Number of rows written or removed
+        """
+        if registered_at_ms is None:
+            registered_at_ms = clock.time_ms()
+        upserts = [(alarm_id, fire_at_ms, registered_at_ms)
+                   for alarm_id, fire_at_ms in registered]
+        deletes = [(alarm_id,) for alarm_id in cancelled]
+        if not (upserts or deletes or clear):
+            return 0
+        
+        def update(cursor):
+            changed = 0
+            if clear:
+                changed += cursor.execute('DELETE FROM scheduled_state').rowcount
+            if deletes:
+                cursor.executemany('DELETE FROM scheduled_state WHERE alarm_id = ?',
+                                   deletes)
+                changed += cursor.rowcount
+            if upserts:
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO scheduled_state
+                        (alarm_id, fire_at_ms, registered_at_ms)
+                    VALUES (?, ?, ?)
+                ''', upserts)
+                changed += cursor.rowcount
+            return changed
+        
+        return self._write(update)
+    
+    def refresh_fire_times(self) -> int:
+        """Recompute stored fire times of pending reminders
+        
+        fire_at_ms is derived from the local reminder date and time, so it
+        goes stale when the device's time zone changes.
+        
+        Returns:
+            Number of reminders whose fire time changed
+        """
+        def update(cursor):
+            cursor.connection.create_function('notification_timestamp', 2,
+                                              get_notification_timestamp)
+            cursor.execute('''
+                UPDATE reminders
+                SET fire_at_ms = notification_timestamp(reminder_date,
+                                                        COALESCE(reminder_time, '07:45'))
+                WHERE is_triggered = 0
+                  AND fire_at_ms IS NOT notification_timestamp(
+                      reminder_date, COALESCE(reminder_time, '07:45'))
+            ''')
+            return cursor.rowcount
+        
+        return self._write(update)
+    
+    def data_version(self) -> int:
+        """Get the SQLite data version of this connection
+        
+        The value is read on the calling thread's read connection, and
+        changes whenever another connection - including this process's
+        writer thread - commits to the database file. That makes it a cheap
+        staleness check.
+        
+        Returns:
+            Current value of PRAGMA data_version
+        """
+        return self._manager.reader().execute('PRAGMA data_version').fetchone()[0]
+    
+    def _write(self, operation: Callable[[sqlite3.Cursor], Any],
+               transactional: bool = True) -> Any:
+        """Run a write operation on the writer thread and wait for commit
+        
+        Args:
+            operation: Callable taking a cursor bound to the open transaction
+            transactional: False for statements such as VACUUM that must
+                run outside a transaction
+        
+        Returns:
+            The operation's return value
+        """
+        result = self._manager.write(operation, transactional)
+        self.change_count += 1
+        return result
     
     def close(self):
         """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        if self._manager:
+            self._manager.release()
+            self._manager = None
     
     def __enter__(self):
         return self
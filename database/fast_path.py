@@ -0,0 +1,77 @@
+"""Cheap database access for the alarm receiver's cold start
+
+When an alarm fires, Android may start a fresh process just to handle it.
+Opening ReminderDB there starts a connection manager (migration check, WAL
+setup, a writer thread) only to run one UPDATE. This module opens a plain
+connection instead and skips all schema work when the file is already at
+the current version; otherwise it falls back to ReminderDB, which migrates.
+It imports nothing beyond sqlite3 until the fallback is needed.
+"""
+import os
+import sqlite3
+from typing import Optional
+
+DB_FILENAME = 'train_reminders.db'
+
+# Environment variable overriding the database location (desktop runs,
+# benchmarks)
+DB_PATH_ENV = 'TRAINBOOK_DB_PATH'
+
+_BUSY_TIMEOUT_MS = 5000
+
+
+def default_db_path() -> str:
+    """Get the database location used when no path is given
+
+    Returns:
+        The app's data directory on Android, this package's directory
+        otherwise, unless overridden by TRAINBOOK_DB_PATH
+    """
+    override = os.environ.get(DB_PATH_ENV)
+    if override:
+        return override
+    try:
+        from android.storage import app_storage_path
+        db_dir = app_storage_path()
+    except ImportError:
+        db_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(db_dir, DB_FILENAME)
+
+
+def mark_triggered(alarm_id: int, db_path: Optional[str] = None) -> bool:
+    """Mark a reminder as triggered with a single short-lived connection
+
+    Args:
+        alarm_id: The alarm ID to mark as triggered
+        db_path: Path to SQLite database file. If None, uses default location
+
+    Returns:
+        True if a reminder was updated
+    """
+    from database.migrations import SCHEMA_VERSION
+
+    if db_path is None:
+        db_path = default_db_path()
+
+    conn = sqlite3.connect(db_path, timeout=_BUSY_TIMEOUT_MS / 1000,
+                           isolation_level=None)
+    try:
+        if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            conn.close()
+            conn = None
+            from database.db_manager import ReminderDB
+            with ReminderDB(db_path) as db:
+                return db.mark_as_triggered(alarm_id)
+
+        # journal_mode=WAL is stored in the file; synchronous is per connection
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('BEGIN IMMEDIATE')
+        updated = conn.execute(
+            'UPDATE reminders SET is_triggered = 1 WHERE alarm_id = ?',
+            (alarm_id,)).rowcount > 0
+        conn.execute('DELETE FROM scheduled_state WHERE alarm_id = ?', (alarm_id,))
+        conn.execute('COMMIT')
+        return updated
+    finally:
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,234 @@
+"""Versioned schema migrations for the reminder database
+
+The schema version is stored in ``PRAGMA user_version``. Each migration
+upgrades the schema by exactly one version and runs inside its own
+``BEGIN IMMEDIATE`` transaction, so an interrupted upgrade leaves the file
+at the last fully applied version.
+"""
+import sqlite3
+from typing import Callable, List, Tuple
+
+from utils.date_utils import get_notification_timestamp
+
+# Every reminder owns two consecutive request codes: alarm_id for the alarm
+# broadcast / full-screen intent and alarm_id + 1 for the notification tap
+# intent. Allocated IDs therefore advance in steps of two.
+ALARM_ID_STRIDE = 2
+
+# IDs below this are reserved for app-level alarms and notifications. It is
+# also above the 1000..999999 range the old random allocator used.
+FIRST_ALARM_ID = 1_000_002
+
+
+def _v1_initial_schema(cursor: sqlite3.Cursor):
+    """Base table plus covering indexes for the list and pending queries"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_date TEXT NOT NULL,
+            reminder_date TEXT NOT NULL,
+            reminder_time TEXT DEFAULT '07:45',
+            note TEXT,
+            alarm_id INTEGER UNIQUE,
+            is_triggered INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # get_pending_reminders: WHERE is_triggered = 0 ORDER BY reminder_date
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_reminders_pending
+        ON reminders (is_triggered, reminder_date, reminder_time,
+                      event_date, alarm_id, note)
+    ''')
+
+    # get_all_reminders: ORDER BY event_date
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_reminders_event_date
+        ON reminders (event_date, reminder_date, note, alarm_id, is_triggered)
+    ''')
+
+
+def _v2_keyset_indexes(cursor: sqlite3.Cursor):
+    """Put id right after the sort key so keyset pages need no sort step"""
+    cursor.execute('DROP INDEX IF EXISTS idx_reminders_pending')
+    cursor.execute('''
+        CREATE INDEX idx_reminders_pending
+        ON reminders (is_triggered, reminder_date, id, reminder_time,
+                      event_date, alarm_id, note)
+    ''')
+
+    cursor.execute('DROP INDEX IF EXISTS idx_reminders_event_date')
+    cursor.execute('''
+        CREATE INDEX idx_reminders_event_date
+        ON reminders (event_date, id, reminder_date, note, alarm_id,
+                      is_triggered)
+    ''')
+
+
+def _v3_cover_reminder_time(cursor: sqlite3.Cursor):
+    """Readers now select reminder_time on the journey-date ordered path too"""
+    cursor.execute('DROP INDEX IF EXISTS idx_reminders_event_date')
+    cursor.execute('''
+        CREATE INDEX idx_reminders_event_date
+        ON reminders (event_date, id, reminder_date, reminder_time, note,
+                      alarm_id, is_triggered)
+    ''')
+
+
+def _v4_fire_at_ms(cursor: sqlite3.Cursor):
+    """Stored fire time in epoch ms, backfilled, with an index for range scans"""
+    cursor.execute('ALTER TABLE reminders ADD COLUMN fire_at_ms INTEGER')
+
+    # Not deterministic: the result depends on the local time zone
+    cursor.connection.create_function('notification_timestamp', 2,
+                                      get_notification_timestamp)
+    cursor.execute('''
+        UPDATE reminders
+        SET fire_at_ms = notification_timestamp(reminder_date,
+                                                COALESCE(reminder_time, '07:45'))
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX idx_reminders_fire_at
+        ON reminders (is_triggered, fire_at_ms)
+    ''')
+
+    # Keep the list and pending indexes covering now that readers select
+    # fire_at_ms as well
+    cursor.execute('DROP INDEX IF EXISTS idx_reminders_pending')
+    cursor.execute('''
+        CREATE INDEX idx_reminders_pending
+        ON reminders (is_triggered, reminder_date, id, reminder_time,
+                      event_date, alarm_id, note, fire_at_ms)
+    ''')
+    cursor.execute('DROP INDEX IF EXISTS idx_reminders_event_date')
+    cursor.execute('''
+        CREATE INDEX idx_reminders_event_date
+        ON reminders (event_date, id, reminder_date, reminder_time, note,
+                      alarm_id, is_triggered, fire_at_ms)
+    ''')
+
+
+def _v5_alarm_id_sequence(cursor: sqlite3.Cursor):
+    """Sequence table for collision-free alarm ID allocation"""
+    cursor.execute('''
+        CREATE TABLE alarm_id_sequence (
+            name TEXT PRIMARY KEY,
+            next_id INTEGER NOT NULL
+        )
+    ''')
+
+    # Start past every legacy random ID and its +1 tap request code
+    max_id = cursor.execute('SELECT MAX(alarm_id) FROM reminders').fetchone()[0]
+    next_id = max(FIRST_ALARM_ID, (max_id or 0) + ALARM_ID_STRIDE)
+    next_id += next_id % ALARM_ID_STRIDE
+    cursor.execute(
+        "INSERT INTO alarm_id_sequence (name, next_id) VALUES ('alarm_id', ?)",
+        (next_id,))
+
+
+def _v6_archive(cursor: sqlite3.Cursor):
+    """Archive table for retired reminders and a small key/value store"""
+    cursor.execute('''
+        CREATE TABLE reminders_archive (
+            id INTEGER PRIMARY KEY,
+            event_date TEXT NOT NULL,
+            reminder_date TEXT NOT NULL,
+            reminder_time TEXT DEFAULT '07:45',
+            note TEXT,
+            alarm_id INTEGER,
+            is_triggered INTEGER DEFAULT 0,
+            created_at TIMESTAMP,
+            fire_at_ms INTEGER,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX idx_reminders_archive_event_date
+        ON reminders_archive (event_date, id)
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE meta (
+            key TEXT PRIMARY KEY,
+            value
+        )
+    ''')
+
+    # Only recorded in the header here; RetentionEngine runs the one-time
+    # VACUUM that converts an existing file, since VACUUM can't run inside
+    # a migration transaction.
+    cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+
+
+def _v7_scheduled_state(cursor: sqlite3.Cursor):
+    """What is currently registered with AlarmManager, per alarm ID"""
+    cursor.execute('''
+        CREATE TABLE scheduled_state (
+            alarm_id INTEGER PRIMARY KEY,
+            fire_at_ms INTEGER NOT NULL,
+            registered_at_ms INTEGER NOT NULL
+        )
+    ''')
+
+
+# Ordered list of (target_version, migration). Append only - never edit or
+# reorder an entry once it has shipped.
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Cursor], None]]] = [
+    (1, _v1_initial_schema),
+    (2, _v2_keyset_indexes),
+    (3, _v3_cover_reminder_time),
+    (4, _v4_fire_at_ms),
+    (5, _v5_alarm_id_sequence),
+    (6, _v6_archive),
+    (7, _v7_scheduled_state),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Read the schema version stored in the database file
+
+    Args:
+        conn: Open SQLite connection
+
+    Returns:
+        Current value of PRAGMA user_version
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Upgrade the database in place to SCHEMA_VERSION
+
+    Args:
+        conn: Open SQLite connection
+
+    Returns:
+        Number of migrations applied
+    """
+    applied = 0
+    for version, migration in MIGRATIONS:
+        # Re-read inside the loop: another process may have migrated
+        # the file while we were waiting for the write lock.
+        if get_schema_version(conn) >= version:
+            continue
+
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            migration(cursor)
+            # PRAGMA arguments can't be bound; version is an int we own
+            cursor.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+            applied += 1
+        except Exception:
+            conn.rollback()
+            raise
+
+    return applied
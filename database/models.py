@@ -0,0 +1,67 @@
+"""Record types returned by ReminderDB"""
+import sqlite3
+from datetime import date, datetime, time
+from typing import Optional, Tuple
+
+
+# Column order shared by every reminder SELECT; Reminder.__init__ takes
+# its positional arguments in exactly this order.
+REMINDER_COLUMNS = ('id, event_date, reminder_date, reminder_time, note, '
+                    'alarm_id, is_triggered, fire_at_ms')
+
+
+class Reminder:
+    """A single reminder row
+
+    Dates are parsed once when the row is loaded and the fire time comes
+    from the stored fire_at_ms column, so consumers never re-parse the
+    stored strings.
+    """
+
+    __slots__ = ('id', 'event_date', 'reminder_date', 'reminder_time', 'note',
+                 'alarm_id', 'is_triggered', 'event_day', 'reminder_day',
+                 'fire_at_ms')
+
+    def __init__(self, id: int, event_date: str, reminder_date: str,
+                 reminder_time: str, note: str, alarm_id: int,
+                 is_triggered: int, fire_at_ms: Optional[int] = None):
+        self.id = id
+        self.event_date = event_date
+        self.reminder_date = reminder_date
+        self.reminder_time = reminder_time or '07:45'
+        self.note = note
+        self.alarm_id = alarm_id
+        self.is_triggered = bool(is_triggered)
+
+        self.event_day = date.fromisoformat(event_date)
+        self.reminder_day = date.fromisoformat(reminder_date)
+        if fire_at_ms is None:
+            hour, minute = self.reminder_time.split(':')
+            fire_dt = datetime.combine(self.reminder_day, time(int(hour), int(minute)))
+            fire_at_ms = int(fire_dt.timestamp() * 1000)
+        self.fire_at_ms = fire_at_ms
+
+    def _key(self) -> Tuple:
+        return (self.id, self.event_date, self.reminder_date, self.reminder_time,
+                self.note, self.alarm_id, self.is_triggered, self.fire_at_ms)
+
+    def __eq__(self, other):
+        if not isinstance(other, Reminder):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return (f"Reminder(id={self.id}, event_date={self.event_date!r}, "
+                f"alarm_id={self.alarm_id}, is_triggered={self.is_triggered})")
+
+
+def reminder_row_factory(cursor: sqlite3.Cursor, row: Tuple) -> Reminder:
+    """sqlite3 row factory building Reminder records
+
+    Relies on the query selecting REMINDER_COLUMNS, so no per-row lookup of
+    cursor.description is needed.
+    """
+    return Reminder(*row)
@@ -0,0 +1,155 @@
+"""Retention engine: archives retired reminders and compacts the database file"""
+import sqlite3
+from typing import Dict, Optional
+
+from database.db_manager import ReminderDB
+from utils import clock
+
+# Columns copied verbatim from reminders to reminders_archive
+_ARCHIVE_COLUMNS = ('id, event_date, reminder_date, reminder_time, note, '
+                    'alarm_id, is_triggered, created_at, fire_at_ms')
+
+# PRAGMA auto_vacuum value for INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+class RetentionEngine:
+    """Keeps the hot reminders table limited to upcoming journeys
+
+    Reminders whose journey date has passed, triggered or not, are moved
+    to reminders_archive in small batches, each its own transaction,
+    so the writer is never held for long. Freed pages are returned to the
+    filesystem with PRAGMA incremental_vacuum at most once per interval.
+    """
+
+    def __init__(self, db: ReminderDB, batch_size: int = 500,
+                 vacuum_interval_hours: float = 24, vacuum_pages: int = 1000):
+        """Initialize retention engine
+
+        Args:
+            db: Database to maintain
+            batch_size: Reminders moved per transaction (max 999 for older
+                SQLite builds' bound-parameter limit)
+            vacuum_interval_hours: Minimum time between compactions
+            vacuum_pages: Pages released per compaction
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.vacuum_interval_ms = int(vacuum_interval_hours * 3600 * 1000)
+        self.vacuum_pages = vacuum_pages
+
+    def archive_batch(self, cutoff_date: str) -> int:
+        """Move one batch of retired reminders to the archive
+
+        Args:
+            cutoff_date: Reminders with a journey before this date
+                (YYYY-MM-DD) are archived. A triggered reminder stays
+                until then, since the journey is still upcoming
+
+        Returns:
+            Number of reminders moved
+        """
+        limit = self.batch_size
+
+        def move(cursor):
+            ids = [row[0] for row in cursor.execute(
+                'SELECT id FROM reminders WHERE event_date < ? LIMIT ?',
+                (cutoff_date, limit))]
+            if not ids:
+                return 0
+
+            marks = ','.join('?' * len(ids))
+            cursor.execute(f'''
+                INSERT INTO reminders_archive ({_ARCHIVE_COLUMNS})
+                SELECT {_ARCHIVE_COLUMNS} FROM reminders WHERE id IN ({marks})
+            ''', ids)
+            cursor.execute(f'''
+                DELETE FROM scheduled_state WHERE alarm_id IN
+                    (SELECT alarm_id FROM reminders WHERE id IN ({marks}))
+            ''', ids)
+            cursor.execute(f'DELETE FROM reminders WHERE id IN ({marks})', ids)
+            return len(ids)
+
+        return self.db._write(move)
+
+    def archive(self, cutoff_date: Optional[str] = None) -> int:
+        """Move all retired reminders to the archive, batch by batch
+
+        Args:
+            cutoff_date: See archive_batch. Defaults to today
+
+        Returns:
+            Number of reminders moved
+        """
+        if cutoff_date is None:
+            cutoff_date = clock.now().date().isoformat()
+
+        total = 0
+        while True:
+            moved = self.archive_batch(cutoff_date)
+            total += moved
+            if moved < self.batch_size:
+                return total
+
+    def compact(self) -> int:
+        """Release free pages back to the filesystem
+
+        The first call on a database created before auto_vacuum was enabled
+        runs a full VACUUM to convert it; later calls are incremental.
+
+        Returns:
+            Number of pages released
+        """
+        pages = self.vacuum_pages
+
+        def vacuum(cursor):
+            before = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+            mode = cursor.execute('PRAGMA auto_vacuum').fetchone()[0]
+            if mode != _AUTO_VACUUM_INCREMENTAL:
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                cursor.execute('VACUUM')
+            else:
+                # Each result row is one freed page; it must be fully stepped
+                cursor.execute(f'PRAGMA incremental_vacuum({int(pages)})').fetchall()
+            after = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+            return before - after
+
+        return self.db._write(vacuum, transactional=False)
+
+    def maybe_compact(self, now_ms: Optional[int] = None) -> bool:
+        """Compact if the last compaction is older than the interval
+
+        Args:
+            now_ms: Current time in epoch milliseconds. Defaults to now
+
+        Returns:
+            True if a compaction ran
+        """
+        if now_ms is None:
+            now_ms = clock.time_ms()
+
+        last = self.db.get_meta('last_vacuum_ms', 0)
+        if now_ms - last < self.vacuum_interval_ms:
+            return False
+
+        try:
+            self.compact()
+        except sqlite3.OperationalError as e:
+            # VACUUM needs the file to itself; retry on the next run
+            print(f"Error compacting database: {e}")
+            return False
+
+        self.db.set_meta('last_vacuum_ms', now_ms)
+        return True
+
+    def run(self) -> Dict[str, int]:
+        """Archive retired reminders, then compact if due
+
+        Returns:
+            Dict with the number of reminders archived and whether the
+            database was compacted
+        """
+        archived = self.archive()
+        compacted = self.maybe_compact()
+        print(f"Retention: archived {archived} reminders, compacted={compacted}")
+        return {'archived': archived, 'compacted': int(compacted)}
@@ -7,29 +7,41 @@ from kivy.uix.anchorlayout import AnchorLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.popup import Popup
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.widget import Widget
 from kivy.uix.image import Image
 from kivy.core.window import Window
-from kivy.graphics import Color, RoundedRectangle, Rectangle, Line
+from kivy.graphics import Color, Rectangle, Line
 from kivy.metrics import dp, sp
 from kivy.utils import get_color_from_hex
 from kivy.clock import Clock
-import random
+from kivy.logger import Logger
 import os
 
-from database.db_manager import ReminderDB
+from database.db_manager import DEFAULT_PAGE_SIZE, ReminderDB
+from database.cache import ReminderCache
+from database.change_feed import (
+    ADDED, DELETED, TRIGGERED, ChangeEvent, reminder_changes
+)
+from database.async_db import AsyncReminderDB
+from database.retention import RetentionEngine
 from widgets.calendar_widget import DatePickerPopup
+from widgets.drawing import rounded_background
+from widgets.progressive_loader import ProgressiveLoader
 from services.alarm_scheduler import AlarmScheduler
 from services.notification_service import NotificationService
+from services.rolling_window import ROLLING_WINDOW_SIZE, RollingWindowScheduler
+from utils import clock
 from utils.date_utils import (
     calculate_reminder_date,
     get_notification_timestamp,
     format_date_display,
+    format_day_display,
     validate_future_date,
-    get_days_until
+    get_days_until_day
 )
 
 # ── Colour Palette ──────────────────────────────────────────────
@@ -60,33 +72,21 @@ def _hex(name):
     return get_color_from_hex(THEME[name])
 
 
-def _rounded_bg(widget, color_key, radius=12, alpha=1.0):
-    """Attach a rounded-rect background to *widget*; updates on pos/size."""
+def _rounded_bg(widget, color_key, radius=12, alpha=1.0, shadow=None):
+    """Attach a rounded-rect background to *widget*; updates on pos/size.
+
+    *shadow* is an optional (offset, alpha) drop shadow. Textures are shared
+    by every widget with the same radius and colour (see widgets.drawing).
+    """
     c = list(_hex(color_key))
     if alpha != 1.0:
         c[3] = alpha
-    with widget.canvas.before:
-        Color(*c)
-        widget._bg_rect = RoundedRectangle(pos=widget.pos, size=widget.size,
-                                            radius=[dp(radius)])
-    widget.bind(
-        pos=lambda w, v: setattr(w._bg_rect, 'pos', v),
-        size=lambda w, v: setattr(w._bg_rect, 'size', v),
-    )
-
-
-def _shadow(widget, radius=12, offset=3, alpha=0.12):
-    """Add a subtle drop‑shadow behind *widget*."""
-    with widget.canvas.before:
-        Color(0, 0, 0, alpha)
-        widget._shadow_rect = RoundedRectangle(
-            pos=(widget.x + dp(offset), widget.y - dp(offset)),
-            size=widget.size, radius=[dp(radius)])
-    widget.bind(
-        pos=lambda w, v: setattr(w._shadow_rect, 'pos',
-                                  (v[0] + dp(offset), v[1] - dp(offset))),
-        size=lambda w, v: setattr(w._shadow_rect, 'size', v),
-    )
+    shadow_offset, shadow_alpha = shadow or (0, 0.0)
+    return rounded_background(widget, c, radius, shadow_offset, shadow_alpha)
+
+
+# Drop shadow (offset dp, alpha) used by raised buttons
+DEFAULT_SHADOW = (3, 0.12)
 
 
 # ── Reusable styled button ─────────────────────────────────────
@@ -98,9 +98,191 @@ class StyledButton(Button):
         kw.setdefault('color', (1, 1, 1, 1))
         kw.setdefault('bold', True)
         super().__init__(**kw)
-        if shadow:
-            _shadow(self, radius=radius)
-        _rounded_bg(self, color_key, radius=radius)
+        _rounded_bg(self, color_key, radius=radius,
+                    shadow=DEFAULT_SHADOW if shadow else None)
+
+
+# ── Reminder list ──────────────────────────────────────────────
+CARD_HEIGHT = 152
+TRIGGERED_CHIP = '\u2714  Alarm triggered'
+# Rows in the first page of a progressive load: about one screenful
+FIRST_PAGE_SIZE = 12
+SKELETON_CARDS = 4
+
+
+def _card_data(reminder):
+    """Everything a ReminderCard displays, computed off the UI thread."""
+    if reminder.is_triggered:
+        chip_text = TRIGGERED_CHIP
+    else:
+        days = get_days_until_day(reminder.event_day)
+        alarm_days = max(days - 60, 0)
+        chip_text = f'\u23F0  Alarm in {alarm_days}d  \u2022  Journey in {days}d'
+    return {
+        'reminder_id': reminder.id,
+        'alarm_id': reminder.alarm_id,
+        # List order, same as ReminderDB.page
+        'sort_key': (reminder.event_date, reminder.id),
+        'day_text': f"\U0001F686  {format_day_display(reminder.event_day)}",
+        'note_text': reminder.note if reminder.note else 'No note added',
+        'chip_text': chip_text,
+        'triggered': bool(reminder.is_triggered),
+    }
+
+
+class ReminderCard(RecycleDataViewBehavior, BoxLayout):
+    """One reminder card; a handful are recycled while the list scrolls."""
+
+    def __init__(self, **kw):
+        kw.setdefault('orientation', 'vertical')
+        kw.setdefault('padding', [dp(18), dp(14)])
+        kw.setdefault('spacing', dp(6))
+        super().__init__(**kw)
+        self.reminder_id = None
+        self.alarm_id = None
+        self._list = None
+        _rounded_bg(self, 'card', radius=16, shadow=(3, 0.08))
+
+        # ── top row: date + delete icon ─────────────────────────
+        top_row = BoxLayout(size_hint_y=0.28, spacing=dp(8))
+        self.date_lbl = Label(
+            font_size=sp(17), bold=True, halign='left',
+            color=_hex('text_primary'), size_hint_x=0.82)
+        self.date_lbl.bind(size=self.date_lbl.setter('text_size'))
+
+        del_btn = Button(
+            text='\U0001F5D1', font_size=sp(18),
+            size_hint_x=0.18, background_normal='',
+            background_color=(0, 0, 0, 0),
+            color=_hex('danger'),
+            on_press=self._on_delete)
+        top_row.add_widget(self.date_lbl)
+        top_row.add_widget(del_btn)
+        self.add_widget(top_row)
+
+        # ── divider line ────────────────────────────────────────
+        divider = Widget(size_hint_y=None, height=dp(1))
+        with divider.canvas:
+            Color(*_hex('divider'))
+            divider._r = Rectangle(pos=divider.pos, size=divider.size)
+        divider.bind(pos=lambda w, v: setattr(w._r, 'pos', v),
+                     size=lambda w, v: setattr(w._r, 'size', v))
+        self.add_widget(divider)
+
+        # ── note ────────────────────────────────────────────────
+        self.note_lbl = Label(
+            font_size=sp(14), halign='left', valign='top',
+            color=_hex('text_secondary'), size_hint_y=0.30,
+            shorten=True, shorten_from='right', max_lines=2)
+        self.note_lbl.bind(size=self.note_lbl.setter('text_size'))
+        self.add_widget(self.note_lbl)
+
+        # ── status chip ─────────────────────────────────────────
+        chip_row = BoxLayout(size_hint_y=0.26, padding=[0, dp(4), 0, 0])
+        self.chip = BoxLayout(size_hint=(None, None), size=(dp(260), dp(28)),
+                              padding=[dp(10), dp(2)])
+        _rounded_bg(self.chip, 'warning_light', radius=14)
+        self.chip_label = Label(font_size=sp(12), bold=True, halign='left')
+        self.chip_label.bind(size=self.chip_label.setter('text_size'))
+        self.chip.add_widget(self.chip_label)
+        chip_row.add_widget(self.chip)
+        chip_row.add_widget(Widget())  # spacer
+        self.add_widget(chip_row)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """Rebind this card to another row instead of building a new one."""
+        self._list = rv
+        self.reminder_id = data['reminder_id']
+        self.alarm_id = data['alarm_id']
+        self.date_lbl.text = data['day_text']
+        self.note_lbl.text = data['note_text']
+        self.chip_label.text = data['chip_text']
+        if data['triggered']:
+            self.chip._rounded_bg.set_color(_hex('success_light'))
+            self.chip_label.color = _hex('success')
+        else:
+            self.chip._rounded_bg.set_color(_hex('warning_light'))
+            self.chip_label.color = _hex('warning')
+
+    def _on_delete(self, instance):
+        if self._list is not None and self._list.delete_handler is not None:
+            self._list.delete_handler(self.reminder_id, self.alarm_id)
+
+
+class ReminderList(RecycleView):
+    """Virtualized list: only the cards on screen exist as widgets."""
+
+    def __init__(self, delete_handler=None, **kw):
+        kw.setdefault('do_scroll_x', False)
+        super().__init__(**kw)
+        self.delete_handler = delete_handler
+        self.viewclass = ReminderCard
+        layout = RecycleBoxLayout(
+            orientation='vertical', spacing=dp(14),
+            padding=[dp(18), dp(18), dp(18), dp(90)],
+            default_size=(None, dp(CARD_HEIGHT)), default_size_hint=(1, None),
+            size_hint_y=None)
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+
+    # ── keyed updates ───────────────────────────────────────────
+    # Rows are keyed by reminder_id. Each method touches only the rows
+    # that changed, so the RecycleView rebinds just those cards.
+    def set_rows(self, rows):
+        """Reconcile the list with *rows* (sorted by sort_key)."""
+        data = self.data
+        wanted = {row['reminder_id'] for row in rows}
+        removed = [i for i, row in enumerate(data) if row['reminder_id'] not in wanted]
+        if len(removed) + len(rows) - (len(data) - len(removed)) > len(rows) // 2:
+            # Mostly new content (first load); one swap is cheaper
+            self.data = rows
+            return
+        for i in reversed(removed):
+            data.pop(i)
+        # Both lists are sorted by sort_key, so what is left of data is a
+        # subsequence of rows
+        for i, row in enumerate(rows):
+            if i < len(data) and data[i]['reminder_id'] == row['reminder_id']:
+                if data[i] != row:
+                    data[i] = row
+            else:
+                data.insert(i, row)
+
+    def append_rows(self, rows):
+        """Add rows that sort after the current last row (progressive load)."""
+        data = self.data
+        for i, row in enumerate(rows):
+            if data and row['sort_key'] <= data[-1]['sort_key']:
+                # Already inserted by a change event during the load
+                self.upsert(row)
+            else:
+                data.extend(rows[i:])
+                return
+
+    def upsert(self, row):
+        """Insert *row* at its sorted position, or replace it in place."""
+        data = self.data
+        for i, current in enumerate(data):
+            if current['reminder_id'] == row['reminder_id']:
+                data[i] = row
+                return
+            if current['sort_key'] > row['sort_key']:
+                data.insert(i, row)
+                return
+        data.append(row)
+
+    def remove(self, reminder_id):
+        for i, row in enumerate(self.data):
+            if row['reminder_id'] == reminder_id:
+                self.data.pop(i)
+                return
+
+    def mark_triggered(self, alarm_id):
+        for i, row in enumerate(self.data):
+            if row['alarm_id'] == alarm_id:
+                if not row['triggered']:
+                    self.data[i] = dict(row, chip_text=TRIGGERED_CHIP, triggered=True)
+                return
 
 
 # ── Home Screen ─────────────────────────────────────────────────
@@ -110,6 +292,15 @@ class HomeScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.db = ReminderDB()
+        self.scheduler = AlarmScheduler()
+        self.cache = ReminderCache(self.db)
+        # Single worker keeps cache reads on one thread/read connection
+        self.async_db = AsyncReminderDB(self.db, max_workers=1)
+        self.loader = ProgressiveLoader(self.async_db, batch_size=DEFAULT_PAGE_SIZE)
+        self._refresh_token = 0
+        # Day the list was last loaded; the countdown chips change daily
+        self._loaded_on = None
+        self._unsubscribe = reminder_changes.subscribe(self._on_reminder_change)
 
         root = FloatLayout()
 
@@ -157,14 +348,14 @@ class HomeScreen(Screen):
         content.add_widget(header)
 
         # ── Scrollable reminders ────────────────────────────────
-        self.scroll_view = ScrollView(do_scroll_x=False)
-        self.reminders_layout = GridLayout(
-            cols=1, spacing=dp(14), size_hint_y=None,
-            padding=[dp(18), dp(18), dp(18), dp(90)]
-        )
-        self.reminders_layout.bind(minimum_height=self.reminders_layout.setter('height'))
-        self.scroll_view.add_widget(self.reminders_layout)
-        content.add_widget(self.scroll_view)
+        self.list_area = FloatLayout()
+        self.reminder_list = ReminderList(delete_handler=self.delete_reminder,
+                                          size_hint=(1, 1),
+                                          pos_hint={'x': 0, 'y': 0})
+        self.list_area.add_widget(self.reminder_list)
+        self.empty_state = self._build_empty_state()
+        self.skeleton = self._build_skeleton()
+        content.add_widget(self.list_area)
 
         root.add_widget(content)
 
@@ -176,29 +367,116 @@ class HomeScreen(Screen):
             font_size=sp(30), bold=True, color=(1, 1, 1, 1),
             on_press=self.go_to_add_screen
         )
-        _shadow(fab, radius=30, offset=4, alpha=0.25)
-        _rounded_bg(fab, 'accent', radius=30)
+        _rounded_bg(fab, 'accent', radius=30, shadow=(4, 0.25))
         root.add_widget(fab)
 
         self.add_widget(root)
 
     # ── helpers ──────────────────────────────────────────────────
     def on_enter(self):
-        self.refresh_reminders()
+        # Change events keep the list current; only load it the first time
+        # and when the countdowns moved on to another day
+        if self._loaded_on != clock.now().date() and not self.loader.loading:
+            self.refresh_reminders()
 
     def refresh_reminders(self):
-        self.reminders_layout.clear_widgets()
-        reminders = self.db.get_all_reminders()
-
-        if not reminders:
-            self._show_empty_state()
-        else:
-            for r in reminders:
-                self._build_card(*r)
-
-    def _show_empty_state(self):
-        wrapper = BoxLayout(orientation='vertical', size_hint_y=None,
-                            height=dp(300), padding=[dp(32), dp(48)], spacing=dp(14))
+        # Query and format off the UI thread; only the latest request gets rendered
+        self._refresh_token += 1
+        token = self._refresh_token
+        if not self.reminder_list.data:
+            self._load_progressively()
+            return
+        # A partial progressive load is completed by the keyed diff below
+        self.loader.cancel()
+        self._show_skeleton(False)
+        self.async_db.run(
+            self._load_card_data,
+            callback=lambda rows: self._render_reminders(token, rows))
+
+    def _load_card_data(self):
+        """Runs on the DB worker: one display dict per reminder"""
+        return [_card_data(r) for r in self.cache.iter_all_reminders()]
+
+    def _load_progressively(self):
+        """Stream the list in page by page behind a skeleton placeholder"""
+        self._show_empty_state(False)
+        self._show_skeleton(True)
+        self.loader.start(self._produce_card_pages, self.reminder_list.append_rows,
+                          on_first_rows=lambda: self._show_skeleton(False),
+                          on_done=self._on_progressive_load_done)
+
+    def _produce_card_pages(self, emit):
+        """Runs on the DB worker: a small first page, then full pages"""
+        after = None
+        limit = FIRST_PAGE_SIZE
+        while True:
+            page = self.cache.page(after, limit)
+            if not page or not emit([_card_data(r) for r in page]):
+                return
+            if len(page) < limit:
+                return
+            after = (page[-1].event_date, page[-1].id)
+            limit = DEFAULT_PAGE_SIZE
+
+    def _on_progressive_load_done(self):
+        self._loaded_on = clock.now().date()
+        self._show_skeleton(False)
+        self._show_empty_state(not self.reminder_list.data)
+        print(f"[home] list load: {self.loader.metrics.as_dict()}")
+
+    def load_metrics(self):
+        """Timings of the last progressive load, e.g. time_to_first_card_ms"""
+        return self.loader.metrics.as_dict() if self.loader.metrics else {}
+
+    def _render_reminders(self, token, rows):
+        if token != self._refresh_token:
+            return
+        self.reminder_list.set_rows(rows)
+        self._loaded_on = clock.now().date()
+        self._show_empty_state(not rows)
+
+    def _on_reminder_change(self, event):
+        # Publishers may be on any thread; widgets are touched on the UI thread
+        Clock.schedule_once(lambda dt: self._apply_change(event), 0)
+
+    def _apply_change(self, event):
+        if event.kind == ADDED:
+            self.reminder_list.upsert(_card_data(event.reminder))
+        elif event.kind == DELETED:
+            self.reminder_list.remove(event.reminder_id)
+        elif event.kind == TRIGGERED:
+            self.reminder_list.mark_triggered(event.alarm_id)
+        self._show_empty_state(not self.reminder_list.data)
+
+    def _show_empty_state(self, show):
+        if show and self.empty_state.parent is None:
+            self.list_area.add_widget(self.empty_state)
+        elif not show and self.empty_state.parent is not None:
+            self.list_area.remove_widget(self.empty_state)
+
+    def _show_skeleton(self, show):
+        if show and self.skeleton.parent is None:
+            self.list_area.add_widget(self.skeleton)
+        elif not show and self.skeleton.parent is not None:
+            self.list_area.remove_widget(self.skeleton)
+
+    def _build_skeleton(self):
+        """Grey card outlines shown until the first cards are rendered"""
+        skeleton = BoxLayout(orientation='vertical', size_hint=(1, None),
+                             padding=[dp(18), dp(18)], spacing=dp(14),
+                             pos_hint={'x': 0, 'top': 1})
+        skeleton.height = (SKELETON_CARDS * dp(CARD_HEIGHT)
+                           + (SKELETON_CARDS - 1) * dp(14) + 2 * dp(18))
+        for _ in range(SKELETON_CARDS):
+            placeholder = Widget(size_hint_y=None, height=dp(CARD_HEIGHT))
+            _rounded_bg(placeholder, 'divider', radius=16, alpha=0.6)
+            skeleton.add_widget(placeholder)
+        return skeleton
+
+    def _build_empty_state(self):
+        wrapper = BoxLayout(orientation='vertical', size_hint=(1, None),
+                            height=dp(300), padding=[dp(32), dp(48)], spacing=dp(14),
+                            pos_hint={'x': 0, 'top': 1})
 
         icon = Label(text='\U0001F687', font_size=sp(72), size_hint_y=0.4)
 
@@ -215,78 +493,7 @@ class HomeScreen(Screen):
         wrapper.add_widget(icon)
         wrapper.add_widget(msg)
         wrapper.add_widget(hint)
-        self.reminders_layout.add_widget(wrapper)
-
-    def _build_card(self, reminder_id, event_date, reminder_date, note,
-                    alarm_id, is_triggered):
-        card = BoxLayout(orientation='vertical', size_hint_y=None,
-                         height=dp(152), padding=[dp(18), dp(14)], spacing=dp(6))
-        _shadow(card, radius=16, offset=3, alpha=0.08)
-        _rounded_bg(card, 'card', radius=16)
-
-        # ── top row: date + delete icon ─────────────────────────
-        top_row = BoxLayout(size_hint_y=0.28, spacing=dp(8))
-        date_lbl = Label(
-            text=f"\U0001F686  {format_date_display(event_date)}",
-            font_size=sp(17), bold=True, halign='left',
-            color=_hex('text_primary'), size_hint_x=0.82)
-        date_lbl.bind(size=date_lbl.setter('text_size'))
-
-        del_btn = Button(
-            text='\U0001F5D1', font_size=sp(18),
-            size_hint_x=0.18, background_normal='',
-            background_color=(0, 0, 0, 0),
-            color=_hex('danger'),
-            on_press=lambda x, rid=reminder_id, aid=alarm_id:
-                self.delete_reminder(rid, aid))
-        top_row.add_widget(date_lbl)
-        top_row.add_widget(del_btn)
-        card.add_widget(top_row)
-
-        # ── divider line ────────────────────────────────────────
-        divider = Widget(size_hint_y=None, height=dp(1))
-        with divider.canvas:
-            Color(*_hex('divider'))
-            divider._r = Rectangle(pos=divider.pos, size=divider.size)
-        divider.bind(pos=lambda w, v: setattr(w._r, 'pos', v),
-                     size=lambda w, v: setattr(w._r, 'size', v))
-        card.add_widget(divider)
-
-        # ── note ────────────────────────────────────────────────
-        note_lbl = Label(
-            text=note if note else 'No note added',
-            font_size=sp(14), halign='left', valign='top',
-            color=_hex('text_secondary'), size_hint_y=0.30,
-            shorten=True, shorten_from='right', max_lines=2)
-        note_lbl.bind(size=note_lbl.setter('text_size'))
-        card.add_widget(note_lbl)
-
-        # ── status chip ─────────────────────────────────────────
-        chip_row = BoxLayout(size_hint_y=0.26, padding=[0, dp(4), 0, 0])
-        chip = BoxLayout(size_hint=(None, None), size=(dp(260), dp(28)),
-                         padding=[dp(10), dp(2)])
-
-        if is_triggered:
-            chip_text = '\u2714  Alarm triggered'
-            chip_bg_key = 'success_light'
-            chip_fg = _hex('success')
-        else:
-            days = get_days_until(event_date)
-            alarm_days = max(days - 60, 0)
-            chip_text = f'\u23F0  Alarm in {alarm_days}d  \u2022  Journey in {days}d'
-            chip_bg_key = 'warning_light'
-            chip_fg = _hex('warning')
-
-        _rounded_bg(chip, chip_bg_key, radius=14)
-        chip_label = Label(text=chip_text, font_size=sp(12), bold=True,
-                           color=chip_fg, halign='left')
-        chip_label.bind(size=chip_label.setter('text_size'))
-        chip.add_widget(chip_label)
-        chip_row.add_widget(chip)
-        chip_row.add_widget(Widget())  # spacer
-        card.add_widget(chip_row)
-
-        self.reminders_layout.add_widget(card)
+        return wrapper
 
     def go_to_add_screen(self, instance):
         self.manager.transition = SlideTransition(direction='left')
@@ -317,10 +524,13 @@ class HomeScreen(Screen):
         confirm = StyledButton(text='Delete', color_key='danger',
                                font_size=sp(15), radius=10)
 
+        def _deleted(ok):
+            if ok:
+                reminder_changes.publish(ChangeEvent(DELETED, reminder_id))
+
         def _do_delete(inst):
-            AlarmScheduler().cancel_alarm(alarm_id)
-            self.db.delete_reminder(reminder_id)
-            self.refresh_reminders()
+            self.scheduler.cancel_alarm(alarm_id)
+            self.async_db.delete_reminder(reminder_id, callback=_deleted)
             popup.dismiss()
 
         confirm.bind(on_press=_do_delete)
@@ -340,7 +550,12 @@ class AddReminderScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.db = ReminderDB()
+        # One worker: saves run in order, and the rolling window's boundary
+        # update is not safe to run concurrently
+        self.async_db = AsyncReminderDB(self.db, max_workers=1)
         self.scheduler = AlarmScheduler()
+        self.rolling = (RollingWindowScheduler(self.db, self.scheduler, ROLLING_WINDOW_SIZE)
+                        if ROLLING_WINDOW_SIZE else None)
         self.selected_date = None
 
         root = FloatLayout()
@@ -383,8 +598,7 @@ class AddReminderScreen(Screen):
         # ── Date card ────────────────────────────────────────────
         date_card = BoxLayout(orientation='vertical', size_hint_y=None,
                               height=dp(100), padding=dp(16), spacing=dp(8))
-        _shadow(date_card, radius=14, alpha=0.06)
-        _rounded_bg(date_card, 'card', radius=14)
+        _rounded_bg(date_card, 'card', radius=14, shadow=(3, 0.06))
 
         date_heading = Label(text='Journey Date', font_size=sp(12), bold=True,
                              color=_hex('text_hint'), halign='left',
@@ -403,8 +617,7 @@ class AddReminderScreen(Screen):
         # ── Note card ────────────────────────────────────────────
         note_card = BoxLayout(orientation='vertical', size_hint_y=None,
                               height=dp(180), padding=dp(16), spacing=dp(8))
-        _shadow(note_card, radius=14, alpha=0.06)
-        _rounded_bg(note_card, 'card', radius=14)
+        _rounded_bg(note_card, 'card', radius=14, shadow=(3, 0.06))
 
         note_heading = Label(text='Reminder Note', font_size=sp(12), bold=True,
                              color=_hex('text_hint'), halign='left',
@@ -482,21 +695,44 @@ class AddReminderScreen(Screen):
         if not note:
             self._popup('Missing Note', 'Please enter a reminder note.', 'warning')
             return
-        try:
-            alarm_id = random.randint(1000, 999999)
-            r_date = calculate_reminder_date(self.selected_date)
-            ts = get_notification_timestamp(r_date, '07:45')
-            ok = self.scheduler.schedule_alarm(alarm_id, ts,
-                                               self.selected_date, note)
-            if ok:
-                self.db.add_reminder(self.selected_date, note, alarm_id)
-                self._popup('Done!', 'Reminder saved successfully.', 'success')
-                self.reset_form()
-                Clock.schedule_once(lambda dt: self.go_back(None), 0.8)
-            else:
-                self._popup('Error', 'Failed to schedule alarm.', 'danger')
-        except Exception as e:
-            self._popup('Error', str(e), 'danger')
+        # Disabled until the worker is done, so a double tap saves once
+        self.save_btn.disabled = True
+        # Store first when rolling: the window decides whether to register it
+        store = self._store_in_window if self.rolling is not None else self._store_scheduled
+        self.async_db.run(store, self.selected_date, note,
+                          callback=self._on_reminder_saved,
+                          errback=self._on_save_failed)
+
+    def _store_in_window(self, event_date, note):
+        """Runs on the DB worker: insert, then hand over to the rolling window"""
+        alarm_id = self.db.allocate_alarm_id()
+        reminder_id = self.db.add_reminder(event_date, note, alarm_id)
+        reminder = self.db.get_reminder_by_id(reminder_id)
+        self.rolling.on_reminder_added(reminder)
+        return reminder
+
+    def _store_scheduled(self, event_date, note):
+        """Runs on the DB worker: register the alarm, insert and record it"""
+        alarm_id = self.db.allocate_alarm_id()
+        r_date = calculate_reminder_date(event_date)
+        ts = get_notification_timestamp(r_date, '07:45')
+        if not self.scheduler.schedule_alarm(alarm_id, ts, event_date, note):
+            raise RuntimeError('Failed to schedule alarm.')
+        reminder_id = self.db.add_reminder(event_date, note, alarm_id)
+        self.db.update_scheduled_state([(alarm_id, ts)])
+        return self.db.get_reminder_by_id(reminder_id)
+
+    def _on_save_failed(self, error):
+        self.save_btn.disabled = False
+        self._popup('Error', str(error), 'danger')
+
+    def _on_reminder_saved(self, reminder):
+        # The home screen inserts this one card instead of reloading
+        reminder_changes.publish(ChangeEvent(ADDED, reminder=reminder))
+        self._popup('Done!', 'Reminder saved successfully.', 'success')
+        self.reset_form()
+        self.save_btn.disabled = False
+        Clock.schedule_once(lambda dt: self.go_back(None), 0.8)
 
     def reset_form(self):
         self.selected_date = None
@@ -551,13 +787,27 @@ class TrainBookApp(App):
     def on_start(self):
         print("Train Ticket Reminder App Started")
         print("=" * 50)
+        # Keep the hot table small; runs on the DB worker, off the UI thread
+        home = self.root.get_screen('home')
+        home.async_db.run(RetentionEngine(home.db).run,
+                          callback=lambda stats: home.refresh_reminders()
+                          if stats['archived'] else None)
+
+    def on_resume(self):
+        # The alarm receiver may have written from another process while
+        # paused; its changes are not published, so reconcile with the DB
+        self.root.get_screen('home').refresh_reminders()
 
     def on_stop(self):
-        try:
-            self.root.get_screen('home').db.close()
-            self.root.get_screen('add_reminder').db.close()
-        except Exception:
-            pass
+        for name in ('home', 'add_reminder'):
+            try:
+                screen = self.root.get_screen(name)
+                print(f"[{name}] DB latency (ms): {screen.async_db.latency_report()}")
+                if name == 'home':
+                    print(f"[home] list load (ms): {screen.load_metrics()}")
+                screen.async_db.close(close_db=True)
+            except Exception:
+                Logger.exception(f'TrainBook: error shutting down the {name} screen')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,304 @@
+"""Desktop stand-ins for Android AlarmManager
+
+AlarmScheduler delegates to one of these when not running on Android, so
+scheduling logic can be exercised and benchmarked on a development machine.
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils import clock
+
+
+class InMemoryAlarmBackend:
+    """Records registered alarms the way AlarmManager would hold them
+
+    Registering an alarm ID that is already registered replaces it, like
+    PendingIntent.FLAG_UPDATE_CURRENT does. Nothing ever fires.
+    """
+
+    def __init__(self):
+        self.registered: Dict[int, Tuple[int, str, str]] = {}
+        self.schedule_calls = 0
+        self.cancel_calls = 0
+
+    def schedule(self, alarm_id: int, timestamp_millis: int, event_date: str, note: str) -> bool:
+        """Register or replace an alarm
+
+        Args:
+            alarm_id: Unique ID for this alarm
+            timestamp_millis: Time to trigger alarm (milliseconds since epoch)
+            event_date: Date of the train journey
+            note: User's reminder note
+
+        Returns:
+            True (registration can't fail)
+        """
+        self.schedule_calls += 1
+        self.registered[alarm_id] = (timestamp_millis, event_date, note)
+        return True
+
+    def cancel(self, alarm_id: int) -> bool:
+        """Remove a registered alarm, if any
+
+        Args:
+            alarm_id: ID of the alarm to cancel
+
+        Returns:
+            True (cancelling an unknown alarm is a no-op, as on Android)
+        """
+        self.cancel_calls += 1
+        self.registered.pop(alarm_id, None)
+        return True
+
+    def next_alarm(self) -> Optional[Tuple[int, int]]:
+        """Get the earliest registered alarm
+
+        Returns:
+            (timestamp_millis, alarm_id) or None if nothing is registered
+        """
+        if not self.registered:
+            return None
+        alarm_id = min(self.registered, key=lambda a: (self.registered[a][0], a))
+        return self.registered[alarm_id][0], alarm_id
+
+    def __len__(self):
+        return len(self.registered)
+
+
+class HeapTimerBackend:
+    """In-process alarm backend that actually fires, for desktop and Linux
+
+    Pending alarms live in an indexed binary min-heap keyed on fire time, so
+    schedule, reschedule and cancel are O(log n). A single daemon thread
+    sleeps until the earliest deadline and is only woken when the head of
+    the heap changes, which keeps wakeups low with 100k+ pending timers.
+
+    Fired alarms are passed to ``callback(alarm_id, event_date, note)``,
+    by default services.alarm_receiver.on_alarm_triggered.
+    """
+
+    def __init__(self, callback: Optional[Callable[[int, str, str], None]] = None,
+                 clock: Callable[[], float] = clock.time, threaded: bool = True):
+        """Initialize timer backend
+
+        Args:
+            callback: Called on the timer thread for each fired alarm
+            clock: Returns the current time in seconds since the epoch;
+                defaults to the active utils.clock clock
+            threaded: Start the timer thread on first schedule. Pass False
+                when a virtual clock drives firing through run_due()
+        """
+        self.callback = callback
+        self.clock = clock
+        self.threaded = threaded
+        # Entries are [fire_ms, seq, alarm_id, event_date, note]; seq keeps
+        # equal fire times in scheduling order
+        self._heap: List[list] = []
+        self._index: Dict[int, int] = {}
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self.fired = 0
+        self.wakeups = 0
+
+    # ── Heap primitives (caller holds the lock) ─────────────────
+    @staticmethod
+    def _less(a: list, b: list) -> bool:
+        return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._index[heap[i][2]] = i
+        self._index[heap[j][2]] = j
+
+    def _sift_up(self, i: int):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._less(heap[i], heap[parent]):
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        heap = self._heap
+        n = len(heap)
+        while True:
+            left = 2 * i + 1
+            if left >= n:
+                break
+            child = left
+            right = left + 1
+            if right < n and self._less(heap[right], heap[left]):
+                child = right
+            if not self._less(heap[child], heap[i]):
+                break
+            self._swap(i, child)
+            i = child
+
+    def _remove_at(self, i: int) -> list:
+        heap = self._heap
+        last = len(heap) - 1
+        if i != last:
+            self._swap(i, last)
+        entry = heap.pop()
+        del self._index[entry[2]]
+        if i < len(heap):
+            self._sift_up(i)
+            self._sift_down(i)
+        return entry
+
+    # ── Backend interface ───────────────────────────────────────
+    def schedule(self, alarm_id: int, timestamp_millis: int, event_date: str, note: str) -> bool:
+        """Register or replace an alarm
+
+        Args:
+            alarm_id: Unique ID for this alarm
+            timestamp_millis: Time to trigger alarm (milliseconds since epoch)
+            event_date: Date of the train journey
+            note: User's reminder note
+
+        Returns:
+            True (registration can't fail)
+        """
+        with self._cond:
+            old_head = self._heap[0] if self._heap else None
+            if alarm_id in self._index:
+                self._remove_at(self._index[alarm_id])
+
+            self._seq += 1
+            self._heap.append([timestamp_millis, self._seq, alarm_id, event_date, note])
+            self._index[alarm_id] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+
+            if self._heap[0] is not old_head:
+                self._cond.notify()
+            self._ensure_thread()
+        return True
+
+    def cancel(self, alarm_id: int) -> bool:
+        """Remove a pending alarm, if any
+
+        Args:
+            alarm_id: ID of the alarm to cancel
+
+        Returns:
+            True (cancelling an unknown alarm is a no-op, as on Android)
+        """
+        with self._cond:
+            i = self._index.get(alarm_id)
+            if i is not None:
+                self._remove_at(i)
+                if i == 0:
+                    self._cond.notify()
+        return True
+
+    def next_alarm(self) -> Optional[Tuple[int, int]]:
+        """Get the earliest pending alarm
+
+        Returns:
+            (timestamp_millis, alarm_id) or None if nothing is pending
+        """
+        with self._cond:
+            if not self._heap:
+                return None
+            return self._heap[0][0], self._heap[0][2]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def clear(self):
+        """Drop every pending alarm, as a device reboot does to AlarmManager"""
+        with self._cond:
+            self._heap.clear()
+            self._index.clear()
+            self._cond.notify()
+
+    # ── Firing ──────────────────────────────────────────────────
+    def _fire(self, entry: list):
+        callback = self.callback
+        if callback is None:
+            from services.alarm_receiver import on_alarm_triggered
+            callback = on_alarm_triggered
+        self.fired += 1
+        try:
+            callback(entry[2], entry[3], entry[4])
+        except Exception as e:
+            print(f"Error firing alarm {entry[2]}: {e}")
+
+    def _pop_due(self, now_ms: int) -> Optional[list]:
+        with self._cond:
+            if self._heap and self._heap[0][0] <= now_ms:
+                return self._remove_at(0)
+        return None
+
+    def run_due(self, now_ms: int) -> int:
+        """Fire every alarm due at now_ms on the calling thread
+
+        Lets a virtual clock drive the backend without the timer thread.
+
+        Args:
+            now_ms: Current time in epoch milliseconds
+
+        Returns:
+            Number of alarms fired
+        """
+        fired = 0
+        while True:
+            entry = self._pop_due(now_ms)
+            if entry is None:
+                return fired
+            self._fire(entry)
+            fired += 1
+
+    def _ensure_thread(self):
+        if self.threaded and self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='HeapTimerBackend',
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if not self._heap:
+                        self._cond.wait()
+                    else:
+                        delay_ms = self._heap[0][0] - self.clock() * 1000
+                        if delay_ms <= 0:
+                            break
+                        self._cond.wait(delay_ms / 1000)
+                    self.wakeups += 1
+                if not self._running:
+                    return
+            self.run_due(int(self.clock() * 1000))
+
+    def stop(self):
+        """Stop the timer thread; pending alarms are kept but won't fire"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+_default_backend: Optional[HeapTimerBackend] = None
+_default_backend_lock = threading.Lock()
+
+
+def get_default_backend() -> HeapTimerBackend:
+    """Get the process-wide timer backend used by AlarmScheduler off Android
+
+    Returns:
+        Shared HeapTimerBackend firing on_alarm_triggered
+    """
+    global _default_backend
+    with _default_backend_lock:
+        if _default_backend is None:
+            _default_backend = HeapTimerBackend()
+        return _default_backend
@@ -1,29 +1,72 @@
-"""Broadcast receiver service for handling alarm triggers"""
-from services.notification_service import NotificationService
-from database.db_manager import ReminderDB
-import platform
-import os
+"""Broadcast receiver service for handling alarm triggers
 
+Alarms often fire in a freshly started process, so this module keeps its
+import-time work small: the database, rolling window and scheduler modules
+are only imported when a code path needs them, and the alarm notification
+is posted before anything touches the database.
+"""
+from typing import TYPE_CHECKING, Optional
 
-def on_alarm_triggered(alarm_id: int, event_date: str, note: str):
+from services import jni_registry
+from services.alarm_scheduler import REFILL_ALARM_ID
+
+if TYPE_CHECKING:
+    from database.db_manager import ReminderDB
+    from services.alarm_scheduler import AlarmScheduler
+    from services.notification_service import NotificationService
+
+
+def on_alarm_triggered(alarm_id: int, event_date: str, note: str,
+                       db: Optional['ReminderDB'] = None,
+                       scheduler: Optional['AlarmScheduler'] = None,
+                       notifier: Optional['NotificationService'] = None,
+                       payload: Optional[str] = None):
     """Called when an alarm is triggered
     
     Args:
         alarm_id: The alarm ID that was triggered
         event_date: Date of the train journey
         note: User's reminder note
+        db: Database to update. If None, the row is updated through a
+            short-lived connection (database.fast_path)
+        scheduler: Scheduler used by the refill alarm. If None, a default
+            AlarmScheduler is created
+        notifier: Notification service. If None, the notification is posted
+            from the payload through the process-wide dispatcher
+        payload: Pre-built notification payload carried by the alarm
+            intent. Built from event_date and note if missing
     """
+    if alarm_id == REFILL_ALARM_ID:
+        on_refill_alarm(db, scheduler)
+        return
+    
     print(f"Alarm {alarm_id} triggered for event on {event_date}")
     
     try:
-        # Show notification
-        notification_service = NotificationService()
-        notification_service.show_notification(alarm_id, event_date, note)
+        # Show notification first; the database write can wait
+        if notifier is not None:
+            notifier.show_notification(alarm_id, event_date, note)
+        else:
+            # Grouped with alarms firing alongside it; may be held back by
+            # the post rate limit until drain() below
+            from services.notification_service import get_dispatcher
+            get_dispatcher().submit(alarm_id, event_date, note, payload)
         
         # Mark as triggered in database
-        db = ReminderDB()
-        db.mark_as_triggered(alarm_id)
-        db.close()
+        if db is not None:
+            updated = db.mark_as_triggered(alarm_id)
+        else:
+            from database.fast_path import mark_triggered
+            updated = mark_triggered(alarm_id)
+        
+        if updated:
+            # Lets an open home screen update this card in place
+            from database.change_feed import TRIGGERED, ChangeEvent, reminder_changes
+            reminder_changes.publish(ChangeEvent(TRIGGERED, alarm_id=alarm_id))
+        
+        if notifier is None:
+            # The process may be frozen once the receiver returns
+            get_dispatcher().drain()
         
         print(f"Notification sent and alarm {alarm_id} marked as triggered")
         
@@ -31,14 +74,43 @@ def on_alarm_triggered(alarm_id: int, event_date: str, note: str):
         print(f"Error handling alarm trigger: {e}")
 
 
+def on_refill_alarm(db: Optional['ReminderDB'] = None,
+                    scheduler: Optional['AlarmScheduler'] = None):
+    """Called when the rolling window's refill alarm fires
+    
+    Args:
+        db: Database to read. If None, opens (and closes) the default one
+        scheduler: Scheduler to register alarms with. If None, a default
+            AlarmScheduler is created
+    """
+    from database.db_manager import ReminderDB
+    from services.rolling_window import (
+        DEFAULT_WINDOW_SIZE,
+        ROLLING_WINDOW_SIZE,
+        RollingWindowScheduler
+    )
+    
+    try:
+        own_db = db is None
+        if own_db:
+            db = ReminderDB()
+        registered = RollingWindowScheduler(
+            db, scheduler, window_size=ROLLING_WINDOW_SIZE or DEFAULT_WINDOW_SIZE).refill()
+        if own_db:
+            db.close()
+        print(f"Rolling window refilled with {registered} alarms")
+    except Exception as e:
+        print(f"Error refilling alarm window: {e}")
+
+
 # For Android integration
 def handle_broadcast_receiver():
     """Handle broadcast receiver intent (Android only)"""
-    is_android = platform.system() == 'Linux' and 'ANDROID_ROOT' in os.environ
+    is_android = jni_registry.is_android()
     
     if is_android:
         try:
-            from jnius import autoclass
+            autoclass = jni_registry.autoclass
             
             PythonActivity = autoclass('org.kivy.android.PythonActivity')
             Intent = autoclass('android.content.Intent')
@@ -51,9 +123,10 @@ def handle_broadcast_receiver():
             alarm_id = intent.getIntExtra('alarm_id', -1)
             event_date = intent.getStringExtra('event_date')
             note = intent.getStringExtra('note')
+            payload = intent.getStringExtra('payload')
             
-            if alarm_id != -1 and event_date:
-                on_alarm_triggered(alarm_id, event_date, note)
+            if alarm_id == REFILL_ALARM_ID or (alarm_id != -1 and event_date):
+                on_alarm_triggered(alarm_id, event_date, note, payload=payload)
             
         except Exception as e:
             print(f"Error in broadcast receiver: {e}")
@@ -1,26 +1,47 @@
 """Alarm scheduler using Android AlarmManager"""
-import platform
+from typing import Dict, Iterable
+
+from services import jni_registry
+from services.notification_service import build_alarm_payload
+
+# Reserved request code for the rolling window's refill alarm (below the
+# alarm ID allocator's range)
+REFILL_ALARM_ID = 1
 
 
 class AlarmScheduler:
     """Manages alarm scheduling using Android AlarmManager"""
     
-    def __init__(self):
-        """Initialize alarm scheduler"""
-        self.is_android = platform.system() == 'Linux' and 'ANDROID_ROOT' in os.environ
+    def __init__(self, backend=None):
+        """Initialize alarm scheduler
+        
+        Args:
+            backend: Desktop stand-in for AlarmManager (see
+                services.alarm_backends). Defaults to the shared in-process
+                timer backend, which really fires alarms. Ignored on Android
+        """
+        self.is_android = jni_registry.is_android()
+        self.backend = backend
         
         if self.is_android:
             try:
-                from jnius import autoclass
-                self.PythonActivity = autoclass('org.kivy.android.PythonActivity')
-                self.AlarmManager = autoclass('android.app.AlarmManager')
-                self.PendingIntent = autoclass('android.app.PendingIntent')
-                self.Intent = autoclass('android.content.Intent')
-                self.Context = autoclass('android.content.Context')
+                # Reflected once per process, however many schedulers exist
+                self.PythonActivity = jni_registry.autoclass('org.kivy.android.PythonActivity')
+                self.AlarmManager = jni_registry.autoclass('android.app.AlarmManager')
+                self.PendingIntent = jni_registry.autoclass('android.app.PendingIntent')
+                self.Intent = jni_registry.autoclass('android.content.Intent')
+                self.Context = jni_registry.autoclass('android.content.Context')
             except ImportError:
                 print("Warning: pyjnius not available. Alarm scheduling disabled.")
                 self.is_android = False
     
+    def _desktop_backend(self):
+        """Backend standing in for AlarmManager off Android"""
+        if self.backend is None:
+            from services.alarm_backends import get_default_backend
+            self.backend = get_default_backend()
+        return self.backend
+    
     def schedule_alarm(self, alarm_id: int, timestamp_millis: int, event_date: str, note: str) -> bool:
         """Schedule an exact alarm using AlarmManager
         
@@ -34,14 +55,12 @@ class AlarmScheduler:
             True if scheduling successful, False otherwise
         """
         if not self.is_android:
-            print(f"[Desktop Mode] Would schedule alarm {alarm_id} for {timestamp_millis}")
-            print(f"  Event date: {event_date}")
-            print(f"  Note: {note}")
-            return True
+            return self._desktop_backend().schedule(alarm_id, timestamp_millis,
+                                                    event_date, note)
         
         try:
-            context = self.PythonActivity.mActivity
-            alarm_manager = context.getSystemService(self.Context.ALARM_SERVICE)
+            context = jni_registry.context()
+            alarm_manager = jni_registry.system_service(self.Context.ALARM_SERVICE)
             
             # Create intent with reminder data
             intent = self.Intent()
@@ -49,6 +68,7 @@ class AlarmScheduler:
             intent.putExtra('alarm_id', alarm_id)
             intent.putExtra('event_date', event_date)
             intent.putExtra('note', note)
+            intent.putExtra('payload', build_alarm_payload(event_date, note))
             
             # Create pending intent
             pending_intent = self.PendingIntent.getBroadcast(
@@ -82,12 +102,11 @@ class AlarmScheduler:
             True if cancellation successful, False otherwise
         """
         if not self.is_android:
-            print(f"[Desktop Mode] Would cancel alarm {alarm_id}")
-            return True
+            return self._desktop_backend().cancel(alarm_id)
         
         try:
-            context = self.PythonActivity.mActivity
-            alarm_manager = context.getSystemService(self.Context.ALARM_SERVICE)
+            context = jni_registry.context()
+            alarm_manager = jni_registry.system_service(self.Context.ALARM_SERVICE)
             
             # Create intent matching the scheduled alarm
             intent = self.Intent()
@@ -111,6 +130,112 @@ class AlarmScheduler:
             print(f"Error cancelling alarm: {e}")
             return False
     
+    def schedule_many(self, alarms: Iterable) -> Dict[int, bool]:
+        """Schedule many exact alarms with as few JNI calls as possible
+        
+        The context, AlarmManager handle, flags and a single Intent are
+        looked up once for the whole batch. The Intent is reused with its
+        extras overwritten per alarm: getBroadcast copies it into the
+        PendingIntent record, so later changes don't affect earlier alarms.
+        
+        Args:
+            alarms: Reminder records, or (alarm_id, timestamp_millis,
+                event_date, note) tuples
+        
+        Returns:
+            Dict mapping each alarm_id to True if it was scheduled
+        """
+        items = [(a.alarm_id, a.fire_at_ms, a.event_date, a.note)
+                 if hasattr(a, 'alarm_id') else tuple(a) for a in alarms]
+        results: Dict[int, bool] = {}
+        if not items:
+            return results
+        
+        if not self.is_android:
+            backend = self._desktop_backend()
+            for alarm_id, timestamp_millis, event_date, note in items:
+                results[alarm_id] = backend.schedule(alarm_id, timestamp_millis,
+                                                     event_date, note)
+            return results
+        
+        try:
+            context = jni_registry.context()
+            alarm_manager = jni_registry.system_service(self.Context.ALARM_SERVICE)
+            flags = self.PendingIntent.FLAG_UPDATE_CURRENT | self.PendingIntent.FLAG_IMMUTABLE
+            rtc_wakeup = self.AlarmManager.RTC_WAKEUP
+            get_broadcast = self.PendingIntent.getBroadcast
+            set_exact = alarm_manager.setExactAndAllowWhileIdle
+            
+            intent = self.Intent()
+            intent.setAction('org.trainbook.ALARM_TRIGGERED')
+            put_extra = intent.putExtra
+        except Exception as e:
+            print(f"Error scheduling alarms: {e}")
+            return {item[0]: False for item in items}
+        
+        for alarm_id, timestamp_millis, event_date, note in items:
+            try:
+                put_extra('alarm_id', alarm_id)
+                put_extra('event_date', event_date)
+                put_extra('note', note)
+                put_extra('payload', build_alarm_payload(event_date, note))
+                set_exact(rtc_wakeup, timestamp_millis,
+                          get_broadcast(context, alarm_id, intent, flags))
+                results[alarm_id] = True
+            except Exception as e:
+                print(f"Error scheduling alarm {alarm_id}: {e}")
+                results[alarm_id] = False
+        
+        print(f"Scheduled {sum(results.values())} of {len(items)} alarms")
+        return results
+    
+    def cancel_many(self, alarm_ids: Iterable[int]) -> Dict[int, bool]:
+        """Cancel many alarms, reusing handles and one matching Intent
+        
+        Args:
+            alarm_ids: IDs of the alarms to cancel
+        
+        Returns:
+            Dict mapping each alarm_id to True if it was cancelled
+        """
+        alarm_ids = list(alarm_ids)
+        results: Dict[int, bool] = {}
+        if not alarm_ids:
+            return results
+        
+        if not self.is_android:
+            backend = self._desktop_backend()
+            for alarm_id in alarm_ids:
+                results[alarm_id] = backend.cancel(alarm_id)
+            return results
+        
+        try:
+            context = jni_registry.context()
+            alarm_manager = jni_registry.system_service(self.Context.ALARM_SERVICE)
+            flags = self.PendingIntent.FLAG_UPDATE_CURRENT | self.PendingIntent.FLAG_IMMUTABLE
+            get_broadcast = self.PendingIntent.getBroadcast
+            cancel = alarm_manager.cancel
+            
+            # PendingIntents match on action and request code, not extras
+            intent = self.Intent()
+            intent.setAction('org.trainbook.ALARM_TRIGGERED')
+        except Exception as e:
+            print(f"Error cancelling alarms: {e}")
+            return {alarm_id: False for alarm_id in alarm_ids}
+        
+        for alarm_id in alarm_ids:
+            try:
+                pending_intent = get_broadcast(context, alarm_id, intent, flags)
+                cancel(pending_intent)
+                pending_intent.cancel()
+                results[alarm_id] = True
+            except Exception as e:
+                print(f"Error cancelling alarm {alarm_id}: {e}")
+                results[alarm_id] = False
+        
+        print(f"Cancelled {sum(results.values())} of {len(alarm_ids)} alarms")
+        return results
+    
     def can_schedule_exact_alarms(self) -> bool:
         """Check if app has permission to schedule exact alarms (Android 12+)
         
@@ -121,8 +246,8 @@ class AlarmScheduler:
             return True
         
         try:
-            context = self.PythonActivity.mActivity
-            alarm_manager = context.getSystemService(self.Context.ALARM_SERVICE)
+            context = jni_registry.context()
+            alarm_manager = jni_registry.system_service(self.Context.ALARM_SERVICE)
             
             # Check if canScheduleExactAlarms method exists (Android 12+)
             if hasattr(alarm_manager, 'canScheduleExactAlarms'):
@@ -134,5 +259,3 @@ class AlarmScheduler:
             print(f"Error checking alarm permission: {e}")
             return False
 
-
-import os
@@ -1,47 +1,128 @@
 """Boot receiver service to restore alarms after device reboot"""
+from database.change_feed import TRIGGERED, ChangeEvent, reminder_changes
 from database.db_manager import ReminderDB
+from database.models import Reminder
+from services.notification_service import NotificationService
 from services.alarm_scheduler import AlarmScheduler
-from utils.date_utils import get_notification_timestamp
-import platform
-import os
+from services.reconciler import AlarmReconciler
+from services.rolling_window import ROLLING_WINDOW_SIZE
+from utils import clock
+from services import jni_registry
+from typing import List, Optional
 
 
-def restore_alarms_on_boot():
-    """Restore all pending alarms after device boot"""
+def restore_alarms_on_boot(db: Optional[ReminderDB] = None,
+                           scheduler: Optional[AlarmScheduler] = None,
+                           notifier: Optional[NotificationService] = None):
+    """Restore all pending alarms after device boot
+    
+    Fire times are recomputed first, in case the time zone changed while
+    the device was off, so overdue detection uses current fire times.
+    Reminders whose fire time passed meanwhile are then caught up with one
+    grouped notification. A reboot clears AlarmManager, so every upcoming
+    reminder (or the next rolling window of them) is registered again.
+    
+    Args:
+        db: Database to read. If None, opens (and closes) the default one
+        scheduler: Scheduler to register alarms with. If None, a default
+            AlarmScheduler is created
+        notifier: Notification service for the catch-up summary. If None,
+            a default one is created when something was missed
+    """
     print("Restoring alarms after boot...")
+    own_db = db is None
+    if own_db:
+        try:
+            db = ReminderDB()
+        except Exception as e:
+            print(f"Error opening database, alarms not restored: {e}")
+            return
+    try:
+        try:
+            db.refresh_fire_times()
+        except Exception as e:
+            print(f"Error refreshing fire times: {e}")
+        catch_up_missed(db, notifier)
+        reconcile_alarms(db, scheduler, rebooted=True)
+    finally:
+        if own_db:
+            db.close()
+
+
+def catch_up_missed(db: ReminderDB, notifier: Optional[NotificationService] = None,
+                    now_ms: Optional[int] = None) -> List[Reminder]:
+    """Mark reminders missed while the device was off and notify once
+    
+    Overdue reminders are found with one range query and marked triggered
+    in one transaction, then listed in a single summary notification
+    instead of firing one full-screen alarm each.
+    
+    Args:
+        db: Reminder database
+        notifier: Notification service. If None, a default one is created
+            when something was missed
+        now_ms: Current time in epoch milliseconds. Defaults to now
     
+    Returns:
+        List of the missed Reminder records
+    """
     try:
-        db = ReminderDB()
-        scheduler = AlarmScheduler()
+        if now_ms is None:
+            now_ms = clock.time_ms()
+        missed = db.claim_overdue(now_ms)
+        for reminder in missed:
+            reminder_changes.publish(ChangeEvent(TRIGGERED, reminder.id,
+                                                 alarm_id=reminder.alarm_id))
+        if missed:
+            if notifier is None:
+                notifier = NotificationService()
+            notifier.show_missed_summary(missed)
+            print(f"Caught up {len(missed)} missed reminders")
+        return missed
         
-        # Get all pending reminders
-        pending_reminders = db.get_pending_reminders()
+    except Exception as e:
+        print(f"Error catching up missed reminders: {e}")
+        return []
+
+
+def reconcile_alarms(db: Optional[ReminderDB] = None,
+                     scheduler: Optional[AlarmScheduler] = None,
+                     rebooted: bool = False, refresh_fire_times: bool = False):
+    """Schedule and cancel only the alarms that differ from the database
+    
+    Args:
+        db: Database to read. If None, opens (and closes) the default one
+        scheduler: Scheduler to register alarms with. If None, a default
+            AlarmScheduler is created
+        rebooted: AlarmManager was wiped and holds no alarms
+        refresh_fire_times: Recompute fire times first (time zone change)
+    
+    Returns:
+        Dict of operation counts from AlarmReconciler.reconcile, or None on error
+    """
+    try:
+        own_db = db is None
+        if own_db:
+            db = ReminderDB()
         
-        restored_count = 0
-        for reminder in pending_reminders:
-            reminder_id, event_date, reminder_date, reminder_time, note, alarm_id = reminder
-            
-            # Calculate timestamp
-            timestamp = get_notification_timestamp(reminder_date, reminder_time)
-            
-            # Re-schedule alarm
-            success = scheduler.schedule_alarm(alarm_id, timestamp, event_date, note)
-            
-            if success:
-                restored_count += 1
-                print(f"Restored alarm {alarm_id} for {event_date}")
+        result = AlarmReconciler(db, scheduler, ROLLING_WINDOW_SIZE).reconcile(
+            rebooted=rebooted, refresh_fire_times=refresh_fire_times)
+        print(f"Alarms reconciled: {result['scheduled']} scheduled, "
+              f"{result['cancelled']} cancelled, {result['unchanged']} unchanged")
         
-        print(f"Successfully restored {restored_count} alarms")
-        db.close()
+        if own_db:
+            db.close()
+        return result
         
     except Exception as e:
         print(f"Error restoring alarms: {e}")
+        return None
 
 
 # For Android BroadcastReceiver integration
 def on_boot_completed():
     """Called when device boots (Android only)"""
-    is_android = platform.system() == 'Linux' and 'ANDROID_ROOT' in os.environ
+    is_android = jni_registry.is_android()
     
     if is_android:
         try:
@@ -56,6 +137,16 @@ def on_boot_completed():
         print("Not running on Android, skipping boot receiver")
 
 
+def on_timezone_changed():
+    """Called on ACTION_TIMEZONE_CHANGED / ACTION_TIME_CHANGED"""
+    reconcile_alarms(refresh_fire_times=True)
+
+
+def on_package_replaced():
+    """Called on ACTION_MY_PACKAGE_REPLACED after an app update"""
+    reconcile_alarms()
+
+
 if __name__ == '__main__':
     # For testing on desktop
     restore_alarms_on_boot()
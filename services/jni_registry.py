@@ -0,0 +1,122 @@
+"""Process-wide cache of reflected Java classes and system service handles
+
+``jnius.autoclass`` reflects every method and field of a class on each
+call, and ``getSystemService`` is a JNI round trip that returns the same
+manager every time. Services used to repeat both whenever they were
+constructed or called; going through this module pays for each class and
+handle once per process.
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+_classes: Dict[str, Any] = {}
+_services: Dict[str, Any] = {}
+_context = None
+_is_android: Optional[bool] = None
+_sdk_int: Optional[int] = None
+_lock = threading.RLock()
+
+# Lookups served from the cache and ones that crossed into Java
+hits = 0
+misses = 0
+
+
+def is_android() -> bool:
+    """Check once whether the process runs on Android"""
+    global _is_android
+    if _is_android is None:
+        import platform
+        _is_android = platform.system() == 'Linux' and 'ANDROID_ROOT' in os.environ
+    return _is_android
+
+
+def autoclass(name: str) -> Any:
+    """Get a reflected Java class, reflecting it on first use only
+
+    Args:
+        name: Fully qualified class name, e.g. 'android.content.Intent'
+
+    Returns:
+        jnius class proxy
+
+    Raises:
+        ImportError: pyjnius is not available
+    """
+    global hits, misses
+    cls = _classes.get(name)
+    if cls is not None:
+        hits += 1
+        return cls
+    with _lock:
+        cls = _classes.get(name)
+        if cls is None:
+            from jnius import autoclass as jnius_autoclass
+            cls = _classes[name] = jnius_autoclass(name)
+            misses += 1
+        else:
+            hits += 1
+        return cls
+
+
+def context() -> Any:
+    """Get the application Context
+
+    Taken from the running activity, or from the service when the process
+    was started for a broadcast without UI. The application context lives
+    as long as the process, so it is safe to keep.
+    """
+    global _context
+    if _context is None:
+        with _lock:
+            if _context is None:
+                owner = autoclass('org.kivy.android.PythonActivity').mActivity
+                if owner is None:
+                    owner = autoclass('org.kivy.android.PythonService').mService
+                _context = owner.getApplicationContext()
+    return _context
+
+
+def sdk_int() -> int:
+    """Get the device's API level (Build.VERSION.SDK_INT), read once"""
+    global _sdk_int
+    if _sdk_int is None:
+        _sdk_int = autoclass('android.os.Build$VERSION').SDK_INT
+    return _sdk_int
+
+
+def system_service(name: str) -> Any:
+    """Get a system service handle such as AlarmManager
+
+    Args:
+        name: Service name, e.g. Context.ALARM_SERVICE
+
+    Returns:
+        Service handle, resolved once per process
+    """
+    global hits, misses
+    service = _services.get(name)
+    if service is not None:
+        hits += 1
+        return service
+    with _lock:
+        service = _services.get(name)
+        if service is None:
+            service = _services[name] = context().getSystemService(name)
+            misses += 1
+        else:
+            hits += 1
+        return service
+
+
+def reset():
+    """Forget every cached class and handle (tests, fake jnius installs)"""
+    global _context, _is_android, _sdk_int, hits, misses
+    with _lock:
+        _classes.clear()
+        _services.clear()
+        _context = None
+        _is_android = None
+        _sdk_int = None
+        hits = 0
+        misses = 0
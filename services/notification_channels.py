@@ -0,0 +1,251 @@
+"""Idempotent registry of the app's notification channels
+
+Each channel is described by a ChannelSpec. The spec is hashed, and the
+hash last applied for each channel is kept both in memory and in a small
+text file next to the database. createNotificationChannel, together with
+its RingtoneManager and AudioAttributes lookups, only runs when a channel
+is new or its spec changed. Otherwise ensure_channels() costs a dict lookup
+(a file read once per process).
+
+A file is used rather than the meta table so the alarm receiver can check
+channels before it opens the database. Hashing uses zlib and the file holds
+plain "channel_id version" lines, so the check imports nothing heavy.
+
+The file can outlive the channels it describes: Android auto-backup may
+restore it onto a new install or device. So the first check of each
+channel in a process also asks NotificationManager whether it exists, and
+a missing channel is created again whatever the file says.
+
+Note that Android only applies name and description changes to an
+existing channel; behaviour such as importance or sound is owned by the
+user once the channel exists, so changing it needs a new channel ID.
+"""
+import os
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional, Set
+
+from services import jni_registry
+
+URGENT_CHANNEL_ID = 'train_reminders'
+DIGEST_CHANNEL_ID = 'train_reminders_digest'
+SILENT_CHANNEL_ID = 'train_reminders_silent'
+
+STATE_FILENAME = 'notification_channels.txt'
+
+# Android 8.0 (API 26) introduced notification channels
+_MIN_CHANNEL_SDK = 26
+
+_IMPORTANCE_FIELDS = {
+    'high': 'IMPORTANCE_HIGH',
+    'default': 'IMPORTANCE_DEFAULT',
+    'low': 'IMPORTANCE_LOW',
+    'min': 'IMPORTANCE_MIN',
+}
+
+# sound -> (RingtoneManager type field, AudioAttributes usage field)
+_SOUND_FIELDS = {
+    'alarm': ('TYPE_ALARM', 'USAGE_ALARM'),
+    'notification': ('TYPE_NOTIFICATION', 'USAGE_NOTIFICATION'),
+}
+
+
+class ChannelSpec:
+    """Configuration of one notification channel"""
+
+    def __init__(self, channel_id: str, name: str, description: str,
+                 importance: str = 'default', sound: Optional[str] = None,
+                 vibration_pattern: Optional[List[int]] = None, lights: bool = False):
+        """Describe a channel
+
+        Args:
+            channel_id: Stable channel ID
+            name: Name shown in system settings
+            description: Description shown in system settings
+            importance: 'high', 'default', 'low' or 'min'
+            sound: 'alarm', 'notification' or None for silent
+            vibration_pattern: Vibration timings in ms, or None for none
+            lights: Blink the notification LED
+        """
+        self.channel_id = channel_id
+        self.name = name
+        self.description = description
+        self.importance = importance
+        self.sound = sound
+        self.vibration_pattern = list(vibration_pattern) if vibration_pattern else None
+        self.lights = lights
+
+    def version(self) -> str:
+        """Hash of the configuration; changes whenever any field changes"""
+        config = repr((self.channel_id, self.name, self.description, self.importance,
+                       self.sound, self.vibration_pattern, self.lights))
+        return format(zlib.crc32(config.encode('utf-8')), '08x')
+
+
+CHANNELS: Dict[str, ChannelSpec] = {spec.channel_id: spec for spec in (
+    ChannelSpec(URGENT_CHANNEL_ID, 'Train Ticket Reminders',
+                'Train ticket booking alarms', importance='high', sound='alarm',
+                vibration_pattern=[0, 1000, 500, 1000], lights=True),
+    ChannelSpec(DIGEST_CHANNEL_ID, 'Reminder Summaries',
+                'Grouped and missed reminders', importance='default',
+                sound='notification'),
+    ChannelSpec(SILENT_CHANNEL_ID, 'Quiet Updates',
+                'Reminders delivered without sound or vibration', importance='low'),
+)}
+
+_applied: Optional[Dict[str, str]] = None
+# Channels seen to exist in NotificationManager in this process
+_verified: Set[str] = set()
+_lock = threading.Lock()
+
+# createNotificationChannel calls made and ensure_channels calls that
+# needed none
+created = 0
+skipped = 0
+
+
+def state_path() -> str:
+    """Location of the applied-versions file (next to the database)"""
+    from database.fast_path import default_db_path
+    return os.path.join(os.path.dirname(default_db_path()), STATE_FILENAME)
+
+
+def _load_applied() -> Dict[str, str]:
+    global _applied
+    if _applied is None:
+        _applied = {}
+        try:
+            with open(state_path()) as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2:
+                        _applied[parts[0]] = parts[1]
+        except OSError:
+            pass
+    return _applied
+
+
+def _save_applied(applied: Dict[str, str]):
+    path = state_path()
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            f.writelines(f"{channel_id} {version}\n"
+                         for channel_id, version in sorted(applied.items()))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error saving notification channel state: {e}")
+
+
+def ensure_channels(channel_ids: Optional[Iterable[str]] = None, force: bool = False) -> int:
+    """Create or update channels whose spec changed since last applied
+
+    Args:
+        channel_ids: Channels to check. Defaults to all of CHANNELS
+        force: Apply even if the stored version matches
+
+    Returns:
+        Number of channels created or updated
+    """
+    global created, skipped
+    if not jni_registry.is_android():
+        return 0
+    ids = list(CHANNELS) if channel_ids is None else list(channel_ids)
+
+    with _lock:
+        applied = _load_applied()
+        stale = [CHANNELS[i] for i in ids
+                 if force or applied.get(i) != CHANNELS[i].version()
+                 or not _channel_exists(i)]
+        if not stale:
+            skipped += 1
+            return 0
+
+        try:
+            if jni_registry.sdk_int() < _MIN_CHANNEL_SDK:
+                # Nothing to create before Android 8.0; remember that
+                for spec in stale:
+                    applied[spec.channel_id] = spec.version()
+                _save_applied(applied)
+                return 0
+
+            applied_now = 0
+            for spec in stale:
+                if _create_channel(spec):
+                    applied[spec.channel_id] = spec.version()
+                    _verified.add(spec.channel_id)
+                    applied_now += 1
+            created += applied_now
+            if applied_now:
+                _save_applied(applied)
+            return applied_now
+
+        except Exception as e:
+            print(f"Error creating notification channels: {e}")
+            return 0
+
+
+def _channel_exists(channel_id: str) -> bool:
+    """Whether NotificationManager has the channel; asked once per process"""
+    if channel_id in _verified:
+        return True
+    try:
+        if jni_registry.sdk_int() >= _MIN_CHANNEL_SDK:
+            notification_manager = jni_registry.system_service('notification')
+            if notification_manager.getNotificationChannel(channel_id) is None:
+                return False
+    except Exception as e:
+        print(f"Error checking notification channel {channel_id}: {e}")
+        return False
+    _verified.add(channel_id)
+    return True
+
+
+def _create_channel(spec: ChannelSpec) -> bool:
+    try:
+        autoclass = jni_registry.autoclass
+        NotificationChannel = autoclass('android.app.NotificationChannel')
+        NotificationManager = autoclass('android.app.NotificationManager')
+        notification_manager = jni_registry.system_service('notification')
+
+        channel = NotificationChannel(
+            spec.channel_id,
+            spec.name,
+            getattr(NotificationManager, _IMPORTANCE_FIELDS[spec.importance])
+        )
+        channel.setDescription(spec.description)
+        channel.enableLights(spec.lights)
+        channel.enableVibration(spec.vibration_pattern is not None)
+        if spec.vibration_pattern is not None:
+            channel.setVibrationPattern(spec.vibration_pattern)
+
+        if spec.sound is None:
+            channel.setSound(None, None)
+        else:
+            ringtone_type, usage = _SOUND_FIELDS[spec.sound]
+            RingtoneManager = autoclass('android.media.RingtoneManager')
+            AudioAttributes = autoclass('android.media.AudioAttributes')
+            channel.setSound(
+                RingtoneManager.getDefaultUri(getattr(RingtoneManager, ringtone_type)),
+                autoclass('android.media.AudioAttributes$Builder')()
+                    .setUsage(getattr(AudioAttributes, usage))
+                    .setContentType(AudioAttributes.CONTENT_TYPE_SONIFICATION)
+                    .build()
+            )
+
+        notification_manager.createNotificationChannel(channel)
+        return True
+
+    except Exception as e:
+        print(f"Error creating notification channel {spec.channel_id}: {e}")
+        return False
+
+
+def reset():
+    """Forget the in-memory state so the file is read and channels checked again"""
+    global _applied, created, skipped
+    with _lock:
+        _applied = None
+        _verified.clear()
+        created = 0
+        skipped = 0
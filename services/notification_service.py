@@ -1,6 +1,56 @@
 """Notification service for displaying reminders"""
-import platform
-import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+from services import jni_registry, notification_channels
+from services.notification_channels import (
+    DIGEST_CHANNEL_ID,
+    SILENT_CHANNEL_ID,
+    URGENT_CHANNEL_ID
+)
+from utils import clock
+
+CHANNEL_ID = URGENT_CHANNEL_ID
+
+ALARM_TITLE = "⚠️ TRAIN TICKET BOOKING ALARM"
+
+# Separates title and message in a serialized alarm payload
+_PAYLOAD_SEPARATOR = '\x1e'
+
+# Value of Context.NOTIFICATION_SERVICE, so the fast path needn't reflect Context
+_NOTIFICATION_SERVICE = 'notification'
+
+# Notification ID of the missed-reminders summary. Below the alarm ID
+# allocator's range; MISSED_SUMMARY_ID + 1 is its tap request code.
+MISSED_SUMMARY_ID = 2
+
+# Lines listed in the summary before it falls back to "+N more"
+MISSED_SUMMARY_MAX_LINES = 6
+
+# Notification ID of the summary of reminders firing together. Its
+# full-screen and tap request codes are GROUP_SUMMARY_ID and + 1.
+GROUP_SUMMARY_ID = 4
+GROUP_KEY = 'train_reminders_group'
+
+# Triggers arriving within this many seconds of the first are grouped
+COALESCE_WINDOW_S = 1.5
+
+# Lines listed in the group summary before it falls back to "+N more"
+GROUP_SUMMARY_MAX_LINES = 6
+
+# At most one full-screen intent per this many seconds
+FULL_SCREEN_INTERVAL_S = 30.0
+
+# Android sheds notify() calls beyond roughly 5 per second per app
+POST_RATE_PER_S = 5
+
+# Posts waiting for the rate limiter before new ones are dropped
+MAX_QUEUE_DEPTH = 32
+
+# Longest the alarm receiver waits for held-back posts before returning
+DRAIN_TIMEOUT_S = 2.0
 
 
 class NotificationService:
@@ -8,13 +58,14 @@ class NotificationService:
     
     def __init__(self):
         """Initialize notification service"""
-        self.is_android = platform.system() == 'Linux' and 'ANDROID_ROOT' in os.environ
-        self.channel_id = 'train_reminders'
-        self.channel_name = 'Train Ticket Reminders'
+        self.is_android = jni_registry.is_android()
+        self.channel_id = CHANNEL_ID
+        self.channel_name = notification_channels.CHANNELS[CHANNEL_ID].name
         
         if self.is_android:
             try:
-                from jnius import autoclass
+                # Reflected once per process, however many services exist
+                autoclass = jni_registry.autoclass
                 self.PythonActivity = autoclass('org.kivy.android.PythonActivity')
                 self.NotificationBuilder = autoclass('android.app.Notification$Builder')
                 self.NotificationManager = autoclass('android.app.NotificationManager')
@@ -23,116 +74,197 @@ class NotificationService:
                 self.PendingIntent = autoclass('android.app.PendingIntent')
                 self.Intent = autoclass('android.content.Intent')
                 
-                # Create notification channel (required for Android 8.0+)
-                self._create_notification_channel()
+                # Create notification channels (required for Android 8.0+);
+                # a no-op unless their configuration changed
+                notification_channels.ensure_channels()
                 
             except ImportError:
                 print("Warning: pyjnius not available. Notifications disabled.")
                 self.is_android = False
     
-    def _create_notification_channel(self):
-        """Create notification channel for Android 8.0+"""
-        try:
-            from jnius import autoclass
-            
-            context = self.PythonActivity.mActivity
-            notification_manager = context.getSystemService(self.Context.NOTIFICATION_SERVICE)
-            
-            # Create high-priority alarm channel
-            channel = self.NotificationChannel(
-                self.channel_id,
-                self.channel_name,
-                self.NotificationManager.IMPORTANCE_HIGH
-            )
-            channel.setDescription('Train ticket booking alarms')
-            channel.enableVibration(True)
-            channel.enableLights(True)
-            
-            # Set vibration pattern for alarm (vibrate: 0ms wait, 1000ms vibrate, 500ms wait, 1000ms vibrate)
-            vibration_pattern = [0, 1000, 500, 1000]
-            channel.setVibrationPattern(vibration_pattern)
-            
-            # Enable sound
-            channel.setSound(
-                autoclass('android.media.RingtoneManager').getDefaultUri(
-                    autoclass('android.media.RingtoneManager').TYPE_ALARM
-                ),
-                autoclass('android.media.AudioAttributes$Builder')()
-                    .setUsage(autoclass('android.media.AudioAttributes').USAGE_ALARM)
-                    .setContentType(autoclass('android.media.AudioAttributes').CONTENT_TYPE_SONIFICATION)
-                    .build()
-            )
-            
-            notification_manager.createNotificationChannel(channel)
-            
-        except Exception as e:
-            print(f"Error creating notification channel: {e}")
-    
     def show_notification(self, alarm_id: int, event_date: str, note: str):
         """Display high-priority alarm notification for train ticket booking
         
+        Goes through the process-wide dispatcher, so reminders firing
+        together are grouped under one summary.
+        
         Args:
             alarm_id: Unique ID for this notification
             event_date: Date of train journey
             note: User's reminder note
         """
-        title = "⚠️ TRAIN TICKET BOOKING ALARM"
-        message = f"Book train ticket NOW for {event_date}\n{note}"
+        get_dispatcher().submit(alarm_id, event_date, note)
+    
+    def show_missed_summary(self, reminders: Sequence):
+        """Display one notification listing reminders missed while the phone was off
+        
+        Unlike show_notification there is no full-screen intent: a single
+        heads-up notification replaces the burst of alarms the missed
+        reminders would otherwise raise.
+        
+        Args:
+            reminders: Missed Reminder records, oldest first
+        """
+        if not reminders:
+            return
+        
+        count = len(reminders)
+        title = (f"{count} missed train ticket reminder" if count == 1
+                 else f"{count} missed train ticket reminders")
+        lines = [f"{r.event_date}: {r.note}" for r in reminders[:MISSED_SUMMARY_MAX_LINES]]
+        if count > MISSED_SUMMARY_MAX_LINES:
+            lines.append(f"+{count - MISSED_SUMMARY_MAX_LINES} more")
         
         if not self.is_android:
             print(f"\n{'='*50}")
-            print(f"[ALARM NOTIFICATION {alarm_id}]")
+            print(f"[MISSED REMINDERS {count}]")
             print(f"Title: {title}")
-            print(f"Message: {message}")
+            for line in lines:
+                print(f"  {line}")
             print(f"{'='*50}\n")
             return
         
         try:
-            from jnius import autoclass
-            
-            context = self.PythonActivity.mActivity
-            notification_manager = context.getSystemService(self.Context.NOTIFICATION_SERVICE)
-            
-            # Create full-screen intent to show alarm even when phone is locked
-            full_screen_intent = self.Intent(context, self.PythonActivity)
-            full_screen_intent.setFlags(
-                self.Intent.FLAG_ACTIVITY_NEW_TASK | 
-                self.Intent.FLAG_ACTIVITY_CLEAR_TASK |
-                self.Intent.FLAG_ACTIVITY_EXCLUDE_FROM_RECENTS
-            )
+            autoclass = jni_registry.autoclass
             
-            full_screen_pending_intent = self.PendingIntent.getActivity(
-                context,
-                alarm_id,
-                full_screen_intent,
-                self.PendingIntent.FLAG_UPDATE_CURRENT | self.PendingIntent.FLAG_IMMUTABLE
-            )
+            context = jni_registry.context()
+            notification_manager = jni_registry.system_service(self.Context.NOTIFICATION_SERVICE)
             
-            # Create regular intent for when notification is tapped
             tap_intent = self.Intent(context, self.PythonActivity)
             tap_intent.setFlags(self.Intent.FLAG_ACTIVITY_NEW_TASK | self.Intent.FLAG_ACTIVITY_CLEAR_TASK)
-            
             tap_pending_intent = self.PendingIntent.getActivity(
                 context,
-                alarm_id + 1,
+                MISSED_SUMMARY_ID + 1,
                 tap_intent,
                 self.PendingIntent.FLAG_UPDATE_CURRENT | self.PendingIntent.FLAG_IMMUTABLE
             )
             
-            # Build high-priority alarm notification
-            builder = self.NotificationBuilder(context, self.channel_id)
+            InboxStyle = autoclass('android.app.Notification$InboxStyle')
+            inbox_style = InboxStyle()
+            inbox_style.setBigContentTitle(title)
+            for line in lines:
+                inbox_style.addLine(line)
+            
+            builder = self.NotificationBuilder(context, DIGEST_CHANNEL_ID)
             builder.setContentTitle(title)
-            builder.setContentText(message)
+            builder.setContentText(lines[0])
             builder.setSmallIcon(context.getApplicationInfo().icon)
             builder.setContentIntent(tap_pending_intent)
-            builder.setFullScreenIntent(full_screen_pending_intent, True)  # Show as full-screen alarm
             builder.setAutoCancel(True)
-            builder.setPriority(self.NotificationBuilder.PRIORITY_MAX)
-            builder.setCategory(self.NotificationBuilder.CATEGORY_ALARM)
+            builder.setNumber(count)
+            builder.setPriority(self.NotificationBuilder.PRIORITY_HIGH)
+            builder.setCategory(self.NotificationBuilder.CATEGORY_REMINDER)
+            builder.setStyle(inbox_style)
             
-            # Make it persistent and ongoing until dismissed
-            builder.setOngoing(False)
+            notification_manager.notify(MISSED_SUMMARY_ID, builder.build())
             
+            print(f"Missed reminders summary displayed ({count} reminders)")
+            
+        except Exception as e:
+            print(f"Error showing missed reminders summary: {e}")
+
+
+def build_alarm_payload(event_date: str, note: str) -> str:
+    """Render the alarm notification text ahead of time
+    
+    Built when the alarm is scheduled and carried in the alarm intent, so
+    the receiver has nothing to format or look up before notifying.
+    
+    Args:
+        event_date: Date of train journey
+        note: User's reminder note
+    
+    Returns:
+        Serialized payload for notify_alarm
+    """
+    return f"{ALARM_TITLE}{_PAYLOAD_SEPARATOR}Book train ticket NOW for {event_date}\n{note}"
+
+
+def notify_alarm(alarm_id: int, payload: str, channel_id: str = CHANNEL_ID,
+                 ensure_channel: bool = True, full_screen: bool = True,
+                 group: Optional[str] = None):
+    """Post the full-screen alarm notification from a pre-built payload
+    
+    The alarm receiver's fast path: no NotificationService is constructed,
+    classes and handles come from jni_registry, the channel is only created
+    if its configuration changed, and on Android 8.0+ the sound, vibration
+    and light settings (which the channel governs there) are skipped.
+    
+    Args:
+        alarm_id: Unique ID for this notification
+        payload: Result of build_alarm_payload
+        channel_id: Notification channel to post to
+        ensure_channel: Make sure the channel is up to date first
+        full_screen: Attach the full-screen intent
+        group: Post as a quiet child of this notification group
+    """
+    title, message = payload.split(_PAYLOAD_SEPARATOR, 1)
+    
+    if not jni_registry.is_android():
+        if group is not None:
+            print(f"[GROUPED NOTIFICATION {alarm_id}] {message.splitlines()[0]}")
+            return
+        print(f"\n{'='*50}")
+        print(f"[ALARM NOTIFICATION {alarm_id}]")
+        print(f"Title: {title}")
+        print(f"Message: {message}")
+        print(f"{'='*50}\n")
+        return
+    
+    try:
+        autoclass = jni_registry.autoclass
+        PythonActivity = autoclass('org.kivy.android.PythonActivity')
+        NotificationBuilder = autoclass('android.app.Notification$Builder')
+        PendingIntent = autoclass('android.app.PendingIntent')
+        Intent = autoclass('android.content.Intent')
+        sdk_int = jni_registry.sdk_int()
+        
+        context = jni_registry.context()
+        notification_manager = jni_registry.system_service(_NOTIFICATION_SERVICE)
+        
+        if ensure_channel:
+            notification_channels.ensure_channels([channel_id])
+        
+        # Create regular intent for when notification is tapped. Its
+        # request code alarm_id + 1 is reserved by the alarm ID allocator.
+        tap_intent = Intent(context, PythonActivity)
+        tap_intent.setFlags(Intent.FLAG_ACTIVITY_NEW_TASK | Intent.FLAG_ACTIVITY_CLEAR_TASK)
+        
+        tap_pending_intent = PendingIntent.getActivity(
+            context,
+            alarm_id + 1,
+            tap_intent,
+            PendingIntent.FLAG_UPDATE_CURRENT | PendingIntent.FLAG_IMMUTABLE
+        )
+        
+        # Build high-priority alarm notification
+        builder = NotificationBuilder(context, channel_id)
+        builder.setContentTitle(title)
+        builder.setContentText(message)
+        builder.setSmallIcon(context.getApplicationInfo().icon)
+        builder.setContentIntent(tap_pending_intent)
+        if full_screen:
+            # Show as full-screen alarm even when the phone is locked
+            builder.setFullScreenIntent(
+                _full_screen_pending_intent(context, alarm_id), True)
+        builder.setAutoCancel(True)
+        builder.setCategory(NotificationBuilder.CATEGORY_ALARM)
+        
+        # Make it persistent and ongoing until dismissed
+        builder.setOngoing(False)
+        
+        if group is not None:
+            # The group summary makes the sound; children stay quiet,
+            # including when an already shown alarm is re-posted into the group
+            builder.setGroup(group)
+            builder.setOnlyAlertOnce(True)
+            builder.setPriority(NotificationBuilder.PRIORITY_LOW)
+            if sdk_int >= 26:
+                builder.setGroupAlertBehavior(NotificationBuilder.GROUP_ALERT_SUMMARY)
+        else:
+            builder.setPriority(NotificationBuilder.PRIORITY_MAX)
+        
+        if sdk_int < 26 and group is None:
             # Set alarm sound
             RingtoneManager = autoclass('android.media.RingtoneManager')
             alarm_sound = RingtoneManager.getDefaultUri(RingtoneManager.TYPE_ALARM)
@@ -143,18 +275,414 @@ class NotificationService:
             
             # LED lights
             builder.setLights(0xFFFF0000, 1000, 500)  # Red light, 1s on, 0.5s off
-            
-            # For long text, use big text style
-            BigTextStyle = autoclass('android.app.Notification$BigTextStyle')
-            big_text_style = BigTextStyle()
-            big_text_style.bigText(message)
-            big_text_style.setBigContentTitle(title)
-            builder.setStyle(big_text_style)
-            
-            # Show notification
-            notification_manager.notify(alarm_id, builder.build())
-            
-            print(f"Alarm notification {alarm_id} displayed successfully")
-            
-        except Exception as e:
-            print(f"Error showing alarm notification: {e}")
+        
+        # For long text, use big text style
+        BigTextStyle = autoclass('android.app.Notification$BigTextStyle')
+        big_text_style = BigTextStyle()
+        big_text_style.bigText(message)
+        big_text_style.setBigContentTitle(title)
+        builder.setStyle(big_text_style)
+        
+        # Show notification
+        notification_manager.notify(alarm_id, builder.build())
+        
+        print(f"Alarm notification {alarm_id} displayed successfully")
+        
+    except Exception as e:
+        print(f"Error showing alarm notification: {e}")
+
+
+def _full_screen_pending_intent(context, request_code: int):
+    """PendingIntent opening the app over the lock screen"""
+    autoclass = jni_registry.autoclass
+    PythonActivity = autoclass('org.kivy.android.PythonActivity')
+    PendingIntent = autoclass('android.app.PendingIntent')
+    Intent = autoclass('android.content.Intent')
+    
+    full_screen_intent = Intent(context, PythonActivity)
+    full_screen_intent.setFlags(
+        Intent.FLAG_ACTIVITY_NEW_TASK | 
+        Intent.FLAG_ACTIVITY_CLEAR_TASK |
+        Intent.FLAG_ACTIVITY_EXCLUDE_FROM_RECENTS
+    )
+    return PendingIntent.getActivity(
+        context,
+        request_code,
+        full_screen_intent,
+        PendingIntent.FLAG_UPDATE_CURRENT | PendingIntent.FLAG_IMMUTABLE
+    )
+
+
+def notify_group_summary(lines: Sequence[str], count: int, full_screen: bool,
+                         group: str = GROUP_KEY):
+    """Post the summary of reminders that fired together
+    
+    Args:
+        lines: Inbox lines, one per listed reminder
+        count: Number of reminders in the group (may exceed len(lines))
+        full_screen: Attach a full-screen intent
+        group: Notification group the children were posted to
+    """
+    title = f"{count} train ticket booking alarms"
+    if count > len(lines):
+        lines = list(lines) + [f"+{count - len(lines)} more"]
+    
+    if not jni_registry.is_android():
+        print(f"\n{'='*50}")
+        print(f"[ALARM GROUP {count}]")
+        print(f"Title: {title}")
+        for line in lines:
+            print(f"  {line}")
+        print(f"{'='*50}\n")
+        return
+    
+    try:
+        autoclass = jni_registry.autoclass
+        PythonActivity = autoclass('org.kivy.android.PythonActivity')
+        NotificationBuilder = autoclass('android.app.Notification$Builder')
+        PendingIntent = autoclass('android.app.PendingIntent')
+        Intent = autoclass('android.content.Intent')
+        
+        context = jni_registry.context()
+        notification_manager = jni_registry.system_service(_NOTIFICATION_SERVICE)
+        notification_channels.ensure_channels([CHANNEL_ID])
+        
+        tap_intent = Intent(context, PythonActivity)
+        tap_intent.setFlags(Intent.FLAG_ACTIVITY_NEW_TASK | Intent.FLAG_ACTIVITY_CLEAR_TASK)
+        tap_pending_intent = PendingIntent.getActivity(
+            context,
+            GROUP_SUMMARY_ID + 1,
+            tap_intent,
+            PendingIntent.FLAG_UPDATE_CURRENT | PendingIntent.FLAG_IMMUTABLE
+        )
+        
+        InboxStyle = autoclass('android.app.Notification$InboxStyle')
+        inbox_style = InboxStyle()
+        inbox_style.setBigContentTitle(title)
+        for line in lines:
+            inbox_style.addLine(line)
+        
+        builder = NotificationBuilder(context, CHANNEL_ID)
+        builder.setContentTitle(title)
+        builder.setContentText(lines[0])
+        builder.setSmallIcon(context.getApplicationInfo().icon)
+        builder.setContentIntent(tap_pending_intent)
+        if full_screen:
+            builder.setFullScreenIntent(
+                _full_screen_pending_intent(context, GROUP_SUMMARY_ID), True)
+        builder.setAutoCancel(True)
+        builder.setNumber(count)
+        # Kept up to date as alarms join; only the first post alerts
+        builder.setOnlyAlertOnce(True)
+        builder.setPriority(NotificationBuilder.PRIORITY_MAX)
+        builder.setCategory(NotificationBuilder.CATEGORY_ALARM)
+        builder.setGroup(group)
+        builder.setGroupSummary(True)
+        builder.setStyle(inbox_style)
+        
+        notification_manager.notify(GROUP_SUMMARY_ID, builder.build())
+        
+        print(f"Alarm group summary displayed ({count} reminders)")
+        
+    except Exception as e:
+        print(f"Error showing alarm group summary: {e}")
+
+
+class _RateLimiter:
+    """Allows at most `limit` events in any `period` seconds"""
+    
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self._times: Deque[float] = deque()
+    
+    def _expire(self, now: float):
+        times = self._times
+        while times and times[0] <= now - self.period:
+            times.popleft()
+    
+    def take(self, now: float) -> bool:
+        self._expire(now)
+        if len(self._times) < self.limit:
+            self._times.append(now)
+            return True
+        return False
+    
+    def record(self, now: float):
+        """Count an event that happens whatever the limit"""
+        self._expire(now)
+        self._times.append(now)
+    
+    def wait(self, now: float) -> float:
+        """Seconds until take() can succeed"""
+        self._expire(now)
+        if len(self._times) < self.limit:
+            return 0.0
+        return self._times[-self.limit] + self.period - now
+
+
+# (alarm_id, event_date, note, payload)
+_Trigger = Tuple[int, str, str, str]
+
+
+class NotificationDispatcher:
+    """Groups and rate-limits alarm notifications
+    
+    The first trigger alerts in full. Triggers arriving within `window`
+    seconds of it join a notification group: they are posted as quiet
+    children, the first alarm is re-posted quietly into the group and an
+    InboxStyle summary lists them all.
+    
+    Every notify() call, new post or update, goes through one rate limiter
+    allowing `post_rate` per second. A child over budget is not posted on
+    its own but merged into the summary, whose pending update is replaced
+    rather than queued again. A lone alarm over budget waits in the queue;
+    if `max_queue` posts are already waiting it is dropped. Held-back
+    posts go out from a timer thread, and the alarm receiver calls drain()
+    before returning so they are shown before the process can be frozen.
+    
+    Full-screen intents are limited to one per `full_screen_interval`
+    seconds; later alarms still alert as heads-up notifications.
+    """
+    
+    def __init__(self, window: float = COALESCE_WINDOW_S,
+                 full_screen_interval: float = FULL_SCREEN_INTERVAL_S,
+                 post_rate: int = POST_RATE_PER_S,
+                 max_queue: int = MAX_QUEUE_DEPTH,
+                 clock: Callable[[], float] = clock.time, threaded: bool = True):
+        """Initialize dispatcher
+        
+        Args:
+            window: Seconds after the first trigger during which others are grouped
+            full_screen_interval: Minimum seconds between full-screen intents
+            post_rate: notify() calls allowed in any one second
+            max_queue: Posts allowed to wait for the rate limiter
+            clock: Returns the current time in seconds since the epoch;
+                defaults to the active utils.clock clock
+            threaded: Post held-back notifications from a timer thread.
+                Pass False when a virtual clock drives run_due()
+        """
+        self.window = window
+        self.max_queue = max_queue
+        self.clock = clock
+        self.threaded = threaded
+        
+        self._full_screen = _RateLimiter(1, full_screen_interval)
+        self._posts = _RateLimiter(post_rate, 1.0)
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        
+        # Triggers of the open window, first one first
+        self._group: List[_Trigger] = []
+        self._window_end = 0.0
+        # Posts waiting for the rate limiter, by notification ID
+        self._queue: 'OrderedDict[int, Callable[[], None]]' = OrderedDict()
+        
+        self.submitted = 0
+        self.posted = 0
+        self.coalesced = 0
+        self.groups = 0
+        self.deferred = 0
+        self.dropped = 0
+        self.full_screen_shown = 0
+        self.full_screen_suppressed = 0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Posts waiting for the rate limiter"""
+        return len(self._queue)
+    
+    def stats(self) -> dict:
+        """Counters for logging and benchmarks"""
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'posted': self.posted,
+                'coalesced': self.coalesced,
+                'groups': self.groups,
+                'deferred': self.deferred,
+                'dropped': self.dropped,
+                'full_screen_shown': self.full_screen_shown,
+                'full_screen_suppressed': self.full_screen_suppressed,
+                'queue_depth': len(self._queue),
+            }
+    
+    def submit(self, alarm_id: int, event_date: str, note: str,
+               payload: Optional[str] = None):
+        """Show an alarm, grouping it with others firing at the same time
+        
+        Args:
+            alarm_id: Unique ID for this notification
+            event_date: Date of train journey
+            note: User's reminder note
+            payload: Pre-built notification payload, if the caller has one
+        """
+        trigger = (alarm_id, event_date, note, payload or build_alarm_payload(event_date, note))
+        post = None
+        with self._lock:
+            self.submitted += 1
+            now = self.clock()
+            if self._group and now < self._window_end:
+                self._join_group(trigger)
+                self.full_screen_suppressed += 1
+                if self._posts.take(now):
+                    post = lambda: notify_alarm(alarm_id, trigger[3], SILENT_CHANNEL_ID,
+                                                full_screen=False, group=GROUP_KEY)
+                elif GROUP_SUMMARY_ID in self._queue:
+                    # Shown through the summary update waiting in the queue
+                    self.deferred += 1
+                else:
+                    self.dropped += 1
+            else:
+                self._group = [trigger]
+                self._window_end = now + self.window
+                full_screen = self._take_full_screen(now)
+                post = lambda: notify_alarm(alarm_id, trigger[3], full_screen=full_screen)
+                if not self._posts.take(now):
+                    if self._enqueue(alarm_id, post):
+                        self.deferred += 1
+                    else:
+                        self.dropped += 1
+                    post = None
+        
+        # Post outside the lock
+        if post is not None:
+            post()
+            with self._lock:
+                self.posted += 1
+        self.run_due()
+    
+    def run_due(self) -> int:
+        """Post what the rate limit allows from the queue
+        
+        Called from the timer thread, or by the owner of a virtual clock.
+        
+        Returns:
+            Number of notifications posted
+        """
+        posted = 0
+        while True:
+            with self._lock:
+                now = self.clock()
+                if not self._queue or not self._posts.take(now):
+                    self._arm(now)
+                    break
+                _, post = self._queue.popitem(last=False)
+            post()
+            posted += 1
+        with self._lock:
+            self.posted += posted
+        return posted
+    
+    def drain(self, timeout: float = DRAIN_TIMEOUT_S,
+              sleep: Callable[[float], None] = time.sleep) -> int:
+        """Post the queue at the rate limit, then flush whatever is left
+        
+        Blocks for at most `timeout` seconds. Used by the alarm receiver,
+        whose process may be frozen once it returns.
+        
+        Args:
+            timeout: Seconds to wait for the rate limiter
+            sleep: Waits the given number of seconds; injectable for tests
+        
+        Returns:
+            Number of notifications posted
+        """
+        posted = 0
+        deadline = self.clock() + timeout
+        while True:
+            posted += self.run_due()
+            with self._lock:
+                now = self.clock()
+                if not self._queue:
+                    return posted
+                delay = self._posts.wait(now)
+            if now + delay > deadline:
+                return posted + self.flush()
+            sleep(delay)
+    
+    def flush(self) -> int:
+        """Post every waiting notification now, ignoring the rate limit
+        
+        Returns:
+            Number of notifications posted
+        """
+        with self._lock:
+            posts = list(self._queue.values())
+            self._queue.clear()
+            now = self.clock()
+            for _ in posts:
+                self._posts.record(now)
+        for post in posts:
+            post()
+        with self._lock:
+            self.posted += len(posts)
+        return len(posts)
+    
+    def _take_full_screen(self, now: float) -> bool:
+        if self._full_screen.take(now):
+            self.full_screen_shown += 1
+            return True
+        self.full_screen_suppressed += 1
+        return False
+    
+    def _enqueue(self, notification_id: int, post: Callable[[], None]) -> bool:
+        """Hold a post for the rate limiter (caller holds the lock)
+        
+        Returns:
+            False if the queue is full and the post was dropped
+        """
+        if notification_id not in self._queue and len(self._queue) >= self.max_queue:
+            return False
+        # An update replaces the waiting one and keeps its place
+        self._queue[notification_id] = post
+        return True
+    
+    def _join_group(self, trigger: _Trigger):
+        """Add a trigger to the open window (caller holds the lock)"""
+        group = self._group
+        group.append(trigger)
+        self.coalesced += 1
+        if len(group) == 2:
+            self.groups += 1
+            # The first alarm was posted on its own; move it into the group
+            first_id, _, _, first_payload = group[0]
+            self._enqueue(first_id, lambda: notify_alarm(
+                first_id, first_payload, SILENT_CHANNEL_ID,
+                full_screen=False, group=GROUP_KEY))
+        
+        count = len(group)
+        lines = [f"{event_date}: {note}"
+                 for _, event_date, note, _ in group[:GROUP_SUMMARY_MAX_LINES]]
+        self._enqueue(GROUP_SUMMARY_ID, lambda: notify_group_summary(lines, count, False))
+    
+    def _arm(self, now: float):
+        """Schedule the next run_due() (caller holds the lock)"""
+        if not self.threaded or not self._queue:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self._posts.wait(now), self.run_due)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def stop(self):
+        """Cancel the timer; waiting posts stay queued until flush()"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """Get the process-wide notification dispatcher"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = NotificationDispatcher()
+    return _dispatcher
@@ -0,0 +1,151 @@
+"""Bring AlarmManager in line with the database using the fewest operations
+
+The scheduled_state table records every alarm the app registered and the
+fire time it was registered for. Reconciling compares that record with the
+alarms the database says should be registered right now and only schedules
+the ones that are missing or have the wrong fire time, and cancels the ones
+that should no longer exist. A reboot wipes AlarmManager, so after one the
+record is dropped first and everything due is registered again.
+
+An alarm whose fire time has just passed is left registered while its
+reminder is still pending: AlarmManager has yet to deliver it, and
+cancelling it would lose the reminder.
+"""
+import contextlib
+from typing import Dict, List, Optional, Tuple
+
+from database.db_manager import ReminderDB
+from database.models import Reminder
+from services.alarm_scheduler import AlarmScheduler
+from services.rolling_window import (REFILL_ALARM_ID, REFILL_DELAY_MS,
+                                     ROLLING_WINDOW_SIZE, RollingWindowScheduler)
+from utils import clock
+
+
+class ReconcilePlan:
+    """Operations needed to make AlarmManager match the database"""
+
+    def __init__(self, schedule: List[Tuple[int, int, str, str]], cancel: List[int],
+                 unchanged: int, boundary: Optional[Reminder] = None):
+        # (alarm_id, fire_at_ms, event_date, note) tuples
+        self.schedule = schedule
+        self.cancel = cancel
+        self.unchanged = unchanged
+        # Rolling window boundary reminder to persist, if any
+        self.boundary = boundary
+
+    def __repr__(self):
+        return (f"ReconcilePlan(schedule={len(self.schedule)}, cancel={len(self.cancel)}, "
+                f"unchanged={self.unchanged})")
+
+
+class AlarmReconciler:
+    """Diffs desired alarms against scheduled_state and applies the difference"""
+
+    def __init__(self, db: ReminderDB, scheduler: Optional[AlarmScheduler] = None,
+                 window_size: Optional[int] = ROLLING_WINDOW_SIZE):
+        """Initialize reconciler
+
+        Args:
+            db: Reminder database
+            scheduler: Scheduler to apply operations with. If None, a default
+                AlarmScheduler is created
+            window_size: Rolling window size, or None to register every
+                upcoming reminder
+        """
+        self.db = db
+        self.scheduler = scheduler if scheduler is not None else AlarmScheduler()
+        self.rolling = (RollingWindowScheduler(db, self.scheduler, window_size)
+                        if window_size else None)
+
+    def desired(self, now_ms: int) -> Tuple[Dict[int, Tuple[int, str, str]],
+                                            Optional[Reminder]]:
+        """Get the alarms that should be registered at a point in time
+
+        Reminders whose fire time has already passed are not included.
+
+        Args:
+            now_ms: Current time in epoch milliseconds
+
+        Returns:
+            (alarms, boundary): alarms maps alarm_id to
+            (fire_at_ms, event_date, note); boundary is the rolling
+            window's last reminder, or None
+        """
+        if self.rolling is not None:
+            reminders, boundary = self.rolling.window(now_ms)
+        else:
+            reminders, boundary = self.db.due_between(now_ms, 2 ** 63 - 1), None
+
+        alarms = {r.alarm_id: (r.fire_at_ms, r.event_date, r.note) for r in reminders}
+        if boundary is not None:
+            alarms[REFILL_ALARM_ID] = (boundary.fire_at_ms + REFILL_DELAY_MS, '', '')
+        return alarms, boundary
+
+    def plan(self, now_ms: Optional[int] = None, rebooted: bool = False) -> ReconcilePlan:
+        """Compute the minimal set of operations without applying them
+
+        Args:
+            now_ms: Current time in epoch milliseconds. Defaults to now
+            rebooted: Treat AlarmManager as empty, ignoring the record
+
+        Returns:
+            ReconcilePlan
+        """
+        if now_ms is None:
+            now_ms = clock.time_ms()
+        alarms, boundary = self.desired(now_ms)
+        registered = {} if rebooted else self.db.get_scheduled_state()
+
+        schedule = []
+        unchanged = 0
+        for alarm_id, (fire_at_ms, event_date, note) in alarms.items():
+            current = registered.get(alarm_id)
+            if current is not None and current[0] == fire_at_ms:
+                unchanged += 1
+            else:
+                schedule.append((alarm_id, fire_at_ms, event_date, note))
+        cancel = [alarm_id for alarm_id in registered if alarm_id not in alarms]
+        if cancel:
+            # Due but not yet delivered; the alarm receiver claims these
+            undelivered = {r.alarm_id for r in self.db.due_between(0, now_ms)}
+            unchanged += sum(1 for alarm_id in cancel if alarm_id in undelivered)
+            cancel = [alarm_id for alarm_id in cancel if alarm_id not in undelivered]
+        return ReconcilePlan(schedule, cancel, unchanged, boundary)
+
+    def reconcile(self, now_ms: Optional[int] = None, rebooted: bool = False,
+                  refresh_fire_times: bool = False) -> Dict[str, int]:
+        """Apply the minimal set of schedule and cancel operations
+
+        Args:
+            now_ms: Current time in epoch milliseconds. Defaults to now
+            rebooted: AlarmManager was wiped (device boot)
+            refresh_fire_times: Recompute stored fire times first, e.g.
+                after a time zone change
+
+        Returns:
+            Dict with the number of alarms scheduled, cancelled, left
+            unchanged and failed, and fire times refreshed
+        """
+        refreshed = self.db.refresh_fire_times() if refresh_fire_times else 0
+        # The plan moves the rolling window boundary
+        lock = self.rolling.lock if self.rolling is not None else contextlib.nullcontext()
+        with lock:
+            plan = self.plan(now_ms, rebooted)
+
+            self.scheduler.cancel_many(plan.cancel)
+            results = self.scheduler.schedule_many(plan.schedule)
+            scheduled = [(alarm_id, fire_at_ms)
+                         for alarm_id, fire_at_ms, _, _ in plan.schedule if results[alarm_id]]
+
+            self.db.update_scheduled_state(scheduled, plan.cancel, clear=rebooted)
+            if self.rolling is not None:
+                self.rolling.store_boundary(plan.boundary)
+
+        return {
+            'scheduled': len(scheduled),
+            'cancelled': len(plan.cancel),
+            'unchanged': plan.unchanged,
+            'failed': len(plan.schedule) - len(scheduled),
+            'refreshed': refreshed,
+        }
@@ -0,0 +1,201 @@
+"""Rolling-window alarm scheduling
+
+Instead of registering one AlarmManager alarm per pending reminder, only the
+N earliest upcoming reminders are registered, plus one "refill" alarm set
+just after the fire time of the last of them. When the refill alarm fires,
+the next N reminders are registered. The number of system alarms and
+PendingIntents stays at N + 1 however many reminders are stored.
+
+The window position is kept in the meta table as the (fire_at_ms, id) key
+of the last registered reminder, so a fresh receiver process can continue
+where the previous one stopped. Every read-modify-write of the window
+(refill, reset, adding a reminder) holds one process-wide lock, so a
+reminder saved while the refill alarm is being handled can't be judged
+against a boundary that is about to move.
+"""
+import threading
+from typing import List, Optional, Tuple
+
+from database.db_manager import ReminderDB
+from database.models import Reminder
+from services.alarm_scheduler import REFILL_ALARM_ID, AlarmScheduler
+from utils import clock
+
+DEFAULT_WINDOW_SIZE = 64
+
+# Reminders registered with AlarmManager at any one time. None disables
+# rolling mode and registers every pending reminder.
+ROLLING_WINDOW_SIZE: Optional[int] = DEFAULT_WINDOW_SIZE
+
+# The refill alarm fires this long after the window's last reminder, so
+# every registered reminder sharing that fire time has gone off before the
+# next window is registered. Reminders tied with the boundary that did not
+# fit fire this much late.
+REFILL_DELAY_MS = 1000
+
+_META_KEY = 'rolling_window_last'
+
+# Sorts after every real row id for a given fire time
+_MAX_ID = 2 ** 63 - 1
+
+
+class RollingWindowScheduler:
+    """Keeps the N earliest upcoming reminders registered with AlarmManager"""
+
+    # Shared by every instance: the UI and the alarm receiver each create
+    # their own scheduler for the same window
+    lock = threading.RLock()
+
+    def __init__(self, db: ReminderDB, scheduler: Optional[AlarmScheduler] = None,
+                 window_size: int = DEFAULT_WINDOW_SIZE):
+        """Initialize rolling window scheduler
+
+        Args:
+            db: Reminder database
+            scheduler: Scheduler that talks to AlarmManager (or a desktop
+                backend). If None, a default AlarmScheduler is created
+            window_size: Number of reminders registered at a time
+        """
+        self.db = db
+        self.scheduler = scheduler if scheduler is not None else AlarmScheduler()
+        self.window_size = window_size
+
+    # ── Window state ────────────────────────────────────────────
+    def last_key(self) -> Optional[Tuple[int, int]]:
+        """Get the (fire_at_ms, id) of the last registered reminder
+
+        Returns:
+            Key of the window boundary, or None when every upcoming reminder
+            is registered and no refill alarm is pending
+        """
+        value = self.db.get_meta(_META_KEY)
+        if not value:
+            return None
+        fire_at_ms, reminder_id = value.split(':')
+        return int(fire_at_ms), int(reminder_id)
+
+    def store_boundary(self, last: Optional[Reminder]):
+        """Persist the window boundary without touching AlarmManager
+
+        Args:
+            last: Last reminder of a full window, or None
+        """
+        self.db.set_meta(_META_KEY, None if last is None
+                         else f'{last.fire_at_ms}:{last.id}')
+
+    def window(self, now_ms: int) -> Tuple[List[Reminder], Optional[Reminder]]:
+        """Get the window that should be registered at a point in time
+
+        Args:
+            now_ms: Current time in epoch milliseconds
+
+        Returns:
+            (reminders, last) where last is the boundary reminder when the
+            window is full, or None when every upcoming reminder fits
+        """
+        reminders = self.db.due_after((now_ms - 1, _MAX_ID), self.window_size)
+        full = len(reminders) == self.window_size
+        return reminders, reminders[-1] if full else None
+
+    def _set_boundary(self, last: Optional[Reminder],
+                      registered: Optional[List[Tuple[int, int]]] = None,
+                      cancelled: Optional[List[int]] = None):
+        registered = registered if registered is not None else []
+        cancelled = cancelled if cancelled is not None else []
+        self.store_boundary(last)
+        if last is None:
+            self.scheduler.cancel_alarm(REFILL_ALARM_ID)
+            cancelled.append(REFILL_ALARM_ID)
+        else:
+            fire_at_ms = last.fire_at_ms + REFILL_DELAY_MS
+            if self.scheduler.schedule_alarm(REFILL_ALARM_ID, fire_at_ms, '', ''):
+                registered.append((REFILL_ALARM_ID, fire_at_ms))
+        self.db.update_scheduled_state(registered, cancelled)
+
+    def _register(self, reminders: List[Reminder]) -> List[Tuple[int, int]]:
+        results = self.scheduler.schedule_many(reminders)
+        return [(r.alarm_id, r.fire_at_ms) for r in reminders if results[r.alarm_id]]
+
+    # ── Entry points ────────────────────────────────────────────
+    def reset(self, now_ms: Optional[int] = None) -> int:
+        """Register the first window from scratch (after boot or on first use)
+
+        Args:
+            now_ms: Current time in epoch milliseconds. Defaults to now
+
+        Returns:
+            Number of reminders registered
+        """
+        if now_ms is None:
+            now_ms = clock.time_ms()
+        with self.lock:
+            return self._fill((now_ms - 1, _MAX_ID))
+
+    def refill(self) -> int:
+        """Register the next window; called when the refill alarm fires
+
+        Continues strictly after the stored boundary, so reminders that
+        share the boundary's fire time but did not fit in the previous
+        window are picked up, and none is registered twice.
+
+        Returns:
+            Number of reminders registered
+        """
+        with self.lock:
+            last = self.last_key()
+            if last is None:
+                return self.reset()
+            return self._fill(last)
+
+    def _fill(self, after: Tuple[int, int]) -> int:
+        reminders = self.db.due_after(after, self.window_size)
+        registered = self._register(reminders)
+        full = len(reminders) == self.window_size
+        self._set_boundary(reminders[-1] if full else None, list(registered))
+        return len(registered)
+
+    def on_reminder_added(self, reminder: Reminder, now_ms: Optional[int] = None) -> bool:
+        """Register a newly saved reminder if it falls inside the window
+
+        Args:
+            reminder: The stored reminder
+            now_ms: Current time in epoch milliseconds. Defaults to now
+
+        Returns:
+            True if the reminder was registered now, False if the refill
+            alarm will register it later
+        """
+        if now_ms is None:
+            now_ms = clock.time_ms()
+        with self.lock:
+            return self._add(reminder, now_ms)
+
+    def _add(self, reminder: Reminder, now_ms: int) -> bool:
+        last = self.last_key()
+        if last is not None and (reminder.fire_at_ms, reminder.id) > last:
+            return False
+
+        window = self.db.due_after((now_ms - 1, _MAX_ID), self.window_size + 1)
+        inside = window[:self.window_size]
+
+        # Besides the new reminder, register anything past the old boundary
+        # that now fits because reminders were deleted since the last fill
+        to_register = [r for r in inside if r.id == reminder.id or
+                       (last is not None and (r.fire_at_ms, r.id) > last)]
+        registered = self._register(to_register)
+        cancelled = []
+
+        if len(window) > self.window_size:
+            pushed_out = window[self.window_size]
+            was_registered = last is None or (pushed_out.fire_at_ms, pushed_out.id) <= last
+            if was_registered and pushed_out.id != reminder.id:
+                self.scheduler.cancel_alarm(pushed_out.alarm_id)
+                cancelled.append(pushed_out.alarm_id)
+            self._set_boundary(inside[-1], list(registered), cancelled)
+        elif last is not None:
+            # Everything upcoming fits: no boundary needed
+            self._set_boundary(None, list(registered), cancelled)
+        else:
+            self.db.update_scheduled_state(registered)
+
+        return any(alarm_id == reminder.alarm_id for alarm_id, _ in registered)
@@ -0,0 +1 @@
+"""Time-warp simulation of the reminder pipeline on a virtual clock"""
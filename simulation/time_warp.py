@@ -0,0 +1,300 @@
+"""Replay a year of reminders against the real pipeline in seconds
+
+The whole stack - ReminderDB, the rolling window, AlarmScheduler, the alarm
+and boot receivers and the retention engine - runs unchanged against a
+temporary database. Only two things are swapped:
+
+* the active clock (utils.clock) is a VirtualClock, so date validation,
+  window refills and retention see simulated time;
+* AlarmScheduler's backend is a HeapTimerBackend without its timer thread.
+  The harness jumps the clock straight to the next pending alarm and fires
+  it with run_due(), so idle time costs nothing.
+
+A device shutdown clears every registered alarm, like a reboot does to
+AlarmManager, and alarms due while the device is off do not fire. Boot runs
+restore_alarms_on_boot().
+
+Run from the project root:
+    python -m simulation.time_warp [days] [saves_per_day] [seed]
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from database.db_manager import ReminderDB
+from database.retention import RetentionEngine
+from services import rolling_window
+from services.alarm_backends import HeapTimerBackend
+from services.alarm_receiver import on_alarm_triggered
+from services.alarm_scheduler import AlarmScheduler
+from services.boot_receiver import restore_alarms_on_boot
+from services.rolling_window import RollingWindowScheduler
+from simulation.workload import Event, generate_workload
+from utils import clock
+from utils.date_utils import validate_future_date
+
+# Firing later than this after the reminder's fire time counts as late
+LATE_TOLERANCE_MS = 60 * 1000
+
+
+class CountingNotifier:
+    """NotificationService stand-in recording when each alarm was shown"""
+
+    def __init__(self):
+        self.shown: Dict[int, List[int]] = {}
+        self.summaries = 0
+
+    def show_notification(self, alarm_id: int, event_date: str, note: str):
+        self.shown.setdefault(alarm_id, []).append(clock.time_ms())
+
+    def show_missed_summary(self, reminders):
+        self.summaries += 1
+        for reminder in reminders:
+            self.show_notification(reminder.alarm_id, reminder.event_date, reminder.note)
+
+
+class TimeWarpSimulation:
+    """Drives the reminder pipeline through a workload on a virtual clock"""
+
+    def __init__(self, events: List[Event], start: datetime,
+                 db_path: Optional[str] = None):
+        """Initialize simulation
+
+        Args:
+            events: Workload from simulation.workload.generate_workload
+            start: Simulated start time; no event may be earlier
+            db_path: Database file. If None, a temporary file is used
+        """
+        self.events = events
+        self.clock = clock.VirtualClock(start)
+        self._tmpdir = None
+        if db_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix='timewarp-')
+            db_path = os.path.join(self._tmpdir.name, 'reminders.db')
+        self.db_path = db_path
+
+        self.notifier = CountingNotifier()
+        self.backend = HeapTimerBackend(callback=self._on_fire, threaded=False)
+        self.device_on = True
+
+        # alarm_id -> fire_at_ms for every reminder saved, and the time
+        # each deleted one was deleted
+        self.expected: Dict[int, int] = {}
+        self.deleted_at: Dict[int, int] = {}
+        self.rejected_saves = 0
+        self.skipped_actions = 0
+        self.boots = 0
+        self.archived = 0
+        # (day index, reminders rows, archive rows, main file bytes, WAL bytes)
+        self.growth: List[tuple] = []
+
+    # ── Device and user actions ─────────────────────────────────
+    def _on_fire(self, alarm_id: int, event_date: str, note: str):
+        on_alarm_triggered(alarm_id, event_date, note, db=self.db,
+                           scheduler=self.scheduler, notifier=self.notifier)
+
+    def _save(self, event_date: str):
+        # Same steps as AddReminderScreen.save_reminder
+        valid, _ = validate_future_date(event_date)
+        if not valid:
+            self.rejected_saves += 1
+            return
+        alarm_id = self.db.allocate_alarm_id()
+        reminder_id = self.db.add_reminder(event_date, 'Book tickets', alarm_id)
+        reminder = self.db.get_reminder_by_id(reminder_id)
+        self.expected[alarm_id] = reminder.fire_at_ms
+        if self.rolling is not None:
+            self.rolling.on_reminder_added(reminder)
+        else:
+            self.scheduler.schedule_alarm(alarm_id, reminder.fire_at_ms,
+                                          event_date, reminder.note)
+
+    def _delete(self, pick: float):
+        # Same steps as HomeScreen._do_delete, on a pending reminder
+        pending = self.db.get_pending_reminders()
+        if not pending:
+            return
+        reminder = pending[int(pick * len(pending))]
+        self.scheduler.cancel_alarm(reminder.alarm_id)
+        self.db.delete_reminder(reminder.id)
+        self.deleted_at[reminder.alarm_id] = clock.time_ms()
+
+    def _shutdown(self):
+        self.device_on = False
+        self.backend.clear()
+
+    def _boot(self):
+        self.device_on = True
+        self.boots += 1
+        restore_alarms_on_boot(self.db, self.scheduler, self.notifier)
+
+    def _retention(self):
+        self.archived += RetentionEngine(self.db).run()['archived']
+
+    # ── Clock driving ───────────────────────────────────────────
+    def _advance_to(self, target: datetime):
+        target_ms = int(target.timestamp() * 1000)
+        while self.device_on:
+            upcoming = self.backend.next_alarm()
+            if upcoming is None or upcoming[0] > target_ms:
+                break
+            # Alarms set in the past fire immediately, as on Android
+            fire_ms = max(upcoming[0], clock.time_ms())
+            self.clock.set_ms(fire_ms)
+            self.backend.run_due(fire_ms)
+        self.clock.set(max(target, self.clock.now()))
+
+    def _sample_growth(self, day: int):
+        reader = self.db._manager.reader()
+        rows = reader.execute('SELECT COUNT(*) FROM reminders').fetchone()[0]
+        archived = reader.execute('SELECT COUNT(*) FROM reminders_archive').fetchone()[0]
+        # Reported apart: the WAL is reused at its high-water size after a
+        # checkpoint, so summing it in would hide what the tables take
+        main_size, wal_size = (os.path.getsize(p) if os.path.exists(p) else 0
+                               for p in (self.db_path, self.db_path + '-wal'))
+        self.growth.append((day, rows, archived, main_size, wal_size))
+
+    def run(self, end: Optional[datetime] = None) -> Dict[str, object]:
+        """Replay the workload
+
+        Args:
+            end: Keep firing alarms until this time. Defaults to the last event
+
+        Returns:
+            Report dictionary (see report())
+        """
+        start = self.clock.now()
+        if end is None:
+            end = self.events[-1][0] if self.events else start
+        handlers = {
+            'save': self._save,
+            'delete': self._delete,
+            'shutdown': lambda _: self._shutdown(),
+            'boot': lambda _: self._boot(),
+            'retention': lambda _: self._retention(),
+        }
+
+        wall_start = time.perf_counter()
+        with clock.use_clock(self.clock), \
+                contextlib.redirect_stdout(open(os.devnull, 'w')) as devnull:
+            self.db = ReminderDB(self.db_path)
+            self.scheduler = AlarmScheduler(backend=self.backend)
+            self.rolling = (RollingWindowScheduler(self.db, self.scheduler,
+                                                   rolling_window.ROLLING_WINDOW_SIZE)
+                            if rolling_window.ROLLING_WINDOW_SIZE else None)
+            next_sample = 0
+            try:
+                for when, kind, data in self.events:
+                    self._advance_to(when)
+                    day = (when - start).days
+                    if day >= next_sample:
+                        self._sample_growth(day)
+                        next_sample = day + 30
+                    if kind in ('save', 'delete') and not self.device_on:
+                        self.skipped_actions += 1
+                        continue
+                    handlers[kind](data)
+                self._advance_to(end)
+                self._sample_growth((end - start).days)
+            finally:
+                self.db.close()
+                devnull.close()
+        wall_s = time.perf_counter() - wall_start
+
+        return self.report(int(end.timestamp() * 1000), wall_s, (end - start).days)
+
+    def report(self, end_ms: int, wall_s: float, days: int) -> Dict[str, object]:
+        """Classify every alarm that should have fired by end_ms
+
+        Returns:
+            Dictionary with throughput, alarm outcome counts and DB growth
+        """
+        on_time = late = missed = duplicate = 0
+        lateness = []
+        for alarm_id, fire_at_ms in self.expected.items():
+            deleted = self.deleted_at.get(alarm_id)
+            if fire_at_ms > end_ms or (deleted is not None and deleted < fire_at_ms):
+                continue
+            shown = self.notifier.shown.get(alarm_id)
+            if not shown:
+                missed += 1
+                continue
+            if len(shown) > 1:
+                duplicate += 1
+            delay = shown[0] - fire_at_ms
+            lateness.append(delay)
+            if delay > LATE_TOLERANCE_MS:
+                late += 1
+            else:
+                on_time += 1
+
+        spurious = sum(
+            1 for alarm_id, shown in self.notifier.shown.items()
+            if alarm_id not in self.expected
+            or (alarm_id in self.deleted_at and self.deleted_at[alarm_id] < shown[0]))
+
+        lateness.sort()
+        return {
+            'days': days,
+            'events': len(self.events),
+            'wall_seconds': wall_s,
+            'events_per_second': len(self.events) / wall_s if wall_s else 0.0,
+            'saved': len(self.expected),
+            'rejected_saves': self.rejected_saves,
+            'skipped_actions': self.skipped_actions,
+            'deleted': len(self.deleted_at),
+            'boots': self.boots,
+            'fired': self.backend.fired,
+            'on_time': on_time,
+            'late': late,
+            'missed': missed,
+            'duplicate': duplicate,
+            'spurious': spurious,
+            'missed_summaries': self.notifier.summaries,
+            'max_lateness_ms': lateness[-1] if lateness else 0,
+            'archived': self.archived,
+            'growth': self.growth,
+        }
+
+    def close(self):
+        """Remove the temporary database, if one was created"""
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+
+def print_report(report: Dict[str, object]):
+    print(f"{report['days']} simulated days, {report['events']} events in "
+          f"{report['wall_seconds']:.2f} s ({report['events_per_second']:.0f} events/s)")
+    print(f"  saved: {report['saved']} (rejected {report['rejected_saves']}), "
+          f"deleted: {report['deleted']}, boots: {report['boots']}, "
+          f"actions while off: {report['skipped_actions']}")
+    print(f"  alarms fired: {report['fired']}  on time: {report['on_time']}  "
+          f"late: {report['late']}  missed: {report['missed']}  "
+          f"duplicate: {report['duplicate']}  spurious: {report['spurious']}")
+    print(f"  missed-reminder summaries: {report['missed_summaries']}")
+    print(f"  max lateness: {report['max_lateness_ms'] / 1000:.1f} s, "
+          f"archived: {report['archived']}")
+    print("  day   reminders   archive   db bytes   wal bytes")
+    for day, rows, archived, main_size, wal_size in report['growth']:
+        print(f"  {day:>3}   {rows:>9}   {archived:>7}   {main_size:>8}   {wal_size:>9}")
+
+
+def main(days: int = 365, saves_per_day: float = 5.0, seed: int = 1):
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    events = generate_workload(start, days, saves_per_day, seed=seed)
+    simulation = TimeWarpSimulation(events, start)
+    try:
+        print_report(simulation.run(start + timedelta(days=days)))
+    finally:
+        simulation.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 365,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 5.0,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 1)
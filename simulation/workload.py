@@ -0,0 +1,101 @@
+"""Synthetic user workloads for the time-warp simulator
+
+A workload is a time-ordered list of events, each a (when, kind, data)
+tuple with a naive local datetime:
+
+* ``('save', event_date)`` - the user saves a reminder for a journey
+* ``('delete', pick)`` - the user deletes a pending reminder; ``pick`` is a
+  float in [0, 1) choosing which one, so the choice stays reproducible
+  without knowing the database contents in advance
+* ``('shutdown', None)`` / ``('boot', None)`` - the device is switched off
+  and back on
+* ``('retention', None)`` - the daily maintenance run
+"""
+import random
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+Event = Tuple[datetime, str, object]
+
+# Journeys are booked between these many days ahead; the reminder fires
+# 60 days before the journey, so the lower bound must stay above 60
+MIN_LEAD_DAYS = 61
+MAX_LEAD_DAYS = 120
+
+RETENTION_HOUR = 3
+
+
+def generate_workload(start: datetime, days: int = 365, saves_per_day: float = 5.0,
+                      delete_share: float = 0.1, reboots_per_month: float = 2.0,
+                      max_downtime_hours: float = 36.0, seed: int = 1) -> List[Event]:
+    """Generate a reproducible stream of user and device events
+
+    Args:
+        start: Simulation start (local time)
+        days: Length of the simulation in days
+        saves_per_day: Average number of reminders saved per day
+        delete_share: Chance that a save is followed by a deletion later on
+        reboots_per_month: Average number of shutdown/boot pairs per 30 days
+        max_downtime_hours: Longest time the device stays off
+        seed: Random seed
+
+    Returns:
+        Events sorted by time
+    """
+    rng = random.Random(seed)
+    events: List[Event] = []
+    end = start + timedelta(days=days)
+
+    for day in range(days):
+        midnight = (start + timedelta(days=day)).replace(hour=0, minute=0,
+                                                         second=0, microsecond=0)
+
+        for _ in range(_poisson(rng, saves_per_day)):
+            when = midnight + timedelta(seconds=rng.uniform(7 * 3600, 23 * 3600))
+            journey = when.date() + timedelta(days=rng.randint(MIN_LEAD_DAYS, MAX_LEAD_DAYS))
+            events.append((when, 'save', journey.isoformat()))
+
+            if rng.random() < delete_share:
+                later = when + timedelta(hours=rng.uniform(1, 24 * 30))
+                events.append((later, 'delete', rng.random()))
+
+        retention_at = midnight + timedelta(hours=RETENTION_HOUR)
+        events.append((retention_at, 'retention', None))
+
+        if rng.random() < reboots_per_month / 30:
+            off = midnight + timedelta(seconds=rng.uniform(0, 24 * 3600))
+            on = off + timedelta(hours=rng.uniform(0.05, max_downtime_hours))
+            events.append((off, 'shutdown', None))
+            events.append((on, 'boot', None))
+
+    events = [e for e in events if start <= e[0] < end]
+    events.sort(key=lambda e: e[0])
+    return _drop_overlapping_downtime(events)
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    # Knuth's method; means here are small
+    limit = pow(2.718281828459045, -mean)
+    k, p = 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _drop_overlapping_downtime(events: List[Event]) -> List[Event]:
+    # A shutdown while already off (or a boot while on) can't happen
+    kept = []
+    device_on = True
+    for event in events:
+        kind = event[1]
+        if kind == 'shutdown':
+            if not device_on:
+                continue
+            device_on = False
+        elif kind == 'boot':
+            if device_on:
+                continue
+            device_on = True
+        kept.append(event)
+    return kept
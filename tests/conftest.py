@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import ReminderDB  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    reminder_db = ReminderDB(str(tmp_path / 'reminders.db'))
+    yield reminder_db
+    reminder_db.close()
@@ -0,0 +1,155 @@
+import random
+import threading
+
+import pytest
+
+from services.alarm_backends import HeapTimerBackend
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    @property
+    def now_ms(self):
+        return int(self.now * 1000)
+
+
+@pytest.fixture
+def clock():
+    return ManualClock()
+
+
+@pytest.fixture
+def fired():
+    return []
+
+
+def _backend(clock, fired, **kwargs):
+    kwargs.setdefault('threaded', False)
+    return HeapTimerBackend(lambda alarm_id, event_date, note: fired.append(alarm_id),
+                            clock=clock, **kwargs)
+
+
+def _assert_heap(backend):
+    heap = backend._heap
+    for i, entry in enumerate(heap):
+        assert backend._index[entry[2]] == i
+        for child in (2 * i + 1, 2 * i + 2):
+            if child < len(heap):
+                assert not backend._less(heap[child], entry)
+    assert len(backend._index) == len(heap)
+
+
+def _schedule(backend, clock, offsets_ms):
+    for alarm_id, offset_ms in offsets_ms.items():
+        backend.schedule(alarm_id, clock.now_ms + offset_ms, '2030-03-02', str(alarm_id))
+
+
+def test_due_alarms_fire_in_order_exactly_once(clock, fired):
+    backend = _backend(clock, fired)
+    _schedule(backend, clock, {1003: 300, 1001: 100, 1004: 400, 1002: 200})
+
+    assert backend.run_due(clock.now_ms + 250) == 2
+    assert backend.run_due(clock.now_ms + 250) == 0
+    assert backend.run_due(clock.now_ms + 1000) == 2
+
+    assert fired == [1001, 1002, 1003, 1004]
+    assert backend.fired == 4
+    assert len(backend) == 0
+
+
+def test_equal_fire_times_fire_in_scheduling_order(clock, fired):
+    backend = _backend(clock, fired)
+    for alarm_id in (1005, 1001, 1003):
+        backend.schedule(alarm_id, clock.now_ms, '2030-03-02', '')
+
+    backend.run_due(clock.now_ms)
+
+    assert fired == [1005, 1001, 1003]
+
+
+def test_cancel_a_middle_element(clock, fired):
+    backend = _backend(clock, fired)
+    _schedule(backend, clock, {1000 + i: i * 10 for i in range(1, 16)})
+
+    backend.cancel(1008)
+    _assert_heap(backend)
+    backend.run_due(clock.now_ms + 1000)
+
+    assert fired == [1000 + i for i in range(1, 16) if i != 8]
+
+
+def test_cancel_the_last_element(clock, fired):
+    backend = _backend(clock, fired)
+    _schedule(backend, clock, {1001: 100, 1002: 200, 1003: 300})
+    last_id = backend._heap[-1][2]
+
+    backend.cancel(last_id)
+    _assert_heap(backend)
+    backend.run_due(clock.now_ms + 1000)
+
+    assert fired == [alarm_id for alarm_id in (1001, 1002, 1003) if alarm_id != last_id]
+
+
+def test_cancel_unknown_alarm_is_a_no_op(clock, fired):
+    backend = _backend(clock, fired)
+    _schedule(backend, clock, {1001: 100})
+
+    assert backend.cancel(9999)
+    assert backend.next_alarm() == (clock.now_ms + 100, 1001)
+
+
+def test_rescheduling_replaces_the_pending_alarm(clock, fired):
+    backend = _backend(clock, fired)
+    _schedule(backend, clock, {1001: 100, 1002: 200, 1003: 300})
+
+    backend.schedule(1001, clock.now_ms + 500, '2030-03-02', 'moved')
+    _assert_heap(backend)
+    assert len(backend) == 3
+    assert backend.next_alarm() == (clock.now_ms + 200, 1002)
+
+    backend.schedule(1003, clock.now_ms + 50, '2030-03-02', 'moved')
+    assert backend.next_alarm() == (clock.now_ms + 50, 1003)
+
+    backend.run_due(clock.now_ms + 1000)
+    assert fired == [1003, 1002, 1001]
+
+
+def test_random_operations_keep_the_heap_valid(clock, fired):
+    rng = random.Random(7)
+    backend = _backend(clock, fired)
+    pending = {}
+    for _ in range(2000):
+        alarm_id = rng.randrange(200)
+        if rng.random() < 0.3:
+            backend.cancel(alarm_id)
+            pending.pop(alarm_id, None)
+        else:
+            fire_ms = clock.now_ms + rng.randrange(10_000)
+            backend.schedule(alarm_id, fire_ms, '', '')
+            pending[alarm_id] = fire_ms
+    _assert_heap(backend)
+
+    backend.run_due(clock.now_ms + 10_000)
+
+    assert sorted(fired) == sorted(pending)
+    assert [pending[alarm_id] for alarm_id in fired] == sorted(pending.values())
+
+
+def test_timer_thread_fires_when_the_clock_reaches_the_alarm(clock):
+    done = threading.Event()
+    backend = HeapTimerBackend(lambda alarm_id, event_date, note: done.set(), clock=clock)
+    try:
+        backend.schedule(1001, clock.now_ms + 50, '2030-03-02', 'a')
+        assert not done.wait(0.1)
+
+        # The thread re-reads the clock when its sleep for the deadline ends
+        clock.now += 1
+        assert done.wait(2)
+        assert backend.fired == 1
+    finally:
+        backend.stop()
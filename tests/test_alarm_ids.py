@@ -0,0 +1,65 @@
+import threading
+
+from database.db_manager import ALARM_ID_BLOCK_SIZE, ReminderDB
+from database.migrations import ALARM_ID_STRIDE, FIRST_ALARM_ID
+from services.alarm_scheduler import REFILL_ALARM_ID
+
+
+def test_ids_start_above_the_reserved_range(db):
+    alarm_id = db.allocate_alarm_id()
+
+    assert alarm_id == FIRST_ALARM_ID
+    assert alarm_id > REFILL_ALARM_ID
+
+
+def test_ids_leave_room_for_the_tap_request_code(db):
+    ids = [db.allocate_alarm_id() for _ in range(ALARM_ID_BLOCK_SIZE + 3)]
+
+    assert all(b - a == ALARM_ID_STRIDE for a, b in zip(ids, ids[1:]))
+
+
+def test_reserved_blocks_never_overlap(db):
+    first = db.reserve_alarm_ids(5)
+    second = db.reserve_alarm_ids(5)
+
+    assert len(first) == len(second) == 5
+    assert not set(first) & set(second)
+    assert second[0] > first[-1]
+
+
+def test_instances_sharing_a_file_get_distinct_ids(db):
+    other = ReminderDB(db.db_path)
+    try:
+        ids = [db.allocate_alarm_id() for _ in range(3)]
+        ids += [other.allocate_alarm_id() for _ in range(3)]
+    finally:
+        other.close()
+
+    assert len(set(ids)) == 6
+
+
+def test_reservations_survive_reopening(db):
+    used = set(db.reserve_alarm_ids(4))
+    path = db.db_path
+    db.close()
+
+    with ReminderDB(path) as reopened:
+        assert reopened.allocate_alarm_id() not in used
+
+
+def test_concurrent_allocation_is_collision_free(db):
+    ids = []
+    lock = threading.Lock()
+
+    def allocate():
+        mine = [db.allocate_alarm_id() for _ in range(50)]
+        with lock:
+            ids.extend(mine)
+
+    threads = [threading.Thread(target=allocate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(ids) == len(set(ids)) == 200
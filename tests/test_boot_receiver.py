@@ -0,0 +1,74 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from services.alarm_backends import InMemoryAlarmBackend
+from services.alarm_scheduler import AlarmScheduler
+from services.boot_receiver import restore_alarms_on_boot
+from utils import clock
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.missed = []
+
+    def show_missed_summary(self, reminders):
+        self.missed.extend(r.alarm_id for r in reminders)
+
+
+@pytest.fixture
+def set_timezone(monkeypatch):
+    if not hasattr(time, 'tzset'):
+        pytest.skip('time.tzset is not available')
+
+    def set_tz(name):
+        monkeypatch.setenv('TZ', name)
+        time.tzset()
+
+    yield set_tz
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_boot_claims_reminders_overdue_in_the_new_time_zone(db, set_timezone):
+    set_timezone('UTC')
+    db.add_reminder('2099-06-01', 'a', 1001)
+    utc_fire_at_ms = db.get_reminder_by_alarm_id(1001).fire_at_ms
+
+    # Nine hours east, 07:45 local comes nine hours earlier; boot in between
+    set_timezone('Etc/GMT-9')
+    notifier = RecordingNotifier()
+    backend = InMemoryAlarmBackend()
+    with clock.use_clock(clock.VirtualClock(datetime(2000, 1, 1))) as virtual:
+        virtual.set_ms(utc_fire_at_ms - 3600 * 1000)
+        restore_alarms_on_boot(db, AlarmScheduler(backend), notifier)
+
+    assert notifier.missed == [1001]
+    assert db.get_reminder_by_alarm_id(1001).is_triggered
+    assert 1001 not in backend.registered
+
+
+def test_boot_registers_upcoming_reminders(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    notifier = RecordingNotifier()
+    backend = InMemoryAlarmBackend()
+
+    restore_alarms_on_boot(db, AlarmScheduler(backend), notifier)
+
+    assert notifier.missed == []
+    assert 1001 in backend.registered
+
+
+def test_boot_survives_a_database_that_fails_to_open(monkeypatch, capsys):
+    from services import boot_receiver
+
+    def fail():
+        raise OSError('disk I/O error')
+    monkeypatch.setattr(boot_receiver, 'ReminderDB', fail)
+    backend = InMemoryAlarmBackend()
+
+    restore_alarms_on_boot(scheduler=AlarmScheduler(backend))
+
+    assert 'disk I/O error' in capsys.readouterr().out
+    assert backend.registered == {}
@@ -0,0 +1,51 @@
+def _bulk(count, first_alarm_id=1001):
+    return [(f'2099-06-{i % 28 + 1:02d}', f'note {i}', first_alarm_id + i)
+            for i in range(count)]
+
+
+def test_bulk_insert_returns_ids_in_input_order(db):
+    ids = db.add_reminders_bulk(_bulk(5))
+
+    for i, reminder_id in enumerate(ids):
+        reminder = db.get_reminder_by_alarm_id(1001 + i)
+        assert reminder.id == reminder_id
+        assert reminder.note == f'note {i}'
+
+
+def test_bulk_insert_after_deletes(db):
+    ids = db.add_reminders_bulk(_bulk(6))
+    db.delete_reminders_bulk([ids[1], ids[4], ids[5]])
+    db.delete_reminder(ids[2])
+
+    new_ids = db.add_reminders_bulk(_bulk(4, first_alarm_id=2001))
+
+    assert len(set(new_ids)) == 4
+    assert not set(new_ids) & set(ids)
+    for i, reminder_id in enumerate(new_ids):
+        assert db.get_reminder_by_alarm_id(2001 + i).id == reminder_id
+
+
+def test_bulk_insert_of_nothing(db):
+    assert db.add_reminders_bulk([]) == []
+
+
+def test_mark_triggered_bulk(db):
+    db.add_reminders_bulk(_bulk(4))
+    db.update_scheduled_state([(1001, 5000), (1002, 5000), (1003, 5000)])
+
+    assert db.mark_triggered_bulk([1001, 1002, 9999]) == 2
+
+    assert [r.alarm_id for r in db.get_pending_reminders()] == [1003, 1004]
+    assert set(db.get_scheduled_state()) == {1003}
+    assert db.mark_triggered_bulk([]) == 0
+
+
+def test_delete_reminders_bulk(db):
+    ids = db.add_reminders_bulk(_bulk(4))
+    db.update_scheduled_state([(1001, 5000), (1003, 5000)])
+
+    assert db.delete_reminders_bulk([ids[0], ids[1], 99999]) == 2
+
+    assert sorted(r.alarm_id for r in db.get_all_reminders()) == [1003, 1004]
+    assert set(db.get_scheduled_state()) == {1003}
+    assert db.delete_reminders_bulk([]) == 0
@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+from database.cache import ReminderCache
+
+
+@pytest.fixture
+def filled_db(db):
+    for i in range(10):
+        db.add_reminder(f'2099-06-{i + 1:02d}', f'note {i}', 1001 + i)
+    return db
+
+
+def _alarm_ids(rows):
+    return [r.alarm_id for r in rows]
+
+
+def test_repeated_page_read_is_a_hit(filled_db):
+    cache = ReminderCache(filled_db)
+
+    first = cache.page(limit=4)
+    assert cache.page(limit=4) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_pages_match_the_database(filled_db):
+    cache = ReminderCache(filled_db)
+
+    assert list(cache.iter_all_reminders(batch_size=3)) == filled_db.get_all_reminders()
+    assert list(cache.pending_page(limit=20)) == filled_db.get_pending_reminders()
+
+
+def test_only_the_most_recent_pages_are_kept(filled_db):
+    cache = ReminderCache(filled_db, max_pages=2)
+
+    list(cache.iter_all_reminders(batch_size=2))
+
+    assert len(cache) == 2
+    cache.page(limit=2)
+    assert cache.misses == 7
+
+
+def test_write_through_the_db_invalidates(filled_db):
+    cache = ReminderCache(filled_db)
+    cache.page(limit=20)
+
+    filled_db.add_reminder('2099-05-01', 'new', 2001)
+
+    assert _alarm_ids(cache.page(limit=20))[0] == 2001
+    assert cache.misses == 2
+
+
+def test_write_from_another_connection_invalidates(filled_db, tmp_path):
+    cache = ReminderCache(filled_db)
+    cache.pending_page(limit=20)
+    change_count = filled_db.change_count
+
+    # Stands in for the alarm receiver process
+    other = sqlite3.connect(str(tmp_path / 'reminders.db'))
+    with other:
+        other.execute('UPDATE reminders SET is_triggered = 1 WHERE alarm_id = 1001')
+    other.close()
+
+    assert filled_db.change_count == change_count
+    assert 1001 not in _alarm_ids(cache.pending_page(limit=20))
+    assert cache.misses == 2
+
+
+def test_invalidate_drops_every_page(filled_db):
+    cache = ReminderCache(filled_db)
+    cache.page(limit=5)
+    cache.pending_page(limit=5)
+
+    cache.invalidate()
+
+    assert len(cache) == 0
+    cache.page(limit=5)
+    assert cache.misses == 3
@@ -0,0 +1,61 @@
+import threading
+
+from database.connection import ConnectionManager
+from database.db_manager import ReminderDB
+
+
+def test_instances_share_one_manager(db):
+    other = ReminderDB(db.db_path)
+    try:
+        assert other._manager is db._manager
+        assert db._manager.refcount == 2
+    finally:
+        other.close()
+    assert db._manager.refcount == 1
+
+
+def test_conflicting_busy_timeout_is_reported(db, caplog):
+    manager = ConnectionManager.acquire(db.db_path, busy_timeout_ms=1)
+    try:
+        assert manager is db._manager
+        assert manager.busy_timeout_ms == db.busy_timeout_ms
+        assert 'busy_timeout_ms=1' in caplog.text
+    finally:
+        manager.release()
+
+
+def test_matching_settings_are_silent(db, caplog):
+    manager = ConnectionManager.acquire(db.db_path, busy_timeout_ms=db.busy_timeout_ms)
+    manager.release()
+    assert caplog.text == ''
+
+
+def test_writes_are_visible_to_readers_after_commit(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    assert [r.alarm_id for r in db.get_all_reminders()] == [1001]
+    assert db._manager.commits >= 1
+
+
+def test_readers_of_exited_threads_are_closed(db):
+    manager = db._manager
+    db.get_all_reminders()
+    connections = []
+
+    def read():
+        db.get_all_reminders()
+        connections.append(manager.reader())
+    for _ in range(5):
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+
+    # The calling thread's reader plus the one opened last
+    assert manager.reader_count <= 2
+    closed = connections[:-1]
+    for conn in closed:
+        try:
+            conn.execute('SELECT 1')
+        except Exception:
+            continue
+        raise AssertionError('reader of an exited thread is still open')
+    assert db.get_all_reminders() == []
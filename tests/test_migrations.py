@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from database.db_manager import ReminderDB
+from database.migrations import (
+    ALARM_ID_STRIDE,
+    FIRST_ALARM_ID,
+    SCHEMA_VERSION,
+    get_schema_version,
+    migrate
+)
+from utils.date_utils import get_notification_timestamp
+
+# The reminders table as the app created it before schema versioning
+_LEGACY_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS reminders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_date TEXT NOT NULL,
+        reminder_date TEXT NOT NULL,
+        reminder_time TEXT DEFAULT '07:45',
+        note TEXT,
+        alarm_id INTEGER UNIQUE,
+        is_triggered INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+@pytest.fixture
+def legacy_path(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.execute(_LEGACY_SCHEMA)
+    conn.executemany(
+        'INSERT INTO reminders (event_date, reminder_date, note, alarm_id, is_triggered) '
+        'VALUES (?, ?, ?, ?, ?)',
+        [('2099-06-01', '2099-04-02', 'a', 523_417, 0),
+         ('2099-07-01', '2099-05-02', 'b', 999_999, 1)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _names(conn, kind):
+    return {row[0] for row in conn.execute(
+        'SELECT name FROM sqlite_master WHERE type = ?', (kind,))}
+
+
+def test_fresh_database_reaches_current_version(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'new.db'), isolation_level=None)
+
+    assert migrate(conn) == SCHEMA_VERSION
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert {'reminders', 'alarm_id_sequence', 'reminders_archive', 'meta',
+            'scheduled_state'} <= _names(conn, 'table')
+    assert {'idx_reminders_pending', 'idx_reminders_event_date',
+            'idx_reminders_fire_at'} <= _names(conn, 'index')
+
+
+def test_migrate_is_idempotent(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'new.db'), isolation_level=None)
+    migrate(conn)
+
+    assert migrate(conn) == 0
+
+
+def test_legacy_database_keeps_its_rows(legacy_path):
+    with ReminderDB(legacy_path) as db:
+        reminders = db.get_all_reminders()
+
+    assert [(r.alarm_id, r.note, bool(r.is_triggered)) for r in reminders] == [
+        (523_417, 'a', False), (999_999, 'b', True)]
+
+
+def test_legacy_fire_times_are_backfilled(legacy_path):
+    with ReminderDB(legacy_path) as db:
+        reminder = db.get_reminder_by_alarm_id(523_417)
+
+    assert reminder.fire_at_ms == get_notification_timestamp('2099-04-02', '07:45')
+
+
+def test_legacy_alarm_ids_are_never_reallocated(legacy_path):
+    with ReminderDB(legacy_path) as db:
+        alarm_id = db.allocate_alarm_id()
+
+    assert alarm_id >= FIRST_ALARM_ID
+    assert alarm_id % ALARM_ID_STRIDE == 0
+
+
+def test_sequence_starts_past_legacy_ids_above_the_reserved_range(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.execute(_LEGACY_SCHEMA)
+    conn.execute("INSERT INTO reminders (event_date, reminder_date, alarm_id) "
+                 "VALUES ('2099-06-01', '2099-04-02', 2000001)")
+    conn.commit()
+    conn.close()
+
+    with ReminderDB(path) as db:
+        alarm_id = db.allocate_alarm_id()
+
+    assert alarm_id > 2_000_001 + 1
+    assert alarm_id % ALARM_ID_STRIDE == 0
@@ -0,0 +1,62 @@
+import contextlib
+import io
+
+import pytest
+
+from benchmarks import fake_jnius
+from database.fast_path import DB_PATH_ENV
+from services import notification_channels
+from services.notification_channels import CHANNELS
+
+
+@pytest.fixture
+def jni(tmp_path, monkeypatch):
+    monkeypatch.setenv(DB_PATH_ENV, str(tmp_path / 'reminders.db'))
+    fake = fake_jnius.install(reflect_cost_ms=0, crossing_cost_us=0)
+    notification_channels.reset()
+    yield fake
+    fake_jnius.uninstall()
+    notification_channels.reset()
+
+
+def _ensure(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return notification_channels.ensure_channels(**kwargs)
+
+
+def _write_current_state():
+    with open(notification_channels.state_path(), 'w') as f:
+        for channel_id, spec in CHANNELS.items():
+            f.write(f"{channel_id} {spec.version()}\n")
+
+
+def test_first_run_creates_every_channel_and_saves_versions(jni):
+    assert _ensure() == len(CHANNELS)
+
+    notification_channels.reset()
+    assert _ensure() == 0
+
+
+def test_channels_are_checked_once_per_process(jni):
+    _write_current_state()
+    assert _ensure() == 0
+
+    jni.reset_counters()
+    assert _ensure() == 0
+    assert jni.crossings == 0
+
+
+def test_restored_state_file_without_channels_recreates_them(jni):
+    # Auto-backup restored the file onto a device that has no channels
+    _write_current_state()
+    jni.notification_manager.getNotificationChannel = lambda channel_id: None
+
+    assert _ensure() == len(CHANNELS)
+
+
+def test_changed_spec_is_applied_again(jni, monkeypatch):
+    _write_current_state()
+    spec = CHANNELS[notification_channels.URGENT_CHANNEL_ID]
+    monkeypatch.setattr(spec, 'description', 'Something else')
+
+    assert _ensure() == 1
@@ -0,0 +1,199 @@
+import pytest
+
+from services import notification_service
+from services.notification_service import (
+    GROUP_KEY,
+    GROUP_SUMMARY_ID,
+    GROUP_SUMMARY_MAX_LINES,
+    NotificationDispatcher
+)
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def posts(monkeypatch):
+    """Record notify_alarm and notify_group_summary calls in order"""
+    calls = []
+    monkeypatch.setattr(
+        notification_service, 'notify_alarm',
+        lambda alarm_id, payload, channel_id=None, full_screen=True, group=None:
+            calls.append(('alarm', alarm_id, full_screen, group)))
+    monkeypatch.setattr(
+        notification_service, 'notify_group_summary',
+        lambda lines, count, full_screen: calls.append(('summary', GROUP_SUMMARY_ID, count, lines)))
+    return calls
+
+
+@pytest.fixture
+def clock():
+    return ManualClock()
+
+
+def _dispatcher(clock, **kwargs):
+    return NotificationDispatcher(clock=clock, threaded=False, **kwargs)
+
+
+def test_lone_alarm_is_posted_in_full_at_once(posts, clock):
+    dispatcher = _dispatcher(clock)
+
+    dispatcher.submit(1001, '2030-03-02', 'a')
+
+    assert posts == [('alarm', 1001, True, None)]
+    assert dispatcher.queue_depth == 0
+
+
+def _max_posts_per_second(times):
+    return max(sum(1 for t in times if start <= t < start + 1) for start in times)
+
+
+def test_burst_never_exceeds_the_post_rate(posts, clock, monkeypatch):
+    times = []
+    record = notification_service.notify_alarm
+    monkeypatch.setattr(notification_service, 'notify_alarm',
+                        lambda *args, **kwargs: (times.append(clock.now), record(*args, **kwargs)))
+    record_summary = notification_service.notify_group_summary
+    monkeypatch.setattr(notification_service, 'notify_group_summary',
+                        lambda *args: (times.append(clock.now), record_summary(*args)))
+    dispatcher = _dispatcher(clock, window=5, post_rate=5)
+
+    for i in range(40):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+        clock.now += 0.05
+    for _ in range(5):
+        clock.now += 0.5
+        dispatcher.run_due()
+
+    assert _max_posts_per_second(times) <= 5
+    stats = dispatcher.stats()
+    assert stats['deferred'] > 0
+    assert stats['dropped'] == 0
+    assert stats['queue_depth'] == 0
+    # Alarms over budget are shown through the final summary
+    summaries = [call for call in posts if call[0] == 'summary']
+    assert summaries[-1][2] == 40
+
+
+def test_every_alarm_is_posted_or_counted_in_the_summary(posts, clock):
+    dispatcher = _dispatcher(clock, post_rate=2)
+    for i in range(10):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+    dispatcher.flush()
+
+    shown = {call[1] for call in posts if call[0] == 'alarm'}
+    stats = dispatcher.stats()
+    assert stats['deferred'] == 10 - len(shown)
+    assert posts[-1][:3] == ('summary', GROUP_SUMMARY_ID, 10)
+
+
+def test_lone_alarms_over_budget_are_queued_then_dropped(posts, clock):
+    dispatcher = _dispatcher(clock, window=0, post_rate=2, max_queue=3)
+    for i in range(7):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+
+    stats = dispatcher.stats()
+    assert stats['posted'] == 2
+    assert stats['deferred'] == 3
+    assert stats['dropped'] == 2
+
+    clock.now += 1
+    assert dispatcher.run_due() == 2
+    assert dispatcher.queue_depth == 1
+
+
+def test_drain_waits_for_the_rate_limiter(posts, clock):
+    dispatcher = _dispatcher(clock, window=0, post_rate=2)
+    for i in range(5):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    assert dispatcher.drain(timeout=2, sleep=sleep) == 3
+    assert len(posts) == 5
+    assert clock.now == pytest.approx(1002.0)
+
+
+def test_drain_flushes_what_is_left_at_the_timeout(posts, clock):
+    dispatcher = _dispatcher(clock, window=0, post_rate=1)
+    for i in range(5):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    assert dispatcher.drain(timeout=1.5, sleep=sleep) == 4
+    assert dispatcher.queue_depth == 0
+
+
+def test_burst_is_regrouped_under_one_summary(posts, clock):
+    dispatcher = _dispatcher(clock)
+    for i in range(10):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+        clock.now += 0.05
+    clock.now += 2
+    dispatcher.run_due()
+
+    children = [call for call in posts[1:] if call[0] == 'alarm']
+    assert all(group == GROUP_KEY and not full_screen
+               for _, _, full_screen, group in children)
+    # The first alarm is re-posted into the group
+    assert ('alarm', 1001, False, GROUP_KEY) in children
+    summaries = [call for call in posts if call[0] == 'summary']
+    assert summaries[-1][2] == 10
+    assert len(summaries[-1][3]) == GROUP_SUMMARY_MAX_LINES
+    assert dispatcher.queue_depth == 0
+
+
+def test_regrouping_updates_respect_the_post_rate(posts, clock):
+    dispatcher = _dispatcher(clock, post_rate=3)
+    for i in range(3):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+
+    # The re-posted first alarm took the last slot; the third alarm is
+    # shown through the summary, which waits
+    assert dispatcher.stats()['posted'] == 3
+    assert dispatcher.stats()['deferred'] == 1
+    assert dispatcher.queue_depth == 1
+    assert dispatcher.run_due() == 0
+
+    clock.now += 1
+    assert dispatcher.run_due() == 1
+    assert posts[-1][:3] == ('summary', GROUP_SUMMARY_ID, 3)
+
+
+def test_waiting_summary_is_replaced_not_queued(posts, clock):
+    dispatcher = _dispatcher(clock, post_rate=1)
+    for i in range(6):
+        dispatcher.submit(1001 + i, '2030-03-02', str(i))
+
+    assert dispatcher.queue_depth == 2
+    assert dispatcher.flush() == 2
+    assert posts[-1][:3] == ('summary', GROUP_SUMMARY_ID, 6)
+
+
+def test_window_closes_after_its_duration(posts, clock):
+    dispatcher = _dispatcher(clock, window=1.5, full_screen_interval=0)
+    dispatcher.submit(1001, '2030-03-02', 'a')
+    clock.now += 2
+    dispatcher.submit(1002, '2030-03-02', 'b')
+
+    assert posts == [('alarm', 1001, True, None), ('alarm', 1002, True, None)]
+    assert dispatcher.stats()['groups'] == 0
+
+
+def test_full_screen_intents_are_rate_limited(posts, clock):
+    dispatcher = _dispatcher(clock, window=0, full_screen_interval=30)
+    dispatcher.submit(1001, '2030-03-02', 'a')
+    clock.now += 5
+    dispatcher.submit(1002, '2030-03-02', 'b')
+    clock.now += 30
+    dispatcher.submit(1003, '2030-03-02', 'c')
+
+    assert [full_screen for _, _, full_screen, _ in posts] == [True, False, True]
@@ -0,0 +1,68 @@
+import pytest
+
+from database.models import Reminder
+
+
+@pytest.fixture
+def filled_db(db):
+    # Same-day journeys make ties on event_date that only id breaks
+    db.add_reminders_bulk([(f'2099-06-{1 + i // 3:02d}', f'note {i}', 1000 + 2 * i)
+                           for i in range(20)])
+    return db
+
+
+def _all_pages(fetch, key, limit):
+    rows, after = [], None
+    while True:
+        page = fetch(after, limit)
+        rows.extend(page)
+        if len(page) < limit:
+            return rows
+        after = key(page[-1])
+
+
+def test_pages_cover_every_row_once_in_order(filled_db):
+    rows = _all_pages(filled_db.page, lambda r: (r.event_date, r.id), limit=4)
+
+    assert len(rows) == 20
+    assert [(r.event_date, r.id) for r in rows] == sorted((r.event_date, r.id) for r in rows)
+
+
+@pytest.mark.parametrize('limit', [1, 3, 7, 20, 50])
+def test_page_size_does_not_change_the_result(filled_db, limit):
+    expected = filled_db.page(None, 100)
+
+    assert _all_pages(filled_db.page, lambda r: (r.event_date, r.id), limit) == expected
+
+
+def test_pending_pages_skip_triggered_rows(filled_db):
+    filled_db.mark_triggered_bulk([1000, 1010, 1038])
+
+    rows = _all_pages(filled_db.pending_page, lambda r: (r.reminder_date, r.id), limit=3)
+
+    assert len(rows) == 17
+    assert not any(r.is_triggered for r in rows)
+
+
+def test_iterators_match_list_methods(filled_db):
+    assert list(filled_db.iter_all_reminders(batch_size=6)) == filled_db.get_all_reminders()
+    assert (list(filled_db.iter_pending_reminders(batch_size=6))
+            == filled_db.get_pending_reminders())
+
+
+def test_rows_are_reminder_records(filled_db):
+    reminder = filled_db.page(None, 1)[0]
+
+    assert isinstance(reminder, Reminder)
+    assert not hasattr(reminder, '__dict__')
+    assert reminder.event_day.isoformat() == reminder.event_date
+    assert reminder.is_triggered is False
+
+
+def test_due_between_is_ordered_by_fire_time(filled_db):
+    rows = filled_db.due_between(0, 2 ** 63 - 1)
+
+    assert len(rows) == 20
+    assert [r.fire_at_ms for r in rows] == sorted(r.fire_at_ms for r in rows)
+    first = rows[0].fire_at_ms
+    assert filled_db.due_between(first, first + 1) == [r for r in rows if r.fire_at_ms == first]
@@ -0,0 +1,100 @@
+from services.alarm_backends import InMemoryAlarmBackend
+from services.alarm_scheduler import AlarmScheduler
+from services.reconciler import AlarmReconciler
+
+
+def _reconciler(db, window_size=None):
+    backend = InMemoryAlarmBackend()
+    return AlarmReconciler(db, AlarmScheduler(backend), window_size), backend
+
+
+def test_first_reconcile_schedules_every_upcoming_alarm(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    db.add_reminder('2099-06-02', 'b', 1002)
+    reconciler, backend = _reconciler(db)
+
+    result = reconciler.reconcile(now_ms=0)
+
+    assert result['scheduled'] == 2
+    assert set(backend.registered) == {1001, 1002}
+    assert set(db.get_scheduled_state()) == {1001, 1002}
+
+
+def test_second_reconcile_changes_nothing(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    reconciler, backend = _reconciler(db)
+    reconciler.reconcile(now_ms=0)
+    calls = backend.schedule_calls
+
+    result = reconciler.reconcile(now_ms=0)
+
+    assert result == {'scheduled': 0, 'cancelled': 0, 'unchanged': 1,
+                      'failed': 0, 'refreshed': 0}
+    assert backend.schedule_calls == calls
+
+
+def test_alarm_without_reminder_is_cancelled(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    reconciler, backend = _reconciler(db)
+    backend.schedule(9999, 5000, '2099-06-01', 'gone')
+    db.update_scheduled_state([(9999, 5000)])
+
+    result = reconciler.reconcile(now_ms=0)
+
+    assert result['cancelled'] == 1
+    assert set(backend.registered) == {1001}
+    assert set(db.get_scheduled_state()) == {1001}
+
+
+def test_due_but_undelivered_alarm_stays_registered(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    fire_at_ms = db.get_reminder_by_alarm_id(1001).fire_at_ms
+    reconciler, backend = _reconciler(db)
+    reconciler.reconcile(now_ms=0)
+
+    result = reconciler.reconcile(now_ms=fire_at_ms + 500)
+
+    assert result['cancelled'] == 0
+    assert result['unchanged'] == 1
+    assert 1001 in backend.registered
+    assert 1001 in db.get_scheduled_state()
+    assert not db.get_reminder_by_alarm_id(1001).is_triggered
+
+
+def test_due_alarm_survives_rolling_window_reconcile(db):
+    for day in range(1, 4):
+        db.add_reminder(f'2099-06-0{day}', str(day), 1000 + day)
+    fire_at_ms = db.get_reminder_by_alarm_id(1001).fire_at_ms
+    reconciler, backend = _reconciler(db, window_size=2)
+    reconciler.reconcile(now_ms=0)
+
+    result = reconciler.reconcile(now_ms=fire_at_ms + 500)
+
+    assert result['cancelled'] == 0
+    assert 1001 in backend.registered
+    assert 1001 in db.get_scheduled_state()
+
+
+def test_triggered_past_alarm_is_cancelled(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    fire_at_ms = db.get_reminder_by_alarm_id(1001).fire_at_ms
+    reconciler, backend = _reconciler(db)
+    reconciler.reconcile(now_ms=0)
+    db.mark_triggered_bulk([1001])
+    db.update_scheduled_state([(1001, fire_at_ms)])
+
+    result = reconciler.reconcile(now_ms=fire_at_ms + 500)
+
+    assert result['cancelled'] == 1
+    assert 1001 not in backend.registered
+
+
+def test_plan_after_reboot_ignores_the_record(db):
+    db.add_reminder('2099-06-01', 'a', 1001)
+    reconciler, _ = _reconciler(db)
+    reconciler.reconcile(now_ms=0)
+
+    plan = reconciler.plan(now_ms=0, rebooted=True)
+
+    assert [entry[0] for entry in plan.schedule] == [1001]
+    assert plan.cancel == []
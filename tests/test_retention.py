@@ -0,0 +1,37 @@
+from database.retention import RetentionEngine
+
+
+def _alarm_ids(reminders):
+    return sorted(r.alarm_id for r in reminders)
+
+
+def test_triggered_reminder_for_upcoming_journey_is_kept(db):
+    db.add_reminder('2099-06-01', 'upcoming', 1001)
+    db.mark_as_triggered(1001)
+
+    moved = RetentionEngine(db).archive('2030-01-01')
+
+    assert moved == 0
+    assert db.get_reminder_by_alarm_id(1001).is_triggered
+
+
+def test_past_journeys_are_archived_whether_triggered_or_not(db):
+    db.add_reminders_bulk([('2020-01-01', 'past', 1001),
+                           ('2020-01-02', 'past triggered', 1002),
+                           ('2099-06-01', 'upcoming', 1003)])
+    db.mark_as_triggered(1002)
+
+    moved = RetentionEngine(db).archive('2030-01-01')
+
+    assert moved == 2
+    assert _alarm_ids(db.get_all_reminders()) == [1003]
+    assert _alarm_ids(db.archived_page()) == [1001, 1002]
+
+
+def test_archive_moves_in_batches(db):
+    db.add_reminders_bulk([('2020-01-01', str(i), 1000 + i) for i in range(7)])
+    engine = RetentionEngine(db, batch_size=3)
+
+    assert engine.archive_batch('2030-01-01') == 3
+    assert engine.archive('2030-01-01') == 4
+    assert db.get_all_reminders() == []
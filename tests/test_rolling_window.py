@@ -0,0 +1,115 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from services.alarm_backends import InMemoryAlarmBackend
+from services.alarm_scheduler import REFILL_ALARM_ID, AlarmScheduler
+from services.rolling_window import REFILL_DELAY_MS, RollingWindowScheduler
+from utils import clock
+
+
+@pytest.fixture
+def virtual():
+    with clock.use_clock(clock.VirtualClock(datetime(2030, 1, 1))) as virtual_clock:
+        yield virtual_clock
+
+
+def _rolling(db, window_size):
+    backend = InMemoryAlarmBackend()
+    return RollingWindowScheduler(db, AlarmScheduler(backend), window_size), backend
+
+
+def _add(db, event_date, alarm_id):
+    db.add_reminder(event_date, str(alarm_id), alarm_id)
+    return db.get_reminder_by_alarm_id(alarm_id)
+
+
+def test_fill_that_exactly_reaches_the_window_size(db, virtual):
+    last = None
+    for i, event_date in enumerate(['2099-06-01', '2099-06-02', '2099-06-03']):
+        last = _add(db, event_date, 1001 + i)
+    rolling, backend = _rolling(db, window_size=3)
+
+    assert rolling.reset() == 3
+    # A full window always sets a refill alarm, even with nothing after it
+    assert set(backend.registered) == {1001, 1002, 1003, REFILL_ALARM_ID}
+    assert backend.registered[REFILL_ALARM_ID][0] == last.fire_at_ms + REFILL_DELAY_MS
+    assert rolling.last_key() == (last.fire_at_ms, last.id)
+
+    virtual.set_ms(last.fire_at_ms + REFILL_DELAY_MS)
+    assert rolling.refill() == 0
+    assert REFILL_ALARM_ID not in backend.registered
+    assert rolling.last_key() is None
+    assert REFILL_ALARM_ID not in db.get_scheduled_state()
+
+
+def test_reminders_tied_with_the_boundary_are_registered_by_the_refill(db, virtual):
+    for i in range(3):
+        _add(db, '2099-06-01', 1001 + i)
+    rolling, backend = _rolling(db, window_size=2)
+
+    rolling.reset()
+    assert set(backend.registered) == {1001, 1002, REFILL_ALARM_ID}
+
+    # Ties with the boundary but sorts after it by id: waits for the refill
+    added = _add(db, '2099-06-01', 1004)
+    assert not rolling.on_reminder_added(added)
+    assert 1004 not in backend.registered
+
+    virtual.set_ms(added.fire_at_ms + REFILL_DELAY_MS)
+    assert rolling.refill() == 2
+    assert {1003, 1004} <= set(backend.registered)
+    assert rolling.last_key() == (added.fire_at_ms, added.id)
+
+
+def test_add_inside_the_window_pushes_the_last_reminder_out(db, virtual):
+    _add(db, '2099-06-01', 1001)
+    _add(db, '2099-06-03', 1003)
+    rolling, backend = _rolling(db, window_size=2)
+    rolling.reset()
+
+    added = _add(db, '2099-06-02', 1002)
+    assert rolling.on_reminder_added(added)
+
+    assert set(backend.registered) == {1001, 1002, REFILL_ALARM_ID}
+    assert rolling.last_key() == (added.fire_at_ms, added.id)
+    assert backend.registered[REFILL_ALARM_ID][0] == added.fire_at_ms + REFILL_DELAY_MS
+    assert set(db.get_scheduled_state()) == {1001, 1002, REFILL_ALARM_ID}
+
+
+def test_delete_followed_by_a_refill(db, virtual):
+    first = _add(db, '2099-06-01', 1001)
+    second = _add(db, '2099-06-02', 1002)
+    _add(db, '2099-06-03', 1003)
+    rolling, backend = _rolling(db, window_size=2)
+    rolling.reset()
+
+    db.delete_reminder(first.id)
+    virtual.set_ms(second.fire_at_ms + REFILL_DELAY_MS)
+    db.mark_as_triggered(1002)
+
+    assert rolling.refill() == 1
+    assert 1003 in backend.registered
+    # Only one reminder is left, so the window is not full
+    assert rolling.last_key() is None
+    assert REFILL_ALARM_ID not in backend.registered
+
+
+def test_add_waits_for_a_refill_in_progress(db, virtual):
+    _add(db, '2099-06-01', 1001)
+    _add(db, '2099-06-03', 1003)
+    rolling, backend = _rolling(db, window_size=2)
+    rolling.reset()
+    added = _add(db, '2099-06-02', 1002)
+
+    results = []
+    with rolling.lock:
+        thread = threading.Thread(target=lambda: results.append(rolling.on_reminder_added(added)))
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+    thread.join()
+
+    assert results == [True]
+    assert rolling.last_key() == (added.fire_at_ms, added.id)
@@ -0,0 +1,110 @@
+"""Replaceable source of the current time
+
+Everything that asks "what time is it" for scheduling decisions goes through
+this module, so the simulation harness can swap in a VirtualClock and replay
+months of reminders in seconds.
+"""
+import time as _time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Union
+
+
+class SystemClock:
+    """Wall-clock time"""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def time(self) -> float:
+        return _time.time()
+
+
+class VirtualClock:
+    """Manually advanced clock for simulations"""
+
+    def __init__(self, start: datetime):
+        """Initialize virtual clock
+
+        Args:
+            start: Initial local time (naive datetime)
+        """
+        self._now = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def time(self) -> float:
+        return self._now.timestamp()
+
+    def set(self, when: datetime):
+        """Jump to a point in time
+
+        Args:
+            when: New local time; may not move the clock backwards
+        """
+        if when < self._now:
+            raise ValueError("Virtual clock can't move backwards")
+        self._now = when
+
+    def set_ms(self, epoch_ms: int):
+        """Jump to a point in time given in epoch milliseconds"""
+        self.set(datetime.fromtimestamp(epoch_ms / 1000))
+
+    def advance(self, delta: Union[timedelta, float]):
+        """Move the clock forward
+
+        Args:
+            delta: timedelta or number of seconds
+        """
+        if not isinstance(delta, timedelta):
+            delta = timedelta(seconds=delta)
+        self.set(self._now + delta)
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    """Get the active clock"""
+    return _clock
+
+
+def set_clock(clock):
+    """Replace the active clock
+
+    Args:
+        clock: Object with now() and time() methods
+    """
+    global _clock
+    _clock = clock
+
+
+@contextmanager
+def use_clock(clock):
+    """Temporarily replace the active clock
+
+    Args:
+        clock: Object with now() and time() methods
+    """
+    previous = _clock
+    set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def now() -> datetime:
+    """Current local time from the active clock"""
+    return _clock.now()
+
+
+def time() -> float:
+    """Current time in seconds since the epoch from the active clock"""
+    return _clock.time()
+
+
+def time_ms() -> int:
+    """Current time in milliseconds since the epoch from the active clock"""
+    return int(_clock.time() * 1000)
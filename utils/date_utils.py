@@ -1,7 +1,9 @@
 """Date utility functions for reminder calculations"""
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Tuple
 
+from utils import clock
+
 
 def calculate_reminder_date(event_date: str) -> str:
     """Calculate reminder date (60 days before event date)
@@ -41,7 +43,19 @@ def format_date_display(date_str: str) -> str:
         Formatted date string (e.g., "Jan 14, 2026")
     """
     dt = datetime.strptime(date_str, '%Y-%m-%d')
-    return dt.strftime('%b %d, %Y')
+    return format_day_display(dt.date())
+
+
+def format_day_display(day: date) -> str:
+    """Format an already parsed date for user-friendly display
+    
+    Args:
+        day: Date to format
+    
+    Returns:
+        Formatted date string (e.g., "Jan 14, 2026")
+    """
+    return day.strftime('%b %d, %Y')
 
 
 def validate_future_date(date_str: str) -> Tuple[bool, str]:
@@ -55,7 +69,7 @@ def validate_future_date(date_str: str) -> Tuple[bool, str]:
     """
     try:
         event_dt = datetime.strptime(date_str, '%Y-%m-%d')
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        today = clock.now().replace(hour=0, minute=0, second=0, microsecond=0)
         
         if event_dt <= today:
             return False, "Please select a future date"
@@ -80,6 +94,16 @@ def get_days_until(date_str: str) -> int:
         Number of days until the date
     """
     event_dt = datetime.strptime(date_str, '%Y-%m-%d')
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    delta = event_dt - today
-    return delta.days
+    return get_days_until_day(event_dt.date())
+
+
+def get_days_until_day(day: date) -> int:
+    """Calculate number of days until an already parsed date
+    
+    Args:
+        day: Target date
+    
+    Returns:
+        Number of days until the date
+    """
+    return (day - clock.now().date()).days
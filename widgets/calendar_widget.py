@@ -5,12 +5,15 @@ from kivy.uix.label import Label
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.popup import Popup
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, RoundedRectangle, Rectangle
+from kivy.graphics import Color, Rectangle
 from kivy.metrics import dp, sp
 from kivy.utils import get_color_from_hex
 from datetime import datetime, timedelta
+from functools import lru_cache
 import calendar
 
+from widgets.drawing import rounded_background
+
 # ── Palette (mirrors main.py THEME) ────────────────────────────
 _P = {
     'primary':       '#0D47A1',
@@ -32,6 +35,17 @@ def _c(key):
     return get_color_from_hex(_P[key])
 
 
+# Six weeks of seven days: enough for any month
+_GRID_CELLS = 42
+
+
+@lru_cache(maxsize=256)
+def _month_layout(year, month):
+    """Day numbers of a month laid out on the 42-cell grid, 0 for blanks."""
+    days = [day for week in calendar.monthcalendar(year, month) for day in week]
+    return tuple(days + [0] * (_GRID_CELLS - len(days)))
+
+
 class CalendarWidget(BoxLayout):
     """Custom calendar widget with modern styling."""
 
@@ -96,6 +110,7 @@ class CalendarWidget(BoxLayout):
             size_hint_y=1)
         self.add_widget(self.calendar_grid)
 
+        self._build_cells()
         self._update_calendar()
 
     # ── Navigation helpers ──────────────────────────────────────
@@ -124,48 +139,55 @@ class CalendarWidget(BoxLayout):
         self._update_calendar()
 
     # ── Render day grid ─────────────────────────────────────────
+    def _build_cells(self):
+        """Create the 6 x 7 pool of day cells once; months only relabel them."""
+        self._cells = []
+        for _ in range(_GRID_CELLS):
+            cell = Button(text='', font_size=sp(14),
+                          background_normal='', background_color=(0, 0, 0, 0))
+            cell.day_date = None
+            bg = rounded_background(cell, _c('selected'), radius=20)
+            bg.set_visible(False)
+            cell.bind(on_press=self._on_cell_press)
+            self.calendar_grid.add_widget(cell)
+            self._cells.append(cell)
+
     def _update_calendar(self):
-        self.calendar_grid.clear_widgets()
         year  = self.current_date.year
         month = self.current_date.month
-        cal   = calendar.monthcalendar(year, month)
-
-        for week in cal:
-            for day in week:
-                if day == 0:
-                    self.calendar_grid.add_widget(Label(text=''))
-                    continue
-
-                d = datetime(year, month, day).date()
-                selectable = d >= self.min_date
-                is_selected = (self.selected_date and
-                               d == self.selected_date)
-
-                btn = Button(
-                    text=str(day), font_size=sp(14), bold=selectable,
-                    background_normal='', background_color=(0, 0, 0, 0))
-
-                if is_selected:
-                    # filled primary circle
-                    btn.color = (1, 1, 1, 1)
-                    self._attach_circle(btn, 'selected')
-                elif selectable:
-                    btn.color = _c('text_primary')
-                    btn.bind(on_press=lambda x, dt=d: self._on_select(dt))
-                else:
-                    btn.color = _c('disabled_fg')
-                    btn.disabled = True
-
-                self.calendar_grid.add_widget(btn)
-
-    def _attach_circle(self, btn, color_key):
-        """Draw a coloured circle behind a day button."""
-        with btn.canvas.before:
-            Color(*_c(color_key))
-            btn._circ = RoundedRectangle(pos=btn.pos, size=btn.size,
-                                          radius=[dp(20)])
-        btn.bind(pos=lambda w, v: setattr(w._circ, 'pos', v),
-                 size=lambda w, v: setattr(w._circ, 'size', v))
+
+        # Kivy only redraws a cell whose properties actually change
+        for cell, day in zip(self._cells, _month_layout(year, month)):
+            if day == 0:
+                cell.day_date = None
+                cell.text = ''
+                cell.disabled = True
+                cell._rounded_bg.set_visible(False)
+                continue
+
+            d = datetime(year, month, day).date()
+            selectable = d >= self.min_date
+            is_selected = (self.selected_date is not None and
+                           d == self.selected_date)
+
+            cell.day_date = d
+            cell.text = str(day)
+            cell.bold = selectable
+            cell._rounded_bg.set_visible(is_selected)
+            if is_selected:
+                # filled primary circle
+                cell.color = (1, 1, 1, 1)
+                cell.disabled = False
+            elif selectable:
+                cell.color = _c('text_primary')
+                cell.disabled = False
+            else:
+                cell.color = _c('disabled_fg')
+                cell.disabled = True
+
+    def _on_cell_press(self, cell):
+        if cell.day_date is not None:
+            self._on_select(cell.day_date)
 
     def _on_select(self, date_obj):
         self.selected_date = date_obj
@@ -184,12 +206,7 @@ class DatePickerPopup(Popup):
         body = BoxLayout(orientation='vertical', padding=dp(14), spacing=dp(10))
 
         # rounded card background
-        with body.canvas.before:
-            Color(*_c('card'))
-            body._bg = RoundedRectangle(pos=body.pos, size=body.size,
-                                         radius=[dp(18)])
-        body.bind(pos=lambda w, v: setattr(w._bg, 'pos', v),
-                  size=lambda w, v: setattr(w._bg, 'size', v))
+        rounded_background(body, _c('card'), radius=18)
 
         # sub-title
         hint = Label(text='Select a date at least 60 days ahead',
@@ -0,0 +1,172 @@
+"""Shared drawing layer for rounded backgrounds and drop shadows
+
+A rounded rectangle is rasterized once per (radius, colour) into a small
+texture of (2r + 1) x (2r + 1) pixels and drawn with a 9-slice BorderImage:
+the corners keep their size and the one-pixel middle row and column
+stretch. Shadows use the same texture in translucent black. Textures are
+kept in an LRU cache, so every card, chip and button of the same style
+shares one texture instead of tessellating its own RoundedRectangle, and
+all widgets share one pos/size callback instead of a pair of lambdas each.
+"""
+import math
+from collections import OrderedDict
+
+from kivy.graphics import BorderImage, Color
+from kivy.graphics.texture import Texture
+from kivy.metrics import dp
+
+# Distinct (radius, colour) textures kept alive
+TEXTURE_CACHE_SIZE = 64
+
+
+def render_rounded_rect(radius, rgba):
+    """Rasterize an anti-aliased rounded square for 9-slice drawing
+
+    Args:
+        radius: Corner radius in pixels
+        rgba: Fill colour, components 0..1
+
+    Returns:
+        (size, buffer): the side length 2 * radius + 1 and its RGBA bytes,
+        bottom row first
+    """
+    size = 2 * radius + 1
+    r, g, b, a = (int(round(c * 255)) for c in rgba)
+    # Coverage of one quadrant, mirrored into the other three
+    quadrant = []
+    for y in range(radius + 1):
+        row = []
+        for x in range(radius + 1):
+            # Distance from the pixel centre to the corner circle, whose
+            # centre is `radius` in from both edges
+            dist = math.hypot(max(0.0, radius - (x + 0.5)), max(0.0, radius - (y + 0.5)))
+            row.append(min(1.0, max(0.0, radius + 0.5 - dist)) if dist > 0 else 1.0)
+        quadrant.append(row)
+
+    buf = bytearray(size * size * 4)
+    for y in range(size):
+        qy = y if y <= radius else size - 1 - y
+        for x in range(size):
+            qx = x if x <= radius else size - 1 - x
+            coverage = quadrant[qy][qx]
+            if coverage:
+                i = (y * size + x) * 4
+                buf[i] = r
+                buf[i + 1] = g
+                buf[i + 2] = b
+                buf[i + 3] = int(round(a * coverage))
+    return size, bytes(buf)
+
+
+class TextureCache:
+    """LRU cache of rounded-rect textures keyed by (radius px, rgba)"""
+
+    def __init__(self, max_size=TEXTURE_CACHE_SIZE):
+        self.max_size = max_size
+        self._textures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, radius, rgba):
+        """Get the texture for a corner radius in pixels and a colour"""
+        key = (radius, tuple(int(round(c * 255)) for c in rgba))
+        texture = self._textures.get(key)
+        if texture is not None:
+            self.hits += 1
+            self._textures.move_to_end(key)
+            return texture
+
+        self.misses += 1
+        size, buf = render_rounded_rect(radius, rgba)
+        texture = Texture.create(size=(size, size), colorfmt='rgba')
+        texture.mag_filter = 'linear'
+        texture.blit_buffer(buf, colorfmt='rgba', bufferfmt='ubyte')
+        # The GL context is recreated when an Android app resumes
+        texture.add_reload_observer(
+            lambda tex, buf=buf: tex.blit_buffer(buf, colorfmt='rgba', bufferfmt='ubyte'))
+        self._textures[key] = texture
+        if len(self._textures) > self.max_size:
+            # Widgets still drawing an evicted texture keep their reference
+            self._textures.popitem(last=False)
+        return texture
+
+    def __len__(self):
+        return len(self._textures)
+
+
+textures = TextureCache()
+
+
+class RoundedBackground:
+    """Background (and optional drop shadow) drawn behind one widget"""
+
+    def __init__(self, widget, rgba, radius=12, shadow_offset=0, shadow_alpha=0.0):
+        """Add the instructions to *widget*.canvas.before
+
+        Args:
+            widget: Widget to decorate
+            rgba: Fill colour
+            radius: Corner radius in dp
+            shadow_offset: Shadow offset right and down in dp; 0 for none
+            shadow_alpha: Shadow opacity
+        """
+        self.radius = int(round(dp(radius)))
+        self.offset = dp(shadow_offset)
+        with widget.canvas.before:
+            # Textures carry their own colour; only reset the tint
+            self.tint = Color(1, 1, 1, 1)
+            self.shadow = None
+            border = (self.radius,) * 4
+            if shadow_offset and shadow_alpha:
+                self.shadow = BorderImage(
+                    texture=textures.get(self.radius, (0, 0, 0, shadow_alpha)),
+                    border=border)
+            self.image = BorderImage(texture=textures.get(self.radius, rgba),
+                                     border=border)
+        self.update(widget.pos, widget.size)
+
+    def set_visible(self, visible):
+        """Show or hide the background without removing instructions"""
+        self.tint.a = 1 if visible else 0
+
+    def set_color(self, rgba):
+        """Switch to another fill colour (another shared texture)"""
+        self.image.texture = textures.get(self.radius, rgba)
+
+    def update(self, pos, size):
+        w, h = size
+        r = self.radius
+        # Shrink the corners when the widget is smaller than two of them
+        scale = min(1.0, w / (2 * r + 1), h / (2 * r + 1)) if r else 1.0
+        display = [r * scale] * 4
+        self.image.pos = pos
+        self.image.size = size
+        self.image.display_border = display
+        if self.shadow is not None:
+            self.shadow.pos = (pos[0] + self.offset, pos[1] - self.offset)
+            self.shadow.size = size
+            self.shadow.display_border = display
+
+
+def _sync(widget, value):
+    widget._rounded_bg.update(widget.pos, widget.size)
+
+
+def rounded_background(widget, rgba, radius=12, shadow_offset=0, shadow_alpha=0.0):
+    """Give *widget* a rounded background kept in sync with its pos/size
+
+    Args:
+        widget: Widget to decorate
+        rgba: Fill colour
+        radius: Corner radius in dp
+        shadow_offset: Shadow offset right and down in dp; 0 for none
+        shadow_alpha: Shadow opacity
+
+    Returns:
+        The RoundedBackground, also stored as widget._rounded_bg
+    """
+    background = RoundedBackground(widget, rgba, radius, shadow_offset, shadow_alpha)
+    widget._rounded_bg = background
+    widget.fbind('pos', _sync)
+    widget.fbind('size', _sync)
+    return background
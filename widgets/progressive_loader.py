@@ -0,0 +1,182 @@
+"""Progressive loading of list rows without freezing the UI
+
+Rows are produced page by page on the DB worker thread and queued. On the
+UI thread a Clock.schedule_interval callback hands them to the list at
+most once per frame, a page at a time. Every change to RecycleView.data
+makes its layout recompute every row on the next frame, so fewer, larger
+appends cost less than many small ones. The first screenful shows as soon
+as its page arrives instead of after the whole table has been read and
+laid out.
+
+Frame cost is measured from the append to Window.on_flip, after the
+layout and draw pass it caused. A frame that ran over the budget is
+followed by one that appends nothing, so touch input gets a turn.
+"""
+import threading
+import time
+from collections import deque
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+# Frame time (append, layout and draw) above which the next frame skips
+# appending; a 60 fps frame is ~16 ms
+FRAME_BUDGET_MS = 12.0
+
+# Rows handed to the list per frame; one DB page
+BATCH_SIZE = 200
+
+
+class LoadMetrics:
+    """Timings of one progressive load, in milliseconds from its start."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.time_to_first_card_ms = None
+        self.time_to_complete_ms = None
+        self.rows = 0
+        self.frames = 0
+        self.max_frame_ms = 0.0
+
+    def _since_start(self):
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def as_dict(self):
+        return {
+            'time_to_first_card_ms': self.time_to_first_card_ms,
+            'time_to_complete_ms': self.time_to_complete_ms,
+            'rows': self.rows,
+            'frames': self.frames,
+            'max_frame_ms': self.max_frame_ms,
+        }
+
+
+class ProgressiveLoader:
+    """Streams rows from the DB worker into a list, one page per frame."""
+
+    def __init__(self, async_db, frame_budget_ms=FRAME_BUDGET_MS,
+                 batch_size=BATCH_SIZE):
+        """Initialize loader
+
+        Args:
+            async_db: AsyncReminderDB whose worker runs the producer
+            frame_budget_ms: Frame time after which the next frame skips
+            batch_size: Most rows added in one frame
+        """
+        self.async_db = async_db
+        self.frame_budget = frame_budget_ms / 1000
+        self.batch_size = batch_size
+        self.metrics = None
+        self._pending = deque()
+        self._producing = False
+        self._generation = 0
+        self._event = None
+        # perf_counter() of the append whose frame has not been drawn yet
+        self._applied_at = None
+        self._skip_frame = False
+        self._lock = threading.Lock()
+
+    @property
+    def loading(self):
+        return self._event is not None
+
+    def start(self, produce, apply_rows, on_first_rows=None, on_done=None):
+        """Begin a load, cancelling any load in progress
+
+        Args:
+            produce: Runs on the DB worker as produce(emit); calls
+                emit(rows) per page and stops when emit returns False
+            apply_rows: Called on the UI thread with each batch of rows
+            on_first_rows: Called on the UI thread after the first batch
+            on_done: Called on the UI thread once every row was applied
+        """
+        self.cancel()
+        with self._lock:
+            generation = self._generation
+            self._pending.clear()
+            self._producing = True
+        self.metrics = LoadMetrics()
+        self._apply_rows = apply_rows
+        self._on_first_rows = on_first_rows
+        self._on_done = on_done
+
+        def emit(rows):
+            with self._lock:
+                if generation != self._generation:
+                    return False
+                self._pending.extend(rows)
+                return True
+
+        def finished():
+            with self._lock:
+                if generation == self._generation:
+                    self._producing = False
+
+        def failed(error):
+            print(f"Error loading reminders: {error}")
+            finished()
+
+        def job():
+            produce(emit)
+            # On the worker, so the flag is set right after the last emit
+            finished()
+
+        self.async_db.run(job, errback=failed)
+        Window.fbind('on_flip', self._on_flip)
+        self._event = Clock.schedule_interval(self._render_chunk, 0)
+
+    def cancel(self):
+        """Stop the current load; rows already applied stay."""
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            self._producing = False
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+            Window.funbind('on_flip', self._on_flip)
+        self._applied_at = None
+        self._skip_frame = False
+
+    def _render_chunk(self, dt):
+        if self._applied_at is not None:
+            # Laid out last frame without anything to redraw, so no on_flip
+            self._on_flip(Window)
+        if self._skip_frame:
+            # The last append's frame ran over the budget
+            self._skip_frame = False
+            return True
+
+        metrics = self.metrics
+        with self._lock:
+            batch = [self._pending.popleft()
+                     for _ in range(min(self.batch_size, len(self._pending)))]
+            done = not batch and not self._producing
+
+        if batch:
+            self._applied_at = time.perf_counter()
+            self._apply_rows(batch)
+            metrics.rows += len(batch)
+            metrics.frames += 1
+            if metrics.frames == 1 and self._on_first_rows is not None:
+                self._on_first_rows()
+        elif done:
+            metrics.time_to_complete_ms = metrics._since_start()
+            self._event = None
+            Window.funbind('on_flip', self._on_flip)
+            if self._on_done is not None:
+                self._on_done()
+            return False
+        return True
+
+    def _on_flip(self, window):
+        # Dispatched after the frame holding the append was laid out and drawn
+        if self._applied_at is None:
+            return
+        metrics = self.metrics
+        frame = time.perf_counter() - self._applied_at
+        self._applied_at = None
+        self._skip_frame = frame > self.frame_budget
+        metrics.max_frame_ms = max(metrics.max_frame_ms, frame * 1000)
+        if metrics.time_to_first_card_ms is None:
+            metrics.time_to_first_card_ms = metrics._since_start()